@@ -0,0 +1,159 @@
+"""
+Command dispatch throughput benchmark.
+
+Compares the old path for query commands, which built a context, rewrote the message content, copied the message
+and built a second context before the flag converter parsed the rewritten content, against `custom.QueryCommand`,
+which builds one context and parses the query and flags in a single pass.
+
+Run from the bot directory with `python -m benchmarks.dispatch [iterations]`.
+"""
+
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import copy
+import re
+import sys
+import time
+import types
+from typing import Any
+
+# Packages
+import discord
+from discord.ext import commands
+
+# My stuff
+from utilities.converters.flags import Switches
+from utilities.custom.command import QueryCommand
+
+
+PREFIX = "l-"
+MESSAGES = (
+    "l-play lost in japan by shawn mendes",
+    "l-play if i can't have you by shawn mendes --now",
+    "l-play senorita --soundcloud --next",
+    "l-play lost in japan by shawn mendes --music",
+)
+
+
+class LegacyOptions(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+    music: bool = False
+    soundcloud: bool = False
+    next: bool = False
+    now: bool = False
+
+
+class Options(Switches):
+    music: bool = False
+    soundcloud: bool = False
+    next: bool = False
+    now: bool = False
+
+
+async def legacy(ctx: commands.Context, query: str, *, options: LegacyOptions) -> None:
+    pass
+
+
+async def play(ctx: commands.Context, query: str, *, options: Options) -> None:
+    pass
+
+
+class Message:
+
+    __slots__ = ("content", "author", "channel", "guild", "id", "attachments", "_state")
+
+    def __init__(self, content: str) -> None:
+        self.content: str = content
+        self.author: Any = types.SimpleNamespace(id=2, bot=False)
+        self.channel: Any = types.SimpleNamespace(id=3)
+        self.guild: Any = None
+        self.id: int = 4
+        self.attachments: list[Any] = []
+        self._state: Any = None
+
+
+def _bot() -> commands.Bot:
+
+    bot = commands.Bot(command_prefix=PREFIX, intents=discord.Intents.none(), help_command=None)
+    bot._connection.user = types.SimpleNamespace(id=1)  # type: ignore
+
+    bot.add_command(commands.Command(legacy, name="legacy"))
+    bot.add_command(QueryCommand(play, name="play"))
+
+    return bot
+
+
+async def legacy_dispatch(bot: commands.Bot, message: Message) -> commands.Context:
+    """
+    The rewrite that process_commands used to do for play, search, rolecounts and friends.
+    """
+
+    ctx = await bot.get_context(message)  # type: ignore
+
+    content = message.content
+    start = content.index(ctx.invoked_with) + len(ctx.invoked_with) + 1
+    try:
+        end = content.index(" --")
+    except ValueError:
+        end = len(content)
+
+    content = (content[:start] + ('"' + content[start:end] + '"') + content[end:]).replace('""', "")
+
+    message = copy.copy(message)
+    message.content = re.sub(r"--([^\s]+)\s*", r"--\1 true ", content)
+
+    ctx = await bot.get_context(message)  # type: ignore
+    await ctx.command._parse_arguments(ctx)
+
+    return ctx
+
+
+async def query_dispatch(bot: commands.Bot, message: Message) -> commands.Context:
+
+    ctx = await bot.get_context(message)  # type: ignore
+    await ctx.command._parse_arguments(ctx)
+
+    return ctx
+
+
+async def _run(bot: commands.Bot, messages: list[Message], dispatch: Any, iterations: int) -> float:
+
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        for message in messages:
+            await dispatch(bot, message)
+
+    return iterations * len(messages) / (time.perf_counter() - start)
+
+
+async def main(iterations: int) -> None:
+
+    bot = _bot()
+
+    legacy_messages = [Message(content.replace("l-play", "l-legacy", 1)) for content in MESSAGES]
+    query_messages = [Message(content.replace("l-legacy", "l-play", 1)) for content in MESSAGES]
+
+    for legacy_message, query_message in zip(legacy_messages, query_messages):
+
+        legacy = await legacy_dispatch(bot, legacy_message)
+        query = await query_dispatch(bot, query_message)
+
+        assert legacy.args[1:] == query.args[1:], (legacy.args, query.args)
+        assert vars(legacy.kwargs["options"]) == vars(query.kwargs["options"]), (legacy.kwargs, query.kwargs)
+
+    await _run(bot, legacy_messages, legacy_dispatch, iterations // 10)
+    await _run(bot, query_messages, query_dispatch, iterations // 10)
+
+    legacy_rate = await _run(bot, legacy_messages, legacy_dispatch, iterations)
+    query_rate = await _run(bot, query_messages, query_dispatch, iterations)
+
+    print(f"legacy rewrite + double get_context: {legacy_rate:>10,.0f} commands/s")
+    print(f"single pass QueryCommand:            {query_rate:>10,.0f} commands/s")
+    print(f"speedup:                             {query_rate / legacy_rate:>10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,229 @@
+"""
+Config cache memory benchmark.
+
+Compares the memory held by a cached user with the old layout of the config objects, where every object had a
+`__dict__`, a reference to the bot, its own copy of the user id and a `pendulum.DateTime` for `created_at`, against
+the current `__slots__` objects, which reach the bot and user id through their parent and keep `created_at` as a raw
+timestamp until it's asked for.
+
+Run from the bot directory with `python -m benchmarks.memory [users] [members per user]`.
+"""
+
+# Future
+from __future__ import annotations
+
+# Standard Library
+import gc
+import sys
+import tracemalloc
+import types
+from collections.abc import Callable
+from typing import Any
+
+# Packages
+import pendulum
+
+# My stuff
+from utilities import enums, objects
+
+
+NOW = pendulum.now(tz="UTC")
+PAST = NOW.subtract(days=1)
+
+
+class LegacyUserConfig:
+
+    def __init__(self, bot: Any, data: dict[str, Any]) -> None:
+
+        self._bot = bot
+
+        self._id = data["id"]
+        self._created_at = pendulum.instance(data["created_at"], tz="UTC")
+        self._blacklisted = data["blacklisted"]
+        self._blacklisted_reason = data["blacklisted_reason"]
+        self._timezone = pendulum.timezone(timezone) if (timezone := data["timezone"]) else None
+        self._timezone_private = data["timezone_private"]
+        self._birthday = pendulum.Date(birthday.year, birthday.month, birthday.day) if (birthday := data["birthday"]) else None
+        self._birthday_private = data["birthday_private"]
+
+        self._notifications = None
+        self._reminders: dict[int, Any] = {}
+        self._todos: dict[int, Any] = {}
+        self._member_configs: dict[int, Any] = {}
+
+
+class LegacyNotifications:
+
+    def __init__(self, bot: Any, user_config: Any, data: dict[str, Any]) -> None:
+        self._bot = bot
+        self._user_config = user_config
+        self._id = data["id"]
+        self._user_id = data["user_id"]
+        self._level_ups = data["level_ups"]
+
+
+class LegacyMemberConfig:
+
+    def __init__(self, bot: Any, user_config: Any, data: dict[str, Any]) -> None:
+        self._bot = bot
+        self._user_config = user_config
+        self._id = data["id"]
+        self._user_id = data["user_id"]
+        self._guild_id = data["guild_id"]
+        self._xp = data["xp"]
+        self._coins = data["coins"]
+
+
+class LegacyTodo:
+
+    def __init__(self, bot: Any, user_config: Any, data: dict[str, Any]) -> None:
+        self._bot = bot
+        self._user_config = user_config
+        self._id = data["id"]
+        self._user_id = data["user_id"]
+        self._created_at = pendulum.instance(data["created_at"], tz="UTC")
+        self._content = data["content"]
+        self._jump_url = data["jump_url"]
+
+
+class LegacyReminder:
+
+    def __init__(self, bot: Any, user_config: Any, data: dict[str, Any]) -> None:
+        self._bot = bot
+        self._user_config = user_config
+        self._id = data["id"]
+        self._user_id = data["user_id"]
+        self._channel_id = data["channel_id"]
+        self._created_at = pendulum.instance(data["created_at"], tz="UTC")
+        self._content = data["content"]
+        self._jump_url = data["jump_url"]
+        self._repeat_type = enums.ReminderRepeatType(data["repeat_type"])
+        self._notified = data["notified"]
+        self._datetime = pendulum.instance(data["datetime"], tz="UTC")
+        self._task = None
+
+
+def _rows(users: int, members: int) -> list[dict[str, Any]]:
+    """
+    One set of rows per user, shaped like the records postgres returns. Every timestamp is a separate object, as
+    each is decoded separately.
+    """
+
+    rows = []
+
+    for index in range(users):
+
+        user_id = 100_000_000_000_000_000 + index
+
+        rows.append(
+            {
+                "user":          {
+                    "id": user_id, "created_at": NOW.add(seconds=index), "blacklisted": False, "blacklisted_reason": None,
+                    "timezone": "Europe/London", "timezone_private": False, "birthday": pendulum.date(2000, 1, 1), "birthday_private": False
+                },
+                "notifications": {"id": index, "user_id": user_id, "level_ups": True},
+                "members":       [
+                    {"id": index * members + member, "user_id": user_id, "guild_id": 200_000_000_000_000_000 + member, "xp": index * 10, "coins": index}
+                    for member in range(members)
+                ],
+                "todos":         [
+                    {"id": index * 3 + todo, "user_id": user_id, "created_at": NOW.add(seconds=todo), "content": f"todo {todo}", "jump_url": None}
+                    for todo in range(3)
+                ],
+                "reminders":     [
+                    {
+                        "id": index * 2 + reminder, "user_id": user_id, "channel_id": 300_000_000_000_000_000, "created_at": PAST.add(seconds=reminder),
+                        "content": f"reminder {reminder}", "jump_url": "https://discord.com/channels/1/2/3", "repeat_type": 1, "notified": True,
+                        "datetime": PAST.add(hours=reminder), "anchor": PAST.add(hours=reminder)
+                    }
+                    for reminder in range(2)
+                ],
+            }
+        )
+
+    return rows
+
+
+def legacy(bot: Any, row: dict[str, Any]) -> LegacyUserConfig:
+
+    user_config = LegacyUserConfig(bot, row["user"])
+    user_config._notifications = LegacyNotifications(bot, user_config, row["notifications"])
+
+    for data in row["members"]:
+        user_config._member_configs[data["guild_id"]] = LegacyMemberConfig(bot, user_config, data)
+    for data in row["todos"]:
+        user_config._todos[data["id"]] = LegacyTodo(bot, user_config, data)
+    for data in row["reminders"]:
+        user_config._reminders[data["id"]] = LegacyReminder(bot, user_config, data)
+
+    return user_config
+
+
+def current(bot: Any, row: dict[str, Any]) -> objects.UserConfig:
+
+    user_config = objects.UserConfig(bot=bot, data=row["user"])
+    user_config.load_notifications(row["notifications"])
+    user_config.load_member_configs(row["members"])
+    user_config.load_todos(row["todos"])
+    user_config.load_reminders(row["reminders"])
+
+    return user_config
+
+
+def _measure(bot: Any, rows: list[dict[str, Any]], build: Callable[[Any, dict[str, Any]], Any]) -> float:
+
+    gc.collect()
+    tracemalloc.start()
+
+    before = tracemalloc.get_traced_memory()[0]
+    cache = {row["user"]["id"]: build(bot, row) for row in rows}
+    after = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+    del cache
+
+    return (after - before) / len(rows)
+
+
+def _check(bot: Any, row: dict[str, Any]) -> None:
+    """
+    The slotted objects must expose the same values as the objects they replaced.
+    """
+
+    old, new = legacy(bot, row), current(bot, row)
+
+    assert (new.id, new.created_at, new.timezone, new.birthday) == (old._id, old._created_at, old._timezone, old._birthday)
+    assert new.notifications.user_id == old._notifications._user_id
+
+    for guild_id, member_config in new.member_configs.items():
+        legacy_member_config = old._member_configs[guild_id]
+        assert (member_config.id, member_config.user_id, member_config.guild_id, member_config.xp) == \
+               (legacy_member_config._id, legacy_member_config._user_id, legacy_member_config._guild_id, legacy_member_config._xp)
+
+    for todo_id, todo in new.todos.items():
+        assert (todo.user_id, todo.created_at, todo.content) == (old._todos[todo_id]._user_id, old._todos[todo_id]._created_at, old._todos[todo_id]._content)
+
+    for reminder_id, reminder in new.reminders.items():
+        legacy_reminder = old._reminders[reminder_id]
+        assert (reminder.user_id, reminder.created_at, reminder.datetime, reminder.bot) == \
+               (legacy_reminder._user_id, legacy_reminder._created_at, legacy_reminder._datetime, legacy_reminder._bot)
+
+
+def main(users: int, members: int) -> None:
+
+    bot = types.SimpleNamespace()
+    rows = _rows(users, members)
+
+    _check(bot, rows[0])
+
+    legacy_bytes = _measure(bot, rows, legacy)
+    current_bytes = _measure(bot, rows, current)
+
+    print(f"users: {users}, each with {members} member configs, 3 todos and 2 reminders")
+    print(f"__dict__ objects:  {legacy_bytes:>10,.0f} bytes per cached user")
+    print(f"__slots__ objects: {current_bytes:>10,.0f} bytes per cached user")
+    print(f"saved:             {1 - current_bytes / legacy_bytes:>10.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000, int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,128 @@
+"""
+Reminder timer benchmark.
+
+Holds a large number of pending timers, spread over the next 30 days, in a `HierarchicalTimingWheel` and compares the
+memory each one costs against the old approach of a coroutine per reminder handed to a heap based scheduler, as
+`aioscheduler` did. Then cancels a tenth of them, and turns the wheel through the first day a second at a time,
+checking that every timer expires on the tick it was due on.
+
+Run from the bot directory with `python -m benchmarks.timers [timers]`.
+"""
+
+# Future
+from __future__ import annotations
+
+# Standard Library
+import gc
+import heapq
+import math
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+# My stuff
+from utilities.timers import HierarchicalTimingWheel
+
+
+START = 1_700_000_000.0
+SPAN = 60 * 60 * 24 * 30
+DAY = 60 * 60 * 24
+
+
+async def handle_notification(reminder_id: int) -> None:
+    pass
+
+
+def _coroutines(timers: list[tuple[int, float]]) -> list[tuple[float, int, Any]]:
+
+    heap: list[tuple[float, int, Any]] = []
+
+    for reminder_id, when in timers:
+        heapq.heappush(heap, (when, reminder_id, handle_notification(reminder_id)))
+
+    return heap
+
+
+def _wheel(timers: list[tuple[int, float]]) -> HierarchicalTimingWheel:
+
+    wheel = HierarchicalTimingWheel(START)
+
+    for reminder_id, when in timers:
+        wheel.add(reminder_id, when)
+
+    return wheel
+
+
+def _measure(timers: list[tuple[int, float]], build: Any) -> tuple[Any, float]:
+
+    gc.collect()
+    tracemalloc.start()
+
+    before = tracemalloc.get_traced_memory()[0]
+    held = build(timers)
+    after = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    return held, (after - before) / len(timers)
+
+
+def main(count: int) -> None:
+
+    rng = random.Random(0)
+    timers = [(reminder_id, START + rng.random() * SPAN) for reminder_id in range(count)]
+
+    # The coroutine approach is measured on a sample, as a million coroutines take a long time to build and free.
+    sample = timers[:min(count, 100_000)]
+    heap, coroutine_bytes = _measure(sample, _coroutines)
+    for _, _, coroutine in heap:
+        coroutine.close()
+    del heap
+
+    wheel, wheel_bytes = _measure(timers, _wheel)
+
+    # Timed separately, as tracing allocations slows every one of them down.
+    start = time.perf_counter()
+    _wheel(timers)
+    add_rate = count / (time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    empty = HierarchicalTimingWheel(START)
+    structure_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del empty
+
+    cancelled = set(rng.sample(range(count), count // 10))
+
+    start = time.perf_counter()
+    for reminder_id in cancelled:
+        wheel.cancel(reminder_id)
+    cancel_rate = len(cancelled) / (time.perf_counter() - start)
+
+    due = {reminder_id: math.ceil(when) for reminder_id, when in timers if when <= START + DAY and reminder_id not in cancelled}
+    expired = 0
+
+    start = time.perf_counter()
+    for second in range(1, DAY + 1):
+        for reminder_id in wheel.advance(START + second):
+            assert due.pop(reminder_id) == START + second, reminder_id
+            expired += 1
+    advance_time = time.perf_counter() - start
+
+    assert not due, f"{len(due)} timers due in the first day did not expire"
+
+    print(f"timers: {count:,} over 30 days")
+    print(f"coroutine + heap entry: {coroutine_bytes:>12,.0f} bytes per timer ({coroutine_bytes * count / 2 ** 20:,.0f} MiB for all of them)")
+    print(f"timing wheel:           {wheel_bytes:>12,.0f} bytes per timer ({wheel_bytes * count / 2 ** 20:,.0f} MiB for all of them)")
+    print(f"empty wheel:            {structure_bytes:>12,} bytes, whatever it holds")
+    print(f"add:                    {add_rate:>12,.0f} timers/s")
+    print(f"cancel:                 {cancel_rate:>12,.0f} timers/s")
+    print(f"advance:                {advance_time / DAY * 1e6:>12,.1f} us per tick over one day, {expired:,} expired on time")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
 import collections
-import copy
+import importlib
 import logging
-import re
+import math
 import time
 import traceback
 from typing import Any, Callable, Optional, Type
@@ -13,8 +14,6 @@ from typing import Any, Callable, Optional, Type
 # Packages
 import aiohttp
 import aioredis
-import aioscheduler
-import asyncpg
 import discord
 import ksoftapi
 import mystbin
@@ -27,12 +26,18 @@ from discord.ext.alternatives import converter_dict
 from pendulum.tz.timezone import Timezone
 
 # My stuff
-from core import config
-from utilities import checks, context, converters, enums, help, managers, objects
+from core import config, startup
+from utilities import checks, cluster, context, converters, database, enums, help, managers, monitoring, objects, paste, pipeline
 
 
 __log__: logging.Logger = logging.getLogger("bot")
 
+STATEMENT_CACHE_SIZE = 512
+
+# Slow to import, but only needed by a few commands, so they're kept out of the login path and imported off the event
+# loop once the bot is ready instead of in the middle of whichever command first needs them.
+PREWARM_MODULES = ("dateparser.search", "bs4")
+
 CONVERTERS = {
     objects.Reminder:         converters.ReminderConverter,
     enums.ReminderRepeatType: converters.ReminderRepeatTypeConverter,
@@ -44,7 +49,7 @@ class SkeletonClique(commands.AutoShardedBot):
 
     converters: dict[type, Callable[..., Any]]
 
-    def __init__(self) -> None:
+    def __init__(self, *, cluster_info: Optional[cluster.ClusterInfo] = None) -> None:
         super().__init__(
             status=discord.Status.dnd,
             activity=discord.Activity(type=discord.ActivityType.playing, name="aaaaa!"),
@@ -54,23 +59,32 @@ class SkeletonClique(commands.AutoShardedBot):
             command_prefix=commands.when_mentioned_or(config.PREFIX),
             case_insensitive=True,
             owner_ids=config.OWNER_IDS,
+            shard_ids=cluster_info.shard_ids if cluster_info else None,
+            shard_count=cluster_info.shard_count if cluster_info else None
         )
         self._BotBase__cogs = commands.core._CaseInsensitiveDict()
 
-        self.session: aiohttp.ClientSession = aiohttp.ClientSession()
+        self.tracer: monitoring.Tracer = monitoring.TRACER
+        self.tracer.instrument_commands()
+
+        self.session: aiohttp.ClientSession = aiohttp.ClientSession(trace_configs=[self.tracer.trace_config()])
         self.process: psutil.Process = psutil.Process()
         self.socket_stats: collections.Counter = collections.Counter()
+        self.socket_rates: monitoring.SocketStats = monitoring.SocketStats()
 
         self.ERROR_LOG: discord.Webhook = discord.Webhook.from_url(session=self.session, url=config.ERROR_WEBHOOK_URL)
         self.DMS_LOG: discord.Webhook = discord.Webhook.from_url(session=self.session, url=config.DM_WEBHOOK_URL)
         self.COMMON_LOG: discord.Webhook = discord.Webhook.from_url(session=self.session, url=config.COMMON_LOG_WEBHOOK_URL)
         self.IMPORTANT_LOG: discord.Webhook = discord.Webhook.from_url(session=self.session, url=config.IMPORTANT_LOG_WEBHOOK_URL)
 
-        self.db: Optional[asyncpg.Pool] = None
+        self.db: Optional[monitoring.InstrumentedPool] = None
+        self.repository: database.Repository = database.Repository(bot=self)
+        self.migrator: database.Migrator = database.Migrator(bot=self)
         self.redis: Optional[aioredis.Redis] = None
+        self.store: managers.ConfigStore = managers.ConfigStore(bot=self)
 
-        self.scheduler: aioscheduler.Manager = aioscheduler.Manager()
         self.mystbin: mystbin.Client = mystbin.Client(session=self.session)
+        self.paste: paste.PasteClient = paste.PasteClient(self.mystbin)
         self.ksoft: ksoftapi.Client = ksoftapi.Client(api_key=config.KSOFT_TOKEN)
         self.spotify: spotify.Client = spotify.Client(client_id=config.SPOTIFY_CLIENT_ID, client_secret=config.SPOTIFY_CLIENT_SECRET)
         self.spotify_http: spotify.HTTPClient = spotify.HTTPClient(client_id=config.SPOTIFY_CLIENT_ID, client_secret=config.SPOTIFY_CLIENT_SECRET)
@@ -78,9 +92,32 @@ class SkeletonClique(commands.AutoShardedBot):
 
         self.user_manager: managers.UserManager = managers.UserManager(bot=self)
         self.guild_manager: managers.GuildManager = managers.GuildManager(bot=self)
+        self.coherence: managers.CacheCoherence = managers.CacheCoherence(bot=self)
+        self.reminders: managers.ReminderScheduler = managers.ReminderScheduler(bot=self)
+
+        self.cluster: Optional[cluster.ClusterClient] = cluster.ClusterClient(cluster_info) if cluster_info else None
+
+        self.pipeline: pipeline.MessagePipeline = pipeline.MessagePipeline()
+        self.pipeline.add_stage("commands", self.process_commands, order=0, background=True)
+
+        self.metrics: monitoring.Metrics = monitoring.METRICS
+        self.queries: monitoring.QueryStats = monitoring.QUERIES
+        self.metrics_server: monitoring.MetricsServer = monitoring.MetricsServer(
+            self.metrics,
+            port=cluster_info.metrics_port if cluster_info else monitoring.METRICS_PORT
+        )
+        self.loop_monitor: monitoring.LoopMonitor = monitoring.LoopMonitor()
+        self.profiler: monitoring.SamplingProfiler = monitoring.SamplingProfiler()
+        self.memory: monitoring.MemoryTracker = monitoring.MemoryTracker()
 
         self.first_ready: bool = True
         self.start_time: float = time.time()
+        self.startup: startup.StartupTimeline = startup.TIMELINE
+
+        self._prewarm_task: Optional[asyncio.Task[None]] = None
+
+        self._register_metrics()
+        self._register_routes()
 
         self.add_check(checks.global_check, call_once=True)
 
@@ -88,30 +125,122 @@ class SkeletonClique(commands.AutoShardedBot):
 
     #
 
+    def _register_metrics(self) -> None:
+
+        self.metrics.latency.set_function(lambda: {(str(shard_id),): latency for shard_id, latency in self.latencies if not math.isnan(latency)})
+        self.metrics.cache_size.set_function(lambda: {("users",): len(self.user_manager.cache), ("guilds",): len(self.guild_manager.cache), ("pastes",): self.paste.cached, ("reminders",): self.reminders.pending})
+        self.metrics.webhook_queue.set_function(lambda: self.paste.queued)
+        self.metrics.reminder_queue.set_function(lambda: self.reminders.delivery.queued)
+        self.metrics.voice_players.set_function(
+            lambda: dict(
+                collections.Counter(
+                    ("playing" if player.is_playing() else "paused" if getattr(player, "paused", False) else "idle",) for player in self.voice_clients
+                )
+            )
+        )
+        self.metrics.guilds.set_function(lambda: len(self.guilds))
+        self.metrics.users.set_function(lambda: len(self.users))
+        self.metrics.memory.set_function(lambda: self.process.memory_info().rss)
+        self.metrics.uptime.set_function(lambda: time.time() - self.start_time)
+
+    def _register_routes(self) -> None:
+
+        if self.cluster is None:
+            return
+
+        self.cluster.add_route("stats", self._cluster_stats)
+        self.cluster.add_role_listener("reminders", self.reminders.set_owner)
+
+    async def _cluster_stats(self, _: Any) -> dict[str, Any]:
+        return {
+            "shards":  list(self.shards),
+            "guilds":  len(self.guilds),
+            "users":   len(self.users),
+            "voice":   len(self.voice_clients),
+            "latency": self.latency,
+            "memory":  self.process.memory_info().rss,
+            "uptime":  time.time() - self.start_time,
+            "ready":   self.is_ready(),
+        }
+
+    def owns_singleton(self, singleton: str) -> bool:
+        """
+        Whether this process should run a job that must only run once across all clusters, which is always the case
+        when the bot isn't running as a cluster.
+        """
+        return self.cluster is None or self.cluster.owns(singleton)
+
+    def track_shard(self, shard_id: int) -> None:
+        """
+        Wraps the dispatch function of a shards current websocket so that socket event types are recorded with the
+        shard they arrived on. Websockets are replaced on reconnect, so this is called on every connect and resume.
+        """
+
+        if (shard := self.get_shard(shard_id)) is None or (ws := getattr(shard._parent, "ws", None)) is None or getattr(ws, "_tracked", False):
+            return
+
+        dispatch = ws._dispatch
+
+        def tracked_dispatch(event: str, *args: Any, **kwargs: Any) -> None:
+
+            if event == "socket_event_type":
+                self.socket_rates.record(args[0], shard_id)
+
+            dispatch(event, *args, **kwargs)
+
+        ws._dispatch = tracked_dispatch
+        ws._tracked = True
+
+    #
+
+    async def on_message(self, message: discord.Message) -> None:
+        await self.pipeline.run(message)
+
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.user_manager.profiles.add_member(member.guild.id, member.id)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.user_manager.profiles.remove_member(member.guild.id, member.id)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.user_manager.profiles.remove_guild(guild.id)
+
     async def process_commands(self, message: discord.Message) -> None:
 
         if message.author.bot:
             return
 
-        ctx = await self.get_context(message)
+        with self.tracer.trace("message", message=message.id, channel=message.channel.id) as trace:
 
-        if ctx.command and ctx.command.name in ["play", "yt-music", "soundcloud", "search", "play-now", "play-next", "rolecounts"]:
+            with self.tracer.span("get_context"):
+                ctx = await self.get_context(message)
 
-            content = message.content
-            start = content.index(ctx.invoked_with) + len(ctx.invoked_with) + 1
-            try:
-                end = content.index(" --")
-            except ValueError:
-                end = len(content)
+            if ctx.command is None:
+                trace.discard()
+            else:
+                trace.name = f"command:{ctx.command.qualified_name}"
+                trace.tags["author"] = ctx.author.id
 
-            content = (content[:start] + ('"' + content[start:end] + '"') + content[end:]).replace('""', "")
+            await self.invoke(ctx)
 
-            message = copy.copy(message)
-            message.content = re.sub(r"--([^\s]+)\s*", r"--\1 true ", content)
+        self.tracer.record(trace)
 
-            ctx = await self.get_context(message)
+    async def invoke(self, ctx: context.Context) -> None:
+
+        if ctx.command is None:
+            await super().invoke(ctx)
+            return
+
+        start = time.perf_counter()
+        try:
+            await super().invoke(ctx)
+        finally:
+            self.metrics.command_latency.observe(time.perf_counter() - start, ctx.command.qualified_name)
+            self.metrics.commands.inc(ctx.command.qualified_name, "failed" if ctx.command_failed else "success")
 
-        await self.invoke(ctx)
+    async def can_run(self, ctx: context.Context, *, call_once: bool = False) -> bool:
+        with self.tracer.span("checks.global" if call_once else "checks.bot"):
+            return await super().can_run(ctx, call_once=call_once)
 
     async def get_context(self, message: discord.Message, *, cls: Type[context.Context] = context.Context) -> context.Context:
         return await super().get_context(message=message, cls=cls)
@@ -121,44 +250,128 @@ class SkeletonClique(commands.AutoShardedBot):
 
     #
 
-    async def start(self, token: str, *, reconnect: bool = True) -> None:
+    async def _connect_postgresql(self) -> None:
 
-        try:
-            __log__.debug("[POSTGRESQL] Attempting connection.")
-            db = await asyncpg.create_pool(**config.POSTGRESQL, max_inactive_connection_lifetime=0)
-        except Exception as e:
-            __log__.critical(f"[POSTGRESQL] Error while connecting.\n{e}\n")
-            raise ConnectionError()
-        else:
-            __log__.info("[POSTGRESQL] Successful connection.")
-            self.db = db
+        with self.startup.phase("postgresql"):
 
-        try:
-            __log__.debug("[REDIS] Attempting connection.")
-            redis = aioredis.from_url(url=config.REDIS, decode_responses=True, retry_on_timeout=True)
-            await redis.ping()
-        except (aioredis.ConnectionError, aioredis.ResponseError) as e:
-            __log__.critical(f"[REDIS] Error while connecting.\n{e}\n")
-            raise ConnectionError()
-        else:
-            __log__.info("[REDIS] Successful connection.")
-            self.redis = redis
+            try:
+                __log__.debug("[POSTGRESQL] Attempting connection.")
+                db = await monitoring.InstrumentedPool.create(
+                    **config.POSTGRESQL,
+                    init=database.init_connection,
+                    statement_cache_size=STATEMENT_CACHE_SIZE,
+                    max_inactive_connection_lifetime=0
+                )
+            except Exception as e:
+                __log__.critical(f"[POSTGRESQL] Error while connecting.\n{e}\n")
+                raise ConnectionError()
+            else:
+                __log__.info("[POSTGRESQL] Successful connection.")
+                self.db = db
+
+        with self.startup.phase("migrations"):
+
+            try:
+                migrations = await self.migrator.run()
+            except Exception as e:
+                __log__.critical(f"[MIGRATIONS] Error while migrating.\n{e}\n")
+                raise ConnectionError()
+            else:
+                if migrations:
+                    # Connections opened before the schema existed couldn't prepare their statements.
+                    await self.db.expire_connections()
+
+        with self.startup.phase("blacklist"):
+            await self.user_manager.load_blacklist()
+
+        with self.startup.phase("profiles"):
+            await self.user_manager.profiles.load()
+
+    async def _connect_redis(self) -> None:
+
+        with self.startup.phase("redis"):
 
-        for extension in config.EXTENSIONS:
             try:
-                self.load_extension(extension)
-                __log__.info(f"[EXTENSIONS] Loaded - {extension}")
-            except commands.ExtensionNotFound:
-                __log__.warning(f"[EXTENSIONS] Extension not found - {extension}")
-            except commands.NoEntryPointError:
-                __log__.warning(f"[EXTENSIONS] No entry point - {extension}")
-            except commands.ExtensionFailed as error:
-                __log__.warning(f"[EXTENSIONS] Failed - {extension} - Reason: {traceback.print_exception(type(error), error, error.__traceback__)}")
+                __log__.debug("[REDIS] Attempting connection.")
+                redis = monitoring.InstrumentedRedis.from_url(url=config.REDIS, decode_responses=True, retry_on_timeout=True)
+                await redis.ping()
+            except (aioredis.ConnectionError, aioredis.ResponseError) as e:
+                __log__.critical(f"[REDIS] Error while connecting.\n{e}\n")
+                raise ConnectionError()
+            else:
+                __log__.info("[REDIS] Successful connection.")
+                self.redis = redis
+
+            await self.store.connect(config.REDIS)
+
+    async def _prewarm(self) -> None:
+
+        with self.startup.phase("prewarm"):
+            for module in PREWARM_MODULES:
+                try:
+                    await asyncio.to_thread(importlib.import_module, module)
+                except ImportError as e:
+                    __log__.warning(f"[STARTUP] Could not prewarm '{module}'.\n{e}\n")
+
+    def _load_extensions(self) -> None:
+
+        for extension in config.EXTENSIONS:
+
+            with self.startup.phase(extension):
+                try:
+                    self.load_extension(extension)
+                    __log__.info(f"[EXTENSIONS] Loaded - {extension}")
+                except commands.ExtensionNotFound:
+                    __log__.warning(f"[EXTENSIONS] Extension not found - {extension}")
+                except commands.NoEntryPointError:
+                    __log__.warning(f"[EXTENSIONS] No entry point - {extension}")
+                except commands.ExtensionFailed as error:
+                    __log__.warning(f"[EXTENSIONS] Failed - {extension} - Reason: {traceback.print_exception(type(error), error, error.__traceback__)}")
+
+    async def start(self, token: str, *, reconnect: bool = True) -> None:
+
+        self.startup.mark("start")
+        self.loop_monitor.start()
+
+        # Neither datastore depends on the other, so their connection round trips overlap.
+        with self.startup.phase("datastores"):
+            await asyncio.gather(self._connect_postgresql(), self._connect_redis())
+
+        # Caches only need to be kept coherent when more than one process shares the database.
+        if self.cluster is not None or getattr(config, "CACHE_COHERENCE", False):
+            await self.coherence.start()
+
+        if self.cluster is not None:
+            with self.startup.phase("cluster"):
+                await self.cluster.connect()
 
+        with self.startup.phase("snapshots"):
+            await asyncio.gather(self.user_manager.restore_snapshot(), self.guild_manager.restore_snapshot())
+
+        with self.startup.phase("extensions"):
+            self._load_extensions()
+
+        try:
+            await self.metrics_server.start()
+        except OSError as e:
+            __log__.warning(f"[METRICS] Could not start metrics server.\n{e}\n")
+
+        self.startup.mark("login")
         await super().start(token=token, reconnect=reconnect)
 
     async def close(self) -> None:
 
+        await asyncio.gather(self.user_manager.save_snapshot(), self.guild_manager.save_snapshot())
+
+        self.loop_monitor.stop()
+        self.reminders.close()
+        await self.metrics_server.close()
+
+        if self.cluster is not None:
+            await self.cluster.close()
+
+        await self.coherence.close()
+
         await self.session.close()
         await self.ksoft.close()
         await self.spotify.close()
@@ -168,6 +381,7 @@ class SkeletonClique(commands.AutoShardedBot):
             await self.db.close()
         if self.redis:
             await self.redis.close()
+        await self.store.close()
 
         await super().close()
 
@@ -177,7 +391,10 @@ class SkeletonClique(commands.AutoShardedBot):
 
         if self.first_ready is True:
             self.first_ready = False
+            self.startup.mark("ready")
+            __log__.debug("[STARTUP] Timeline:\n" + "\n".join(self.startup.report()))
+            self._prewarm_task = asyncio.create_task(self._prewarm())
 
-        self.scheduler.start()
+        self.reminders.start()
 
         await self.cogs["Voice"].load()
@@ -0,0 +1,291 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import collections
+import contextlib
+import importlib.abc
+import importlib.machinery
+import logging
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterator, Sequence
+from typing import Any, Optional
+
+
+__log__: logging.Logger = logging.getLogger("bot.startup")
+
+BAR_WIDTH = 40
+
+
+class ImportRecord:
+
+    __slots__ = ("name", "started_at", "cumulative", "own", "phase")
+
+    def __init__(self, name: str, started_at: float, phase: Optional[str]) -> None:
+
+        self.name: str = name
+        self.started_at: float = started_at
+        self.cumulative: float = 0.0
+        self.own: float = 0.0
+        self.phase: Optional[str] = phase
+
+    def __repr__(self) -> str:
+        return f"<ImportRecord name='{self.name}' cumulative={self.cumulative:.4f} own={self.own:.4f}>"
+
+    @property
+    def package(self) -> str:
+        return self.name.partition(".")[0]
+
+
+class _TimedLoader:
+    """
+    Stands in for a modules loader only while the module is executing, then puts the original back on the module
+    and its spec so nothing that inspects `__loader__` later sees this wrapper.
+    """
+
+    def __init__(self, loader: Any, timer: ImportTimer) -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._loader, item)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> Optional[types.ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        with self._timer.time(module.__name__):
+            self._loader.exec_module(module)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that defers to the real finders and wraps the loader they return, recording how long every
+    module took to execute. `own` time excludes the modules it imported itself, like `python -X importtime`.
+    """
+
+    def __init__(self, timeline: StartupTimeline) -> None:
+
+        self._timeline: StartupTimeline = timeline
+        self._records: dict[str, ImportRecord] = {}
+        self._local: threading.local = threading.local()
+        self._finding: set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"<ImportTimer installed={self.installed} modules={len(self._records)}>"
+
+    # Properties
+
+    @property
+    def installed(self) -> bool:
+        return self in sys.meta_path
+
+    @property
+    def records(self) -> list[ImportRecord]:
+        return list(self._records.values())
+
+    @property
+    def total(self) -> float:
+        return sum(record.own for record in self._records.values())
+
+    @property
+    def _stack(self) -> list[ImportRecord]:
+
+        # Modules can be imported off the event loop too, and their nesting must not be mixed up with the main thread's.
+        if (stack := getattr(self._local, "stack", None)) is None:
+            stack = self._local.stack = []
+
+        return stack
+
+    # Lifecycle
+
+    def install(self) -> None:
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self.installed:
+            sys.meta_path.remove(self)
+
+    # Finding
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]], target: Optional[types.ModuleType] = None) -> Optional[importlib.machinery.ModuleSpec]:
+
+        if fullname in self._finding:
+            return None
+
+        self._finding.add(fullname)
+
+        try:
+            for finder in sys.meta_path:
+
+                if finder is self or (find_spec := getattr(finder, "find_spec", None)) is None:
+                    continue
+
+                if (spec := find_spec(fullname, path, target)) is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)  # type: ignore
+
+        return spec
+
+    @contextlib.contextmanager
+    def time(self, name: str) -> Iterator[None]:
+
+        record = ImportRecord(name, self._timeline.elapsed, self._timeline.current)
+        self._stack.append(record)
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+
+            record.cumulative = time.perf_counter() - start
+            record.own += record.cumulative
+
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].own -= record.cumulative
+
+            self._records[name] = record
+
+    # Reports
+
+    def slowest(self, limit: int = 15, *, own: bool = False) -> list[ImportRecord]:
+        return sorted(self._records.values(), key=lambda record: record.own if own else record.cumulative, reverse=True)[:limit]
+
+    def packages(self, limit: int = 15) -> list[tuple[str, float, int]]:
+
+        own: collections.Counter[str] = collections.Counter()
+        counts: collections.Counter[str] = collections.Counter()
+
+        for record in self._records.values():
+            own[record.package] += record.own
+            counts[record.package] += 1
+
+        return [(name, total, counts[name]) for name, total in own.most_common(limit)]
+
+    def during(self, phase: str) -> list[ImportRecord]:
+        return [record for record in self._records.values() if record.phase == phase]
+
+
+class Phase:
+
+    __slots__ = ("name", "started_at", "duration")
+
+    def __init__(self, name: str, started_at: float) -> None:
+
+        self.name: str = name
+        self.started_at: float = started_at
+        self.duration: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"<Phase name='{self.name}' started_at={self.started_at:.3f} duration={self.duration}>"
+
+    @property
+    def ended_at(self) -> Optional[float]:
+        return None if self.duration is None else self.started_at + self.duration
+
+
+class StartupTimeline:
+    """
+    Records when each startup phase began and how long it took, relative to this module being imported, which
+    `main.py` does before anything else. Phases may overlap, which is how concurrent work shows up in the report.
+    """
+
+    def __init__(self) -> None:
+
+        self._origin: float = time.perf_counter()
+        self._phases: list[Phase] = []
+        self._marks: dict[str, float] = {}
+        self._current: list[str] = []
+
+        self.imports: ImportTimer = ImportTimer(self)
+
+    def __repr__(self) -> str:
+        return f"<StartupTimeline phases={len(self._phases)} marks={len(self._marks)}>"
+
+    # Properties
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._origin
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._current[-1] if self._current else None
+
+    @property
+    def phases(self) -> list[Phase]:
+        return list(self._phases)
+
+    @property
+    def marks(self) -> dict[str, float]:
+        return dict(self._marks)
+
+    # Recording
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+
+        phase = Phase(name, self.elapsed)
+        self._phases.append(phase)
+        self._current.append(name)
+
+        try:
+            yield phase
+        finally:
+            phase.duration = self.elapsed - phase.started_at
+            self._current.remove(name)
+
+            __log__.debug(f"[STARTUP] {name} took {phase.duration * 1000:.1f}ms.")
+
+    def mark(self, name: str) -> float:
+
+        if name not in self._marks:
+            self._marks[name] = self.elapsed
+            __log__.info(f"[STARTUP] Reached '{name}' after {self._marks[name]:.3f}s.")
+
+        return self._marks[name]
+
+    # Reports
+
+    def report(self) -> list[str]:
+        """
+        Renders every phase as a bar positioned on a shared time axis, followed by the marks.
+        """
+
+        end = max([phase.ended_at or self.elapsed for phase in self._phases] + list(self._marks.values()) + [0.001])
+        scale = BAR_WIDTH / end
+        width = max((len(phase.name) for phase in self._phases), default=0)
+
+        lines = []
+
+        for phase in self._phases:
+
+            duration = phase.duration if phase.duration is not None else self.elapsed - phase.started_at
+            offset = int(phase.started_at * scale)
+            bar = "█" * max(int(duration * scale), 1)
+
+            lines.append(f"{phase.name:<{width}} |{' ' * offset}{bar:<{BAR_WIDTH - offset}}| {phase.started_at:7.3f}s +{duration * 1000:8.1f}ms")
+
+        lines.extend(f"{name:<{width}} @ {timestamp:.3f}s" for name, timestamp in self._marks.items())
+
+        return lines
+
+
+TIMELINE = StartupTimeline()
@@ -1,10 +1,15 @@
 # Future
 from __future__ import annotations
 
+# Standard Library
+import datetime
+import logging
+
 # Packages
+import aioredis
 import discord
 import pendulum
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 # My stuff
 from core import colours, emojis
@@ -12,6 +17,13 @@ from core.bot import SkeletonClique
 from utilities import context, converters, exceptions, utils
 
 
+__log__: logging.Logger = logging.getLogger("extensions.birthdays")
+
+# Enough mentions to stay well within the message length limit.
+MENTIONS_PER_MESSAGE = 50
+ANNOUNCED_TTL = 60 * 60 * 48
+
+
 def setup(bot: SkeletonClique) -> None:
     bot.add_cog(Birthdays(bot=bot))
 
@@ -21,6 +33,82 @@ class Birthdays(commands.Cog):
     def __init__(self, bot: SkeletonClique) -> None:
         self.bot = bot
 
+        self.announce_birthdays.start()
+
+    # Announcements
+
+    @tasks.loop(time=datetime.time(hour=0, tzinfo=datetime.timezone.utc))
+    async def announce_birthdays(self) -> None:
+        await self._announce_today()
+
+    @announce_birthdays.before_loop
+    async def before_announce_birthdays(self) -> None:
+
+        await self.bot.wait_until_ready()
+
+        # Catch up if the bot was down at midnight, guilds that were already announced to today are skipped.
+        await self._announce_today()
+
+    async def _announce_today(self) -> None:
+
+        # An exception escaping the loop, or its before_loop, would stop announcements until the next restart.
+        try:
+            await self.announce(pendulum.now(tz="UTC").date())
+        except Exception as error:
+            __log__.error(f"[BIRTHDAYS] Could not announce birthdays. {type(error).__name__}: {error}")
+
+    def cog_unload(self) -> None:
+        self.announce_birthdays.cancel()
+
+    async def announce(self, date: pendulum.Date) -> None:
+        """
+        Sends one message per guild, or a few for very large ones, mentioning every member whose birthday it is.
+        Only guilds with a birthday channel that this cluster can see are announced to, and each guild is claimed in
+        redis first so that a restart on the same day doesn't announce twice.
+        """
+
+        due: dict[int, tuple[discord.TextChannel, list[int]]] = {}
+
+        for guild_id, channel_id in (await self.bot.repository.birthday_channels()).items():
+
+            if (guild := self.bot.get_guild(guild_id)) is None or (channel := guild.get_channel(channel_id)) is None:
+                continue
+
+            if user_ids := self.bot.user_manager.profiles.born_on(guild, date):
+                due[guild_id] = (channel, user_ids)
+
+        if not due:
+            return
+
+        try:
+            async with self.bot.redis.pipeline(transaction=False) as pipeline:
+                for guild_id in due:
+                    pipeline.set(f"birthdays:announced:{date.isoformat()}:{guild_id}", "", nx=True, ex=ANNOUNCED_TTL)
+                claims = await pipeline.execute()
+        except aioredis.RedisError as error:
+            __log__.warning(f"[BIRTHDAYS] Could not claim announcements for {date}. {type(error).__name__}: {error}")
+            return
+
+        # SET NX returns None for the guilds that were already claimed.
+        announced = sum(1 for claimed in claims if claimed)
+
+        for (channel, user_ids), claimed in zip(due.values(), claims):
+
+            if not claimed:
+                continue
+
+            for index in range(0, len(user_ids), MENTIONS_PER_MESSAGE):
+                mentions = ", ".join(f"<@{user_id}>" for user_id in user_ids[index:index + MENTIONS_PER_MESSAGE])
+                try:
+                    await channel.send(f"\N{BIRTHDAY CAKE} Happy birthday to {mentions}!", allowed_mentions=discord.AllowedMentions(users=True))
+                except discord.HTTPException as error:
+                    __log__.warning(f"[BIRTHDAYS] Could not announce birthdays in '{channel.guild.id}'. {error}")
+                    break
+
+        __log__.info(f"[BIRTHDAYS] Announced birthdays for {date} in {announced} guild{'s' if announced != 1 else ''}.")
+
+    # Commands
+
     @commands.group(name="birthday", aliases=["bd"], invoke_without_command=True)
     async def _birthday(self, ctx: context.Context, *, person: discord.Member = utils.MISSING) -> None:
         """
@@ -170,12 +258,12 @@ class Birthdays(commands.Cog):
 
         await ctx.paginate_embed(
             entries=[
-                f"{ctx.guild.get_member(user_config.id).mention}:\n"
-                f"**Birthday:** {utils.format_date(user_config.birthday)}\n"
-                f"**Next birthday date:** {utils.format_date(user_config.next_birthday)}\n"
-                f"**Next birthday:** In {utils.format_difference(user_config.next_birthday)}\n"
-                f"**Age:** {user_config.age}"
-                for user_config in birthdays
+                f"<@{user_id}>:\n"
+                f"**Birthday:** {utils.format_date(birthday)}\n"
+                f"**Next birthday date:** {utils.format_date(utils.next_birthday(birthday))}\n"
+                f"**Next birthday:** In {utils.format_difference(utils.next_birthday(birthday))}\n"
+                f"**Age:** {utils.age(birthday)}"
+                for user_id, birthday in birthdays
             ],
             per_page=3,
             splitter="\n\n",
@@ -196,16 +284,16 @@ class Birthdays(commands.Cog):
                 description="No one has set their birthday, or everyone has set them to be private."
             )
 
-        user_config = birthdays[0]
-        member = ctx.guild.get_member(user_config.id)
+        user_id, birthday = birthdays[0]
+        member = ctx.guild.get_member(user_id)
 
         embed = discord.Embed(
             colour=colours.MAIN,
             title=f"Birthday information for {member}:",
-            description=f"**Birthday:** {utils.format_date(user_config.birthday)}\n"
-                        f"**Next birthday date:** {utils.format_date(user_config.next_birthday)}\n"
-                        f"**Next birthday:** In {utils.format_difference(user_config.next_birthday)}\n"
-                        f"**Age:** {user_config.age}\n"
+            description=f"**Birthday:** {utils.format_date(birthday)}\n"
+                        f"**Next birthday date:** {utils.format_date(utils.next_birthday(birthday))}\n"
+                        f"**Next birthday:** In {utils.format_difference(utils.next_birthday(birthday))}\n"
+                        f"**Age:** {utils.age(birthday)}\n"
         )
         await ctx.reply(embed=embed)
 
@@ -9,7 +9,6 @@ from typing import Any, Literal, Optional
 # Packages
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
 
 # My stuff
 from core import colours, emojis
@@ -33,6 +32,9 @@ class Colours(commands.Cog):
     @decorators.async_executor
     def generate_colour_square(self, colour: str) -> Any:
 
+        # Packages
+        from PIL import Image
+
         with Image.new(mode="RGBA", size=(256, 100), color=colour) as image:
 
             buffer = io.BytesIO()
@@ -44,6 +46,9 @@ class Colours(commands.Cog):
     @decorators.async_executor
     def generate_colour_scheme(self, hex_codes: list[str], names: list[str]) -> Any:
 
+        # Packages
+        from PIL import Image, ImageDraw, ImageFont
+
         with Image.new(mode="RGBA", size=(200 * len(hex_codes), 225), color="white") as image:
 
             draw = ImageDraw.Draw(im=image)
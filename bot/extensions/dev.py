@@ -2,17 +2,23 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
 import collections
+import io
+import math
 import time
-from typing import Optional
+from typing import Any, Optional
 
 # Packages
+import discord
+import humanize
+import pendulum
 from discord.ext import commands
 
 # My stuff
-from core import colours, config, emojis
+from core import colours, config, emojis, values
 from core.bot import SkeletonClique
-from utilities import context, converters, exceptions, utils
+from utilities import context, converters, exceptions, monitoring, utils
 
 
 def setup(bot: SkeletonClique) -> None:
@@ -24,6 +30,36 @@ class Dev(commands.Cog):
     def __init__(self, bot: SkeletonClique) -> None:
         self.bot = bot
 
+        if self.bot.cluster is not None:
+            self.bot.cluster.add_route("invoke", self._invoke_route)
+
+    def cog_unload(self) -> None:
+
+        if self.bot.cluster is not None:
+            self.bot.cluster.remove_route("invoke")
+
+    async def _invoke_route(self, data: dict[str, Any]) -> str:
+        """
+        Cluster route that runs a `dev` subcommand on this cluster, replying in the channel it was requested from.
+        """
+
+        channel: Any = self.bot.get_channel(data["channel_id"]) or self.bot.get_partial_messageable(data["channel_id"])
+
+        message = await channel.fetch_message(data["message_id"])
+        message.content = data["content"]
+
+        ctx = await self.bot.get_context(message)
+
+        if ctx.command is None:
+            raise ValueError("command not found.")
+
+        # The message is rewritten to pass the owner checks, so only the developer commands may be run this way.
+        if ctx.command.root_parent is not self.dev:
+            raise ValueError("only commands in the dev group can be run on other clusters.")
+
+        await self.bot.invoke(ctx)
+        return ctx.command.qualified_name
+
     @commands.is_owner()
     @commands.group(name="dev", hidden=True, invoke_without_command=True)
     async def dev(self, ctx: context.Context) -> None:
@@ -94,7 +130,7 @@ class Dev(commands.Cog):
         )
 
     @commands.is_owner()
-    @dev.command(name="socketstats", aliases=["ss"], hidden=True)
+    @dev.group(name="socketstats", aliases=["ss"], hidden=True, invoke_without_command=True)
     async def dev_socket_stats(self, ctx: context.Context) -> None:
         """
         Displays a list of socket event counts since bot startup.
@@ -116,6 +152,715 @@ class Dev(commands.Cog):
             codeblock=True
         )
 
+    @commands.is_owner()
+    @dev_socket_stats.command(name="rates", aliases=["r"], hidden=True)
+    async def dev_socket_stats_rates(self, ctx: context.Context, shard: Optional[int] = None) -> None:
+        """
+        Displays per-event socket rates, peaks and sparklines for the last 10 minutes and 24 hours.
+
+        **shard**: The shard to display rates for, defaults to all shards.
+        """
+
+        rates = self.bot.socket_rates
+
+        if not (events := rates.events):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="No socket events have been recorded yet."
+            )
+
+        rows = []
+
+        for event in events:
+
+            seconds = rates.seconds(event=event, shard=shard)
+            minutes = rates.minutes(event=event, shard=shard)
+
+            if not any(minutes) and not any(seconds):
+                continue
+
+            rows.append(
+                (
+                    sum(seconds[-60:]) / 60,
+                    f"║ {event[:28]:28} ║ {sum(seconds[-60:]) / 60:>7.2f} ║ {max(seconds):>7} ║ {max(minutes):>8} ║ "
+                    f"{monitoring.sparkline(rates.downsample(seconds, 20)):20} ║ {monitoring.sparkline(rates.downsample(minutes, 24)):24} ║"
+                )
+            )
+
+        seconds = rates.seconds(shard=shard)
+
+        await ctx.paginate(
+            entries=[row for _, row in sorted(rows, key=lambda row: row[0], reverse=True)],
+            per_page=20,
+            header=f"Shard: {'all' if shard is None else shard} | Last minute: {sum(seconds[-60:]) / 60:.2f}/s | Peak second (10m): {max(seconds)}/s\n"
+                   "╔══════════════════════════════╦═════════╦═════════╦══════════╦══════════════════════╦══════════════════════════╗\n"
+                   "║ Event                        ║ Rate/s  ║ Peak/s  ║ Peak/min ║ Last 10 minutes      ║ Last 24 hours            ║\n"
+                   "╠══════════════════════════════╬═════════╬═════════╬══════════╬══════════════════════╬══════════════════════════╣\n",
+            footer="\n"
+                   "╚══════════════════════════════╩═════════╩═════════╩══════════╩══════════════════════╩══════════════════════════╝",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_socket_stats.command(name="shards", aliases=["s"], hidden=True)
+    async def dev_socket_stats_shards(self, ctx: context.Context) -> None:
+        """
+        Displays socket rates per shard for the last 10 minutes and 24 hours.
+        """
+
+        rates = self.bot.socket_rates
+
+        if not (shards := rates.shards):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="No socket events have been recorded yet."
+            )
+
+        entries = []
+
+        for shard in shards:
+
+            seconds = rates.seconds(shard=shard)
+            minutes = rates.minutes(shard=shard)
+
+            entries.append(
+                f"║ {shard:<5} ║ {sum(seconds[-60:]) / 60:>7.2f} ║ {max(seconds):>7} ║ {sum(minutes):>10} ║ "
+                f"{monitoring.sparkline(rates.downsample(seconds, 20)):20} ║ {monitoring.sparkline(rates.downsample(minutes, 24)):24} ║"
+            )
+
+        await ctx.paginate(
+            entries=entries,
+            per_page=20,
+            header="╔═══════╦═════════╦═════════╦════════════╦══════════════════════╦══════════════════════════╗\n"
+                   "║ Shard ║ Rate/s  ║ Peak/s  ║ Total 24h  ║ Last 10 minutes      ║ Last 24 hours            ║\n"
+                   "╠═══════╬═════════╬═════════╬════════════╬══════════════════════╬══════════════════════════╣\n",
+            footer="\n"
+                   "╚═══════╩═════════╩═════════╩════════════╩══════════════════════╩══════════════════════════╝",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev.group(name="traces", aliases=["tr"], hidden=True, invoke_without_command=True)
+    async def dev_traces(self, ctx: context.Context) -> None:
+        """
+        Displays recent command traces that were slower than the tracing threshold.
+        """
+
+        await self._paginate_traces(ctx, self.bot.tracer.slow, title=f"Slow traces (over {self.bot.tracer.threshold * 1000:.0f}ms)")
+
+    @commands.is_owner()
+    @dev_traces.command(name="recent", aliases=["r"], hidden=True)
+    async def dev_traces_recent(self, ctx: context.Context) -> None:
+        """
+        Displays the most recent command traces, regardless of duration.
+        """
+
+        await self._paginate_traces(ctx, self.bot.tracer.recent, title="Recent traces")
+
+    @commands.is_owner()
+    @dev_traces.command(name="show", aliases=["s"], hidden=True)
+    async def dev_traces_show(self, ctx: context.Context, trace_id: int) -> None:
+        """
+        Displays the span tree of a trace.
+
+        **trace_id**: The id of the trace to display.
+        """
+
+        if not (trace := self.bot.tracer.get(trace_id)):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description=f"There is no stored trace with id **{trace_id}**."
+            )
+
+        await ctx.paginate(
+            entries=trace.render().splitlines(),
+            per_page=25,
+            header=f"Trace {trace.id} | {trace.name} | {trace.duration * 1000:.2f}ms\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_traces.command(name="export", aliases=["e", "json"], hidden=True)
+    async def dev_traces_export(self, ctx: context.Context, which: str = "slow") -> None:
+        """
+        Exports stored traces as JSON.
+
+        **which**: Either **slow** or **recent**, defaults to slow.
+        """
+
+        buffer = io.BytesIO(self.bot.tracer.export(slow_only=which != "recent").encode())
+        await ctx.reply(file=discord.File(fp=buffer, filename=f"traces-{which}.json"))
+
+    @staticmethod
+    async def _paginate_traces(ctx: context.Context, traces: list[monitoring.Trace], *, title: str) -> None:
+
+        if not traces:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="There are no stored traces."
+            )
+
+        entries = []
+
+        for trace in reversed(traces):
+            time_ = pendulum.from_timestamp(trace.timestamp, tz="UTC").format("HH:mm:ss")
+            slowest = max(trace.children, key=lambda span: span.duration).name if trace.children else "N/A"
+            entries.append(f"║ {trace.id:<7} ║ {time_:8} ║ {trace.duration * 1000:>10.2f} ║ {trace.name[:30]:30} ║ {slowest[:24]:24} ║")
+
+        await ctx.paginate(
+            entries=entries,
+            per_page=15,
+            header=f"{title}\n"
+                   "╔═════════╦══════════╦════════════╦════════════════════════════════╦══════════════════════════╗\n"
+                   "║ ID      ║ Time     ║ Total (ms) ║ Name                           ║ Slowest span             ║\n"
+                   "╠═════════╬══════════╬════════════╬════════════════════════════════╬══════════════════════════╣\n",
+            footer="\n"
+                   "╚═════════╩══════════╩════════════╩════════════════════════════════╩══════════════════════════╝",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev.group(name="loop", aliases=["lag"], hidden=True, invoke_without_command=True)
+    async def dev_loop(self, ctx: context.Context) -> None:
+        """
+        Displays the event loop lag histogram and recent loop blocks.
+        """
+
+        monitor = self.bot.loop_monitor
+        histogram = self.bot.metrics.loop_lag
+
+        total = max(histogram.count(), 1)
+        lines = [
+            f"≤ {'inf' if math.isinf(bucket) else f'{bucket * 1000:.1f}':>7}ms {count:>8} {'█' * round(count / total * 40)}"
+            for bucket, count in histogram.distribution()
+        ]
+
+        p50, p99 = histogram.quantile(0.5), histogram.quantile(0.99)
+
+        blocks = [
+            f"{index:>2}. {pendulum.from_timestamp(block.timestamp, tz='UTC').format('HH:mm:ss')} "
+            f"{(block.duration or 0) * 1000:>8.1f}ms  {block.location}"
+            for index, block in enumerate(reversed(monitor.blocks), start=1)
+        ]
+
+        await ctx.paginate(
+            entries=[*lines, "", f"Recent blocks over {monitor.threshold * 1000:.0f}ms ({len(blocks)}):", *(blocks or ["None"])],
+            per_page=30,
+            header=f"Samples: {histogram.count()} | Last: {monitor.last_lag * 1000:.2f}ms | Max: {monitor.max_lag * 1000:.2f}ms | "
+                   f"p50: {(p50 or 0) * 1000:.2f}ms | p99: {(p99 or 0) * 1000:.2f}ms\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_loop.command(name="block", aliases=["b", "stack"], hidden=True)
+    async def dev_loop_block(self, ctx: context.Context, index: int = 1) -> None:
+        """
+        Displays the sampled stacks of a recent loop block.
+
+        **index**: The position of the block in the list shown by **dev loop**, defaults to the latest.
+        """
+
+        if not (blocks := list(reversed(self.bot.loop_monitor.blocks))) or not 0 < index <= len(blocks):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="There is no loop block at that position."
+            )
+
+        block = blocks[index - 1]
+        entries = []
+
+        for stack, samples in block.stacks.most_common():
+            entries.append(f"{samples} sample{'s' if samples > 1 else ''}:\n{stack}")
+
+        await ctx.paginate(
+            entries=entries,
+            per_page=1,
+            header=f"Blocked for {(block.duration or 0) * 1000:.1f}ms at {block.location}\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev.command(name="pipeline", aliases=["messages"], hidden=True)
+    async def dev_pipeline(self, ctx: context.Context) -> None:
+        """
+        Displays the message pipeline stages in order, with how often and for how long each one has run.
+        """
+
+        histogram = self.bot.metrics.message_stages
+        entries = []
+
+        for stage in self.bot.pipeline.stages:
+
+            count = histogram.count(stage.name)
+            p50, p99 = histogram.quantile(0.5, stage.name) or 0.0, histogram.quantile(0.99, stage.name) or 0.0
+            mean = histogram.total(stage.name) / count if count else 0.0
+
+            scope = "all" if stage.guild is None else "guilds" if stage.guild else "dms"
+            entries.append(
+                f"{stage.order:>3} {stage.name:<10} {scope:<6} {'bots' if stage.bots else '':<4} {count:>10} runs | "
+                f"mean {mean * 1000:.3f}ms | p50 {p50 * 1000:.3f}ms | p99 {p99 * 1000:.3f}ms"
+            )
+
+        await ctx.paginate(entries=entries, per_page=20, header="Message pipeline stages:\n\n", codeblock=True)
+
+    @commands.is_owner()
+    @dev.group(name="startup", aliases=["boot"], hidden=True, invoke_without_command=True)
+    async def dev_startup(self, ctx: context.Context) -> None:
+        """
+        Displays the startup timeline, with every phase placed on a shared time axis.
+        """
+
+        timeline = self.bot.startup
+        imports = timeline.imports
+
+        header = (
+            f"Imported {len(imports.records)} modules in {imports.total:.3f}s"
+            f"{'' if imports.installed else ' (import timing was not installed)'}.\n\n"
+        )
+
+        await ctx.paginate(entries=timeline.report(), per_page=25, header=header, codeblock=True)
+
+    @commands.is_owner()
+    @dev_startup.command(name="imports", aliases=["i"], hidden=True)
+    async def dev_startup_imports(self, ctx: context.Context, limit: int = 25) -> None:
+        """
+        Displays the slowest imports at startup, by total time and by time spent in the module itself, and the time
+        spent importing each extension.
+
+        **limit**: How many modules to show. Defaults to 25.
+        """
+
+        imports = self.bot.startup.imports
+
+        entries = [
+            "Slowest packages (own time):",
+            *(f"{own * 1000:9.1f}ms {count:>4} modules  {name}" for name, own, count in imports.packages(limit)),
+            "",
+            "Slowest modules (cumulative / own):",
+            *(f"{record.cumulative * 1000:9.1f}ms {record.own * 1000:9.1f}ms  {record.name}" for record in imports.slowest(limit)),
+            "",
+            "Extensions (cumulative import time):",
+            *(
+                f"{sum(record.own for record in imports.during(extension)) * 1000:9.1f}ms {len(imports.during(extension)):>4} modules  {extension}"
+                for extension in self.bot.extensions
+            ),
+        ]
+
+        await ctx.paginate(entries=entries, per_page=30, header="Startup imports:\n\n", codeblock=True)
+
+    @commands.is_owner()
+    @dev.group(name="cluster", aliases=["clusters"], hidden=True, invoke_without_command=True)
+    async def dev_cluster(self, ctx: context.Context) -> None:
+        """
+        Displays the shards, guilds, users, latency and memory of every cluster, and which cluster owns each singleton
+        job.
+        """
+
+        if self.bot.cluster is None:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="The bot is not running as a cluster."
+            )
+
+        responses = await self.bot.cluster.request("stats")
+        entries = []
+
+        for response in responses:
+
+            if not response.ok:
+                entries.append(f"Cluster {response.cluster:>2} | error: {response.error}")
+                continue
+
+            stats = response.data
+            entries.append(
+                f"Cluster {response.cluster:>2} | shards {stats['shards'][0]:>3}-{stats['shards'][-1]:<3} | {stats['guilds']:>6} guilds | "
+                f"{stats['users']:>8} users | {stats['voice']:>3} voice | {stats['latency'] * 1000:>7.1f}ms | "
+                f"{humanize.naturalsize(stats['memory']):>9} | {'ready' if stats['ready'] else 'starting'}"
+            )
+
+        ok = [response.data for response in responses if response.ok]
+        roles = ", ".join(f"{singleton} -> cluster {owner}" for singleton, owner in self.bot.cluster.roles.items()) or "none"
+
+        header = (
+            f"This is cluster {self.bot.cluster.id}. {len(ok)}/{len(responses)} clusters answered with "
+            f"{sum(stats['guilds'] for stats in ok)} guilds, {sum(stats['users'] for stats in ok)} users and "
+            f"{humanize.naturalsize(sum(stats['memory'] for stats in ok))} in total.\nSingletons: {roles}\n\n"
+        )
+
+        await ctx.paginate(entries=entries, per_page=20, header=header, codeblock=True)
+
+    @commands.is_owner()
+    @dev_cluster.command(name="invoke", aliases=["run"], hidden=True)
+    async def dev_cluster_invoke(self, ctx: context.Context, target: str, *, command: str) -> None:
+        """
+        Runs a command on another cluster, or on every cluster, with its output sent to this channel.
+
+        **target**: The id of the cluster to run the command on, or `all`.
+        **command**: The command to run, without the prefix.
+        """
+
+        if self.bot.cluster is None:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="The bot is not running as a cluster."
+            )
+
+        if target != "all" and not target.isdigit():
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="The target must be a cluster id or `all`."
+            )
+
+        responses = await self.bot.cluster.request(
+            "invoke",
+            {"channel_id": ctx.channel.id, "message_id": ctx.message.id, "content": f"{config.PREFIX}{command}"},
+            target=None if target == "all" else int(target),
+            timeout=60
+        )
+
+        await ctx.paginate(
+            entries=[f"Cluster {response.cluster:>2} | {'ran ' + response.data if response.ok else response.error}" for response in responses] or ["No clusters answered."],
+            per_page=20,
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev.command(name="profile", aliases=["prof"], hidden=True)
+    async def dev_profile(self, ctx: context.Context, seconds: int = 30) -> None:
+        """
+        Samples every thread of the bot process and uploads a flame graph and collapsed stacks.
+
+        **seconds**: How long to sample for, between 1 and 300 seconds. Defaults to 30.
+        """
+
+        if not 1 <= seconds <= 300:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="The profile duration must be between **1** and **300** seconds."
+            )
+
+        if self.bot.profiler.running:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="A profile is already running."
+            )
+
+        embed = utils.embed(
+            colour=colours.GREEN,
+            emoji="<a:loading:872608197314220154>",
+            description=f"| Profiling for **{seconds}** second{'s' if seconds > 1 else ''}."
+        )
+        message = await ctx.reply(embed=embed)
+
+        profile = await asyncio.to_thread(self.bot.profiler.profile, seconds)
+        svg = await asyncio.to_thread(profile.flamegraph, title=f"SkeletonClique-bot | {seconds}s | {profile.samples} samples")
+
+        flamegraph_url = await utils.upload_file(self.bot.session, file_bytes=svg.encode(), file_format="svg")
+        collapsed = profile.collapsed()
+        collapsed_url = await self.bot.paste.upload(collapsed)
+
+        top = values.NL.join(f"{count / max(profile.samples, 1):>7.1%} {frame}" for frame, count in profile.top(10))
+
+        embed = utils.embed(
+            colour=colours.GREEN,
+            emoji=emojis.TICK,
+            description=f"Profiled for **{profile.duration:.2f}s** with **{profile.samples}** samples "
+                        f"(sampler overhead **{profile.overhead:.2%}** of one core).\n\n"
+                        f"`Flame graph:` {flamegraph_url}\n"
+                        f"`Collapsed stacks:` {collapsed_url or 'attached'}\n\n"
+                        f"```\n{top[:3500]}\n```"
+        )
+        await message.edit(embed=embed)
+
+        if collapsed_url is None:
+            await ctx.reply(file=discord.File(fp=io.BytesIO(collapsed.encode()), filename="profile.collapsed.txt"))
+
+    @commands.is_owner()
+    @dev.group(name="memory", aliases=["mem"], hidden=True, invoke_without_command=True)
+    async def dev_memory(self, ctx: context.Context) -> None:
+        """
+        Displays process memory, the sizes of the bots larger caches and the state of allocation tracing.
+        """
+
+        tracker = self.bot.memory
+        current, peak = tracker.traced
+
+        users = self.bot.user_manager.cache.values()
+
+        caches = {
+            "discord users": len(self.bot.users),
+            "discord members": sum(len(guild.members) for guild in self.bot.guilds),
+            "discord messages": len(self.bot.cached_messages),
+            "user configs": len(self.bot.user_manager.cache),
+            "guild configs": len(self.bot.guild_manager.cache),
+            "reminders": sum(len(user.reminders) for user in users),
+            "scheduled reminders": self.bot.reminders.pending,
+            "todos": sum(len(user.todos) for user in users),
+            "pastes": self.bot.paste.cached,
+            "voice players": len(self.bot.voice_clients),
+        }
+
+        size = max(len(name) for name in caches)
+
+        await ctx.reply(
+            f"```\n"
+            f"RSS: {humanize.naturalsize(self.bot.process.memory_info().rss, binary=True)}\n"
+            f"Tracing: {f'yes ({tracker.frames} frames)' if tracker.tracing else 'no'} | Snapshots: {len(tracker.snapshots)}\n"
+            f"Traced: {humanize.naturalsize(current, binary=True)} (peak {humanize.naturalsize(peak, binary=True)}) | "
+            f"Overhead: {humanize.naturalsize(tracker.overhead, binary=True)}\n\n"
+            f"{values.NL.join(f'{name:<{size}} {count:>10}' for name, count in caches.items())}\n"
+            f"```"
+        )
+
+    @commands.is_owner()
+    @dev_memory.command(name="snapshot", aliases=["snap", "s"], hidden=True)
+    async def dev_memory_snapshot(self, ctx: context.Context, frames: Optional[int] = None) -> None:
+        """
+        Takes a memory snapshot, starting allocation tracing first if it isn't already running.
+
+        **frames**: How many frames to keep per allocation when tracing starts, defaults to 10. Ignored if tracing is already running.
+        """
+
+        tracker = self.bot.memory
+
+        if frames is not None and not tracker.tracing:
+            if not 1 <= frames <= 100:
+                raise exceptions.EmbedError(
+                    colour=colours.RED,
+                    emoji=emojis.CROSS,
+                    description="The frame count must be between **1** and **100**."
+                )
+            tracker.frames = frames
+
+        started = not tracker.tracing
+        snapshot = await asyncio.to_thread(tracker.snapshot)
+
+        if started:
+            description = f"Started allocation tracing and took a baseline snapshot. Run **{config.PREFIX}dev memory snapshot** again later, then **{config.PREFIX}dev memory diff**."
+        else:
+            description = f"Took a snapshot of **{humanize.naturalsize(snapshot.size, binary=True)}** of traced memory."
+
+        await ctx.reply(embed=utils.embed(colour=colours.GREEN, emoji=emojis.TICK, description=description))
+
+    @commands.is_owner()
+    @dev_memory.command(name="diff", aliases=["d"], hidden=True)
+    async def dev_memory_diff(self, ctx: context.Context, group_by: str = "lineno", limit: int = 15) -> None:
+        """
+        Compares the two most recent memory snapshots and displays the top growers by location and by object type.
+
+        **group_by**: Group allocations by **lineno**, **filename** or **traceback**. Defaults to lineno.
+        **limit**: How many growers to show for each grouping, defaults to 15.
+        """
+
+        if group_by not in {"lineno", "filename", "traceback"}:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="Allocations can only be grouped by **lineno**, **filename** or **traceback**."
+            )
+
+        if (diff := await asyncio.to_thread(self.bot.memory.diff, group_by=group_by)) is None:  # type: ignore
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description=f"Two snapshots are needed to diff, use **{config.PREFIX}dev memory snapshot** to take them."
+            )
+
+        locations = []
+
+        for statistic in diff.growers(limit):
+
+            if group_by == "traceback":
+                where = values.NL.join(statistic.traceback.format(limit=-5))
+            elif group_by == "lineno":
+                where = f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}"
+            else:
+                where = statistic.traceback[0].filename
+
+            locations.append(
+                f"{'+' + humanize.naturalsize(statistic.size_diff, binary=True):>12} "
+                f"{statistic.count_diff:>+8} objs  {humanize.naturalsize(statistic.size, binary=True):>10} total\n{where}\n"
+            )
+
+        types = [f"{diff_:>+10}  {name}" for name, diff_ in diff.type_growers(limit)]
+
+        await ctx.paginate(
+            entries=[*(locations or ["No locations grew."]), "", "Object types:", *(types or ["No object types grew."])],
+            per_page=20,
+            header=f"Diff over {utils.format_seconds(diff.elapsed, friendly=True)} | "
+                   f"Traced change: {'+' if diff.size_diff >= 0 else '-'}{humanize.naturalsize(abs(diff.size_diff), binary=True)}\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_memory.command(name="stop", hidden=True)
+    async def dev_memory_stop(self, ctx: context.Context) -> None:
+        """
+        Stops allocation tracing and discards stored snapshots.
+        """
+
+        if not self.bot.memory.tracing:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="Allocation tracing is not running."
+            )
+
+        self.bot.memory.stop()
+        await ctx.reply(embed=utils.embed(colour=colours.GREEN, emoji=emojis.TICK, description="Stopped allocation tracing and discarded snapshots."))
+
+    @commands.is_owner()
+    @dev.group(name="sql", aliases=["db", "queries"], hidden=True, invoke_without_command=True)
+    async def dev_sql(self, ctx: context.Context) -> None:
+        """
+        Base command for postgresql query statistics.
+        """
+        await ctx.invoke(self.dev_sql_stats)
+
+    @commands.is_owner()
+    @dev_sql.command(name="stats", aliases=["s"], hidden=True)
+    async def dev_sql_stats(self, ctx: context.Context, sort: str = "total") -> None:
+        """
+        Displays statistics for each query template, ordered by total time.
+
+        **sort**: Order templates by **total**, **count**, **mean**, **p99** or **rows**. Defaults to total.
+        """
+
+        if sort not in {"total", "count", "mean", "p99", "rows"}:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="Templates can only be sorted by **total**, **count**, **mean**, **p99** or **rows**."
+            )
+
+        stats = self.bot.queries
+
+        if not (templates := stats.templates):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description="No queries have been recorded yet."
+            )
+
+        if sort == "p99":
+            templates.sort(key=lambda template: stats.quantile(template, 0.99) or 0.0, reverse=True)
+        elif sort != "total":
+            templates.sort(key=lambda template: getattr(template, sort), reverse=True)
+
+        grand_total = max(sum(template.total for template in templates), 1e-9)
+        entries = []
+
+        for index, template in enumerate(templates, start=1):
+
+            p50, p99 = stats.quantile(template, 0.5) or 0.0, stats.quantile(template, 0.99) or 0.0
+
+            entries.append(
+                f"{index:>2}. {template.total / grand_total:>6.1%} of time | {template.count} calls | total {template.total * 1000:.0f}ms | "
+                f"mean {template.mean * 1000:.2f}ms | p50 {p50 * 1000:.2f}ms | p99 {p99 * 1000:.2f}ms | {template.rows} rows\n"
+                f"    {template.query[:300]}\n"
+            )
+
+        wait = self.bot.metrics.db_pool_wait
+        wait_p50, wait_p99 = wait.quantile(0.5) or 0.0, wait.quantile(0.99) or 0.0
+
+        await ctx.paginate(
+            entries=entries,
+            per_page=8,
+            header=f"Since {utils.format_seconds(time.time() - stats.started_at, friendly=True)} ago | {len(templates)} templates | "
+                   f"{sum(template.count for template in templates)} queries | {grand_total:.2f}s in queries\n"
+                   f"Pool wait: {wait.count()} acquires | p50 {wait_p50 * 1000:.2f}ms | p99 {wait_p99 * 1000:.2f}ms | "
+                   f"size {self.bot.db.get_size()} | idle {self.bot.db.get_idle_size()}\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_sql.command(name="slow", hidden=True)
+    async def dev_sql_slow(self, ctx: context.Context) -> None:
+        """
+        Displays the most recent queries that took longer than the slow query threshold.
+        """
+
+        stats = self.bot.queries
+
+        if not (slow := stats.slow):
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description=f"No queries have taken longer than **{stats.threshold * 1000:.0f}ms**."
+            )
+
+        await ctx.paginate(
+            entries=[
+                f"{pendulum.from_timestamp(query.timestamp, tz='UTC').format('HH:mm:ss')} {query.duration * 1000:>8.1f}ms {query.method:<11} "
+                f"{query.rows} rows\n{query.query[:500]}\n"
+                for query in reversed(slow)
+            ],
+            per_page=8,
+            header=f"Queries slower than {stats.threshold * 1000:.0f}ms ({len(slow)}):\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_sql.command(name="indexes", aliases=["index", "idx"], hidden=True)
+    async def dev_sql_indexes(self, ctx: context.Context) -> None:
+        """
+        Checks that every index the bots queries rely on exists, and shows how often each one has been scanned.
+        """
+
+        statuses = await self.bot.migrator.check_indexes()
+        missing = [status for status in statuses if not status.present]
+
+        entries = [
+            f"{'ok' if status.present else 'MISSING':<7} {status.table:<13} {status.name:<36} "
+            f"{f'{status.scans} scans, {humanize.naturalsize(status.size, binary=True)}' if status.present else ''}"
+            for status in statuses
+        ]
+
+        await ctx.paginate(
+            entries=entries,
+            per_page=20,
+            header=f"{len(statuses) - len(missing)}/{len(statuses)} expected indexes present"
+                   f"{f' | Missing: {len(missing)}' if missing else ''}\n\n",
+            codeblock=True
+        )
+
+    @commands.is_owner()
+    @dev_sql.command(name="migrations", aliases=["migrate"], hidden=True)
+    async def dev_sql_migrations(self, ctx: context.Context) -> None:
+        """
+        Displays which schema migrations have been applied.
+        """
+
+        applied = await self.bot.migrator.applied()
+
+        entries = [
+            f"{migration.version:04d} {migration.name:<24} "
+            f"{utils.format_datetime(record['applied_at']) if (record := applied.get(migration.version)) else 'pending'}"
+            for migration in self.bot.migrator.migrations
+        ]
+
+        await ctx.paginate(entries=entries, per_page=20, codeblock=True)
+
+    @commands.is_owner()
+    @dev_sql.command(name="reset", hidden=True)
+    async def dev_sql_reset(self, ctx: context.Context) -> None:
+        """
+        Clears query statistics and the slow query log.
+        """
+
+        self.bot.queries.reset()
+        await ctx.reply(embed=utils.embed(colour=colours.GREEN, emoji=emojis.TICK, description="Reset query statistics."))
+
     @commands.is_owner()
     @commands.group(name="blacklist", aliases=["bl"], hidden=True, invoke_without_command=True)
     async def blacklist(self, ctx: context.Context) -> None:
@@ -123,7 +868,7 @@ class Dev(commands.Cog):
         Displays blacklisted users.
         """
 
-        blacklisted = await self.bot.db.fetch("SELECT * FROM users WHERE blacklisted = $1", True)
+        blacklisted = await self.bot.repository.blacklisted_users()
         if not blacklisted:
             raise exceptions.EmbedError(
                 colour=colours.RED,
@@ -10,9 +10,12 @@ import discord
 from discord.ext import commands
 
 # My stuff
-from core import colours, emojis
+from core import colours, config, emojis
 from core.bot import SkeletonClique
-from utilities import context, converters, enums, exceptions, utils
+from utilities import context, converters, cooldowns, enums, exceptions, utils
+
+
+XP_COOLDOWN = 60
 
 
 def setup(bot: SkeletonClique) -> None:
@@ -24,15 +27,23 @@ class Economy(commands.Cog):
     def __init__(self, bot: SkeletonClique) -> None:
         self.bot = bot
 
-    # Events
+        self.cooldowns: cooldowns.CooldownEngine = cooldowns.CooldownEngine(
+            self.bot.redis,
+            name="xp_gain",
+            duration=XP_COOLDOWN,
+            sync=getattr(config, "XP_COOLDOWN_SYNC", enums.CooldownSync.REDIS)
+        )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
+        self.bot.pipeline.add_stage("xp", self.grant_xp, order=10, guild=True)
 
-        if message.guild is None or message.author.bot is True:
-            return
+    def cog_unload(self) -> None:
+        self.bot.pipeline.remove_stage("xp")
+
+    # Events
+
+    async def grant_xp(self, message: discord.Message) -> None:
 
-        if bool(await self.bot.redis.exists(f"{message.author.id}_{message.guild.id}_xp_gain")) is True:
+        if not await self.cooldowns.acquire(message.author.id, message.guild.id):
             return
 
         user_config = await self.bot.user_manager.get_config(message.author.id)
@@ -44,7 +55,6 @@ class Economy(commands.Cog):
             await message.reply(f"You are now level `{member_config.level}`!")
 
         await member_config.change_xp(xp, operation=enums.Operation.ADD)
-        await self.bot.redis.setex(name=f"{message.author.id}_{message.guild.id}_xp_gain", time=60, value="")
 
     #
 
@@ -71,7 +81,7 @@ class Economy(commands.Cog):
         Displays the leaderboard for ranks, xp and levels.
         """
 
-        pages = ((await self.bot.db.fetchrow("SELECT count(*) FROM members WHERE guild_id = $1", ctx.guild.id))["count"] // 10) + 1
+        pages = (await self.bot.repository.count_members(ctx.guild.id) // 10) + 1
         await ctx.paginate_file(
             entries=[functools.partial(self.bot.user_manager.create_leaderboard, guild_id=ctx.guild.id, page=page + 1) for page in range(pages)]
         )
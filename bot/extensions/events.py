@@ -18,7 +18,7 @@ from discord.ext import commands
 # My stuff
 from core import colours, config, emojis, values
 from core.bot import SkeletonClique
-from utilities import context, enums, exceptions, utils
+from utilities import context, enums, exceptions, paste, utils
 
 
 __log__: logging.Logger = logging.getLogger("extensions.events")
@@ -114,6 +114,12 @@ class Events(commands.Cog):
     def __init__(self, bot: SkeletonClique) -> None:
         self.bot = bot
 
+        if config.ENV != enums.Environment.DEVELOPMENT:
+            self.bot.pipeline.add_stage("dm_log", self._log_dm, order=20, guild=False, bots=True)
+
+    def cog_unload(self) -> None:
+        self.bot.pipeline.remove_stage("dm_log")
+
     # Logging methods
 
     @staticmethod
@@ -135,19 +141,27 @@ class Events(commands.Cog):
                     avatar_url=utils.avatar(person=message.author)
             )
 
+    def _paste(self, content: Optional[str], *, syntax: str = "txt", max_characters: int = 1024) -> paste.Paste:
+        return self.bot.paste.resolve(content, syntax=syntax, max_characters=max_characters) if content else paste.Paste("", text="*No content*")
+
     async def _log_dm(self, message: discord.Message) -> None:
 
-        content = await utils.safe_content(self.bot.mystbin, message.content) if message.content else '*No content*'
+        def build(content: str) -> dict[str, Any]:
 
-        embed = discord.Embed(colour=GREEN, title=f'DM from `{message.author}`:', description=content)
-        embed.add_field(
-                name='Info:', value=f'`Channel:` {message.channel} `{message.channel.id}`\n'
-                                    f'`Author:` {message.author} `{message.author.id}`\n'
-                                    f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
-                                    f'`Jump:` [Click here]({message.jump_url})', inline=False
+            embed = discord.Embed(colour=GREEN, title=f'DM from `{message.author}`:', description=content)
+            embed.add_field(
+                    name='Info:', value=f'`Channel:` {message.channel} `{message.channel.id}`\n'
+                                        f'`Author:` {message.author} `{message.author.id}`\n'
+                                        f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
+                                        f'`Jump:` [Click here]({message.jump_url})', inline=False
+            )
+            embed.set_footer(text=f'ID: {message.id}')
+            return {"embed": embed}
+
+        await self.bot.paste.send(
+            self.bot.DMS_LOG, build, self._paste(message.content),
+            username=f'{message.author}', avatar_url=utils.avatar(person=message.author)
         )
-        embed.set_footer(text=f'ID: {message.id}')
-        await self.bot.DMS_LOG.send(embed=embed, username=f'{message.author}', avatar_url=utils.avatar(person=message.author))
 
         await self._log_attachments(webhook=self.bot.DMS_LOG, message=message)
         await self._log_embeds(webhook=self.bot.DMS_LOG, message=message)
@@ -155,18 +169,24 @@ class Events(commands.Cog):
     async def _log_delete(self, message: discord.Message) -> None:
 
         webhook = self.bot.COMMON_LOG if message.guild else self.bot.DMS_LOG
-        content = await utils.safe_content(self.bot.mystbin, message.content) if message.content else '*No content*'
 
-        embed = discord.Embed(colour=RED, title=f'Message deleted in `{message.channel}`:', description=content)
-        embed.add_field(
-                name='Info:', value=f'{f"`Guild:` {message.guild} `{message.guild.id}`{values.NL}" if message.guild else ""}'
-                                    f'`Channel:` {message.channel} `{message.channel.id}`\n'
-                                    f'`Author:` {message.author} `{message.author.id}`\n'
-                                    f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
-                                    f'`Jump:` [Click here]({message.jump_url})', inline=False
+        def build(content: str) -> dict[str, Any]:
+
+            embed = discord.Embed(colour=RED, title=f'Message deleted in `{message.channel}`:', description=content)
+            embed.add_field(
+                    name='Info:', value=f'{f"`Guild:` {message.guild} `{message.guild.id}`{values.NL}" if message.guild else ""}'
+                                        f'`Channel:` {message.channel} `{message.channel.id}`\n'
+                                        f'`Author:` {message.author} `{message.author.id}`\n'
+                                        f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
+                                        f'`Jump:` [Click here]({message.jump_url})', inline=False
+            )
+            embed.set_footer(text=f'ID: {message.id}')
+            return {"embed": embed}
+
+        await self.bot.paste.send(
+            webhook, build, self._paste(message.content),
+            username=f'{message.author}', avatar_url=utils.avatar(person=message.author)
         )
-        embed.set_footer(text=f'ID: {message.id}')
-        await webhook.send(embed=embed, username=f'{message.author}', avatar_url=utils.avatar(person=message.author))
 
         await self._log_attachments(webhook=webhook, message=message)
         await self._log_embeds(webhook=webhook, message=message)
@@ -174,21 +194,26 @@ class Events(commands.Cog):
     async def _log_update(self, before: Union[PartialMessage, discord.Message], after: Union[PartialMessage, discord.Message]) -> None:
 
         webhook = self.bot.COMMON_LOG if after.guild else self.bot.DMS_LOG
-        before_content = await utils.safe_content(self.bot.mystbin, before.content) if before.content else '*No content*'
-        after_content = await utils.safe_content(self.bot.mystbin, after.content) if after.content else '*No content*'
 
-        embed = discord.Embed(colour=ORANGE, title=f'Message edited in `{after.channel}`:')
-        embed.add_field(name='Before:', value=before_content, inline=False)
-        embed.add_field(name='After:', value=after_content, inline=False)
-        embed.add_field(
-                name='Info:', value=f'{f"`Guild:` {after.guild} `{after.guild.id}`{values.NL}" if after.guild else ""}'
-                                    f'`Channel:` {after.channel} `{after.channel.id}`\n'
-                                    f'`Author:` {after.author} `{after.author.id}`\n'
-                                    f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
-                                    f'`Jump:` [Click here]({after.jump_url})', inline=False
+        def build(before_content: str, after_content: str) -> dict[str, Any]:
+
+            embed = discord.Embed(colour=ORANGE, title=f'Message edited in `{after.channel}`:')
+            embed.add_field(name='Before:', value=before_content, inline=False)
+            embed.add_field(name='After:', value=after_content, inline=False)
+            embed.add_field(
+                    name='Info:', value=f'{f"`Guild:` {after.guild} `{after.guild.id}`{values.NL}" if after.guild else ""}'
+                                        f'`Channel:` {after.channel} `{after.channel.id}`\n'
+                                        f'`Author:` {after.author} `{after.author.id}`\n'
+                                        f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
+                                        f'`Jump:` [Click here]({after.jump_url})', inline=False
+            )
+            embed.set_footer(text=f'ID: {after.id}')
+            return {"embed": embed}
+
+        await self.bot.paste.send(
+            webhook, build, self._paste(before.content), self._paste(after.content),
+            username=f'{after.author}', avatar_url=utils.avatar(person=after.author)
         )
-        embed.set_footer(text=f'ID: {after.id}')
-        await webhook.send(embed=embed, username=f'{after.author}', avatar_url=utils.avatar(person=after.author))
 
         await self._log_attachments(webhook=webhook, message=after)
         await self._log_embeds(webhook=webhook, message=after)
@@ -196,22 +221,28 @@ class Events(commands.Cog):
     async def _log_pin(self, message: Union[PartialMessage, discord.Message]) -> None:
 
         webhook = self.bot.COMMON_LOG if message.guild else self.bot.DMS_LOG
-        content = await utils.safe_content(self.bot.mystbin, message.content) if message.content else '*No content*'
 
-        if message.pinned:
-            embed = discord.Embed(colour=GREEN, title=f'Message pinned in `{message.channel}`:', description=content)
-        else:
-            embed = discord.Embed(colour=RED, title=f'Message unpinned in `{message.channel}`:', description=content)
+        def build(content: str) -> dict[str, Any]:
 
-        embed.add_field(
-                name='Info:', value=f'{f"`Guild:` {message.guild} `{message.guild.id}`{values.NL}" if message.guild else ""}'
-                                    f'`Channel:` {message.channel} `{message.channel.id}`\n'
-                                    f'`Author:` {message.author} `{message.author.id}`\n'
-                                    f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
-                                    f'`Jump:` [Click here]({message.jump_url})', inline=False
+            if message.pinned:
+                embed = discord.Embed(colour=GREEN, title=f'Message pinned in `{message.channel}`:', description=content)
+            else:
+                embed = discord.Embed(colour=RED, title=f'Message unpinned in `{message.channel}`:', description=content)
+
+            embed.add_field(
+                    name='Info:', value=f'{f"`Guild:` {message.guild} `{message.guild.id}`{values.NL}" if message.guild else ""}'
+                                        f'`Channel:` {message.channel} `{message.channel.id}`\n'
+                                        f'`Author:` {message.author} `{message.author.id}`\n'
+                                        f'`Time:` {utils.format_datetime(datetime=pendulum.now(tz="UTC"))}\n'
+                                        f'`Jump:` [Click here]({message.jump_url})', inline=False
+            )
+            embed.set_footer(text=f'ID: {message.id}')
+            return {"embed": embed}
+
+        await self.bot.paste.send(
+            webhook, build, self._paste(message.content),
+            username=f'{message.author}', avatar_url=utils.avatar(person=message.author)
         )
-        embed.set_footer(text=f'ID: {message.id}')
-        await webhook.send(embed=embed, username=f'{message.author}', avatar_url=utils.avatar(person=message.author))
 
         await self._log_attachments(webhook=webhook, message=message)
         await self._log_embeds(webhook=webhook, message=message)
@@ -222,6 +253,7 @@ class Events(commands.Cog):
     async def on_command_error(self, ctx: context.Context, error: Any) -> Optional[discord.Message]:
 
         error = getattr(error, "original", error)
+        self.bot.metrics.command_errors.inc(ctx.command.qualified_name if ctx.command else "none", type(error).__name__)
 
         __log__.error(
             f"Error in command. Error: {type(error)} | Content: {getattr(ctx.message, 'content', None)} | "
@@ -308,27 +340,46 @@ class Events(commands.Cog):
         message = "".join(traceback.format_exception(type(exception), exception, exception.__traceback__))
         __log__.error(f"Traceback:", exc_info=exception)
 
-        embed = discord.Embed(
-            colour=colours.RED,
-            description=await utils.safe_content(self.bot.mystbin, ctx.message.content, syntax="python", max_characters=2000)
-        ).add_field(
-            name="Info:",
-            value=f"{f'`Guild:` {ctx.guild} `{ctx.guild.id}`{values.NL}' if ctx.guild else ''}"
-                  f"`Channel:` {ctx.channel} `{ctx.channel.id}`\n"
-                  f"`Author:` {ctx.author} `{ctx.author.id}`\n"
-                  f"`Time:` {utils.format_datetime(pendulum.now(tz='UTC'))}"
-        )
+        def build_info(content: str) -> dict[str, Any]:
+
+            embed = discord.Embed(
+                colour=colours.RED,
+                description=content
+            ).add_field(
+                name="Info:",
+                value=f"{f'`Guild:` {ctx.guild} `{ctx.guild.id}`{values.NL}' if ctx.guild else ''}"
+                      f"`Channel:` {ctx.channel} `{ctx.channel.id}`\n"
+                      f"`Author:` {ctx.author} `{ctx.author.id}`\n"
+                      f"`Time:` {utils.format_datetime(pendulum.now(tz='UTC'))}"
+            )
+            return {"embed": embed}
 
-        message = await utils.safe_content(self.bot.mystbin, f"```py\n{message}```", syntax="python", max_characters=2000)
+        def build_traceback(content: str) -> dict[str, Any]:
+            return {"content": content}
 
-        await self.bot.ERROR_LOG.send(embed=embed, username=f"{ctx.author}", avatar_url=utils.avatar(person=ctx.author))
-        await self.bot.ERROR_LOG.send(content=message, username=f"{ctx.author}", avatar_url=utils.avatar(person=ctx.author))
+        await self.bot.paste.send(
+            self.bot.ERROR_LOG, build_info, self._paste(ctx.message.content, syntax="python", max_characters=2000), max_characters=2000,
+            username=f"{ctx.author}", avatar_url=utils.avatar(person=ctx.author)
+        )
+        await self.bot.paste.send(
+            self.bot.ERROR_LOG, build_traceback, self._paste(f"```py\n{message}```", syntax="python", max_characters=2000), max_characters=2000,
+            username=f"{ctx.author}", avatar_url=utils.avatar(person=ctx.author)
+        )
 
     # Bot events
 
     @commands.Cog.listener()
     async def on_socket_event_type(self, event_type: str) -> None:
         self.bot.socket_stats[event_type] += 1
+        self.bot.metrics.socket_events.inc(event_type)
+
+    @commands.Cog.listener()
+    async def on_shard_connect(self, shard_id: int) -> None:
+        self.bot.track_shard(shard_id)
+
+    @commands.Cog.listener()
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        self.bot.track_shard(shard_id)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
@@ -344,17 +395,6 @@ class Events(commands.Cog):
 
     # Message logging
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-
-        if config.ENV == enums.Environment.DEVELOPMENT:
-            return
-
-        if message.guild or message.is_system():
-            return
-
-        await self._log_dm(message=message)
-
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message) -> None:
 
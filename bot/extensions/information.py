@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
 import collections
 import inspect
 import os
 import platform
 import re
-import subprocess
 import time
 from typing import Any, Optional
 
@@ -21,7 +21,7 @@ from discord.ext import commands
 # My stuff
 from core import colours, emojis, values
 from core.bot import SkeletonClique
-from utilities import context, converters, exceptions, utils
+from utilities import context, converters, custom, exceptions, utils
 
 
 COLOURS: dict[discord.Status, int] = {
@@ -62,7 +62,7 @@ NSFW_LEVELS: dict[discord.NSFWLevel, str] = {
 }
 
 
-class RoleCountOptions(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+class RoleCountOptions(converters.Switches):
     sorted: bool = False
 
 
@@ -240,7 +240,7 @@ class Information(commands.Cog):
         )
         await ctx.reply(embed=embed)
 
-    @commands.command(name="rolecounts", aliases=["role-counts", "role_counts", "roles", "rcs"])
+    @commands.command(name="rolecounts", aliases=["role-counts", "role_counts", "roles", "rcs"], cls=custom.QueryCommand)
     async def role_counts(self, ctx: context.Context, server: discord.Guild = utils.MISSING, *, options: RoleCountOptions) -> None:
         """
         Displays roles and how many people have them within a server.
@@ -369,7 +369,7 @@ class Information(commands.Cog):
         typing_end = time.perf_counter()
 
         db_start = time.perf_counter()
-        await self.bot.db.fetch("SELECT 1")
+        await self.bot.repository.ping()
         db_end = time.perf_counter()
 
         redis_start = time.perf_counter()
@@ -432,7 +432,11 @@ class Information(commands.Cog):
         memory_info = psutil.virtual_memory()
         disk_usage = psutil.disk_usage("/")
 
-        java_version = re.search(r'\"(\d+\.\d+).*\"', subprocess.check_output(["java", "-version"], stderr=subprocess.STDOUT).decode()).groups()[0]
+        java = await asyncio.create_subprocess_exec("java", "-version", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        java_output, _ = await java.communicate()
+        java_version = re.search(r'\"(\d+\.\d+).*\"', java_output.decode()).groups()[0]
+
+        cpu_percent = await asyncio.to_thread(psutil.cpu_percent, interval=0.1)
 
         embed = discord.Embed(
             colour=colours.MAIN,
@@ -445,7 +449,7 @@ class Information(commands.Cog):
             name="System CPU:",
             value=f"`Frequency:` {round(cpu_freq.current, 2)} Mhz\n"
                   f"`Cores (logical):` {psutil.cpu_count()}\n"
-                  f"`Overall Usage:` {psutil.cpu_percent(interval=0.1)}%"
+                  f"`Overall Usage:` {cpu_percent}%"
         ).add_field(
             name="\u200B", value="\u200B"
         ).add_field(
@@ -55,7 +55,7 @@ class Reminders(commands.Cog):
         reminder = await user_config.create_reminder(
             channel_id=ctx.channel.id,
             datetime=datetime,
-            content=await utils.safe_content(self.bot.mystbin, when[0], max_characters=1500),
+            content=await self.bot.paste.safe_content(when[0], max_characters=1500),
             jump_url=ctx.message.jump_url
         )
 
@@ -85,7 +85,7 @@ class Reminders(commands.Cog):
             f"**{reminder.id}:** [__**In {utils.format_difference(reminder.datetime)}**__]({reminder.jump_url})\n"
             f"**When:** {utils.format_datetime(reminder.datetime, seconds=True)}\n"
             f"**Repeat:** {reminder.repeat_type.name.replace('_', ' ').lower().title()}\n"
-            f"**Content:** {await utils.safe_content(self.bot.mystbin, reminder.content, max_characters=80)}\n"
+            f"**Content:** {await self.bot.paste.safe_content(reminder.content, max_characters=80)}\n"
             for reminder in sorted(reminders, key=lambda reminder: reminder.datetime)
         ]
 
@@ -123,7 +123,7 @@ class Reminders(commands.Cog):
             f"{' ago' if reminder.done else ''}**__]({reminder.jump_url})\n"
             f"**When:** {utils.format_datetime(reminder.datetime, seconds=True)}\n"
             f"**Repeat:** {reminder.repeat_type.name.replace('_', ' ').lower().title()}\n"
-            f"**Content:** {await utils.safe_content(self.bot.mystbin, reminder.content, max_characters=80)}\n"
+            f"**Content:** {await self.bot.paste.safe_content(reminder.content, max_characters=80)}\n"
             for reminder in sorted(user_config.reminders.values(), key=lambda reminder: reminder.datetime)
         ]
 
@@ -142,7 +142,7 @@ class Reminders(commands.Cog):
         `content`: The content to edit the reminder with.
         """
 
-        content = await utils.safe_content(self.bot.mystbin, content, max_characters=1500)
+        content = await self.bot.paste.safe_content(content, max_characters=1500)
         await reminder.change_content(content, jump_url=ctx.message.jump_url)
 
         embed = utils.embed(
@@ -222,6 +222,6 @@ class Reminders(commands.Cog):
                         f"**Repeat:** {reminder.repeat_type.name.replace('_', ' ').lower().title()}\n"
                         f"**Done:** {str(reminder.done).replace('False', 'No').replace('True', 'Yes')}\n"
                         f"**Content:**\n\n"
-                        f"{await utils.safe_content(self.bot.mystbin, reminder.content, max_characters=1000)}"
+                        f"{await self.bot.paste.safe_content(reminder.content, max_characters=1000)}"
         )
         await ctx.reply(embed=embed)
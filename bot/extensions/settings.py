@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Literal
 
 # Packages
+import discord
 from discord.ext import commands
 
 # My stuff
@@ -98,3 +99,80 @@ class Settings(commands.Cog):
                 description=f"Reset the embed size to **Medium**."
             )
             await ctx.reply(embed=embed)
+
+    @commands.guild_only()
+    @commands.command(name="birthdaychannel", aliases=["birthday-channel", "birthday_channel", "bdc"])
+    async def birthday_channel(
+        self,
+        ctx: context.Context,
+        operation: Literal["set", "reset"] = utils.MISSING,
+        channel: discord.TextChannel = utils.MISSING
+    ) -> None:
+        """
+        Manage the channel this servers birthdays are announced in.
+
+        **operation**: The operation to perform, can be **set** or **reset**.
+        **channel**: The channel to announce birthdays in. Can be its ID, Name or #Mention.
+        """
+
+        guild_config = await self.bot.guild_manager.get_config(ctx.guild.id)
+
+        if not operation:
+            embed = utils.embed(
+                description=f"Birthdays are announced in <#{guild_config.birthday_channel_id}>."
+                if guild_config.birthday_channel_id else "Birthdays are not announced in this server."
+            )
+            await ctx.reply(embed=embed)
+            return
+
+        try:
+            await checks.is_mod().predicate(ctx=ctx)
+        except commands.CheckAnyFailure:
+            raise exceptions.EmbedError(
+                colour=colours.RED,
+                emoji=emojis.CROSS,
+                description=f"You do not have permission to edit the birthday channel in this server."
+            )
+
+        if operation == "set":
+
+            if not channel:
+                raise exceptions.EmbedError(
+                    colour=colours.RED,
+                    emoji=emojis.CROSS,
+                    description=f"You didn't provide a channel."
+                )
+
+            if guild_config.birthday_channel_id == channel.id:
+                raise exceptions.EmbedError(
+                    colour=colours.RED,
+                    emoji=emojis.CROSS,
+                    description=f"Birthdays are already announced in {channel.mention}."
+                )
+
+            await guild_config.set_birthday_channel(channel.id)
+
+            embed = utils.embed(
+                colour=colours.GREEN,
+                emoji=emojis.TICK,
+                description=f"Birthdays will now be announced in {channel.mention}."
+            )
+            await ctx.reply(embed=embed)
+
+        elif operation == "reset":
+
+            if guild_config.birthday_channel_id is None:
+                raise exceptions.EmbedError(
+                    colour=colours.RED,
+                    emoji=emojis.CROSS,
+                    description=f"Birthdays are not announced in this server."
+                )
+
+            await guild_config.set_birthday_channel(None)
+
+            embed = utils.embed(
+                colour=colours.GREEN,
+                emoji=emojis.TICK,
+                description=f"Birthdays will no longer be announced."
+            )
+            await ctx.reply(embed=embed)
@@ -44,8 +44,8 @@ class Time(commands.Cog):
 
         timezone_users = collections.defaultdict(list)
 
-        for user_config in timezones:
-            timezone_users[user_config.time.format("HH:mm (ZZ)")].append(f"{ctx.guild.get_member(user_config.id)} - {user_config.timezone.name}")
+        for time, user_ids in timezones:
+            timezone_users[time.format("HH:mm (ZZ)")].extend(f"{ctx.guild.get_member(user_id)} - {time.timezone_name}" for user_id in user_ids)
 
         await ctx.paginate_embed(
             entries=[f"`{timezone}:`\n{values.NL.join(members)}\n" for timezone, members in timezone_users.items()],
@@ -18,7 +18,7 @@ from core.bot import SkeletonClique
 from utilities import checks, context, converters, custom, enums, exceptions, utils
 
 
-class Options(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+class Options(converters.Switches):
     music: bool = False
     soundcloud: bool = False
     local: bool = False
@@ -27,12 +27,12 @@ class Options(commands.FlagConverter, delimiter=" ", prefix="--", case_insensiti
     now: bool = False
 
 
-class QueueOptions(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+class QueueOptions(converters.Switches):
     next: bool = False
     now: bool = False
 
 
-class SearchOptions(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+class SearchOptions(converters.Switches):
     music: bool = False
     soundcloud: bool = False
     local: bool = False
@@ -219,7 +219,7 @@ class Voice(commands.Cog):
 
     # Play commands
 
-    @commands.command(name="play", aliases=["p"])
+    @commands.command(name="play", aliases=["p"], cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def play(self, ctx: context.Context, query: str, *, options: Options) -> None:
@@ -243,7 +243,7 @@ class Voice(commands.Cog):
         async with ctx.channel.typing():
             await ctx.voice_client.queue_search(query=query, ctx=ctx, now=options.now, next=options.next, source=get_source(options))
 
-    @commands.command(name="search")
+    @commands.command(name="search", cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def search(self, ctx: context.Context, query: str, *, options: Options) -> None:
@@ -269,7 +269,7 @@ class Voice(commands.Cog):
 
     # Platform specific play commands
 
-    @commands.command(name="youtubemusic", aliases=["youtube-music", "youtube_music", "ytmusic", "yt-music", "yt_music", "ytm"])
+    @commands.command(name="youtubemusic", aliases=["youtube-music", "youtube_music", "ytmusic", "yt-music", "yt_music", "ytm"], cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def youtube_music(self, ctx: context.Context, query: str, *, options: QueueOptions) -> None:
@@ -290,7 +290,7 @@ class Voice(commands.Cog):
         async with ctx.channel.typing():
             await ctx.voice_client.queue_search(query=query, ctx=ctx, now=options.now, next=options.next, source=slate.Source.YOUTUBE_MUSIC)
 
-    @commands.command(name="soundcloud", aliases=["sc"])
+    @commands.command(name="soundcloud", aliases=["sc"], cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def soundcloud(self, ctx: context.Context, query: str, *, options: QueueOptions) -> None:
@@ -313,7 +313,7 @@ class Voice(commands.Cog):
 
     # Queue specific play commands
 
-    @commands.command(name="playnext", aliases=["play-next", "play_next", "pnext"])
+    @commands.command(name="playnext", aliases=["play-next", "play_next", "pnext"], cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def play_next(self, ctx: context.Context, query: str, *, options: SearchOptions) -> None:
@@ -334,7 +334,7 @@ class Voice(commands.Cog):
         async with ctx.channel.typing():
             await ctx.voice_client.queue_search(query=query, ctx=ctx, next=True, source=get_source(options))
 
-    @commands.command(name="playnow", aliases=["play-now", "play_now", "pnow"])
+    @commands.command(name="playnow", aliases=["play-now", "play_now", "pnow"], cls=custom.QueryCommand)
     @checks.is_author_connected(same_channel=True)
     @checks.has_voice_client(try_join=True)
     async def play_now(self, ctx: context.Context, query: str, *, options: SearchOptions) -> None:
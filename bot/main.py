@@ -13,7 +13,14 @@ import sys
 import setproctitle
 
 # My stuff
-from core import bot, config
+from core import startup
+
+
+# Installed before the bot is imported so that every module it pulls in shows up in the startup report.
+startup.TIMELINE.imports.install()
+
+from core import bot, config  # noqa: E402
+from utilities import cluster  # noqa: E402
 
 
 RESET = "\u001b[0m"
@@ -24,7 +31,7 @@ BLACK, RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN, WHITE = [f"\u001b[{30 + i}m" for
 
 
 @contextlib.contextmanager
-def logger():
+def logger(suffix: str = ""):
 
     loggers: dict[str, logging.Logger] = {
         "discord":    logging.getLogger("discord"),
@@ -36,13 +43,13 @@ def logger():
 
     for name, log in loggers.items():
 
-        file_handler = logging.handlers.RotatingFileHandler(filename=f"logs/{name}.log", mode="w", backupCount=5, encoding="utf-8", maxBytes=2 ** 22)
+        file_handler = logging.handlers.RotatingFileHandler(filename=f"logs/{name}{suffix}.log", mode="w", backupCount=5, encoding="utf-8", maxBytes=2 ** 22)
         log.addHandler(file_handler)
 
         stream_handler = logging.StreamHandler()
         log.addHandler(stream_handler)
 
-        if os.path.isfile(f"logs/{name}.log"):
+        if os.path.isfile(f"logs/{name}{suffix}.log"):
             file_handler.doRollover()
 
         file_formatter = logging.Formatter(fmt="%(asctime)s [%(name) 30s] [%(filename) 20s] [%(levelname) 7s] %(message)s", datefmt="%I:%M:%S %p %d/%m/%Y")
@@ -66,13 +73,13 @@ def logger():
         [log.handlers[0].close() for log in loggers.values()]
 
 
-if __name__ == "__main__":
+def setup(title: str) -> None:
 
     os.environ["JISHAKU_NO_UNDERSCORE"] = "True"
     os.environ["JISHAKU_HIDE"] = "True"
     os.environ["JISHAKU_NO_DM_TRACEBACK"] = "True"
 
-    setproctitle.setproctitle('SkeletonClique-bot')
+    setproctitle.setproctitle(title)
 
     try:
         # Packages
@@ -84,5 +91,33 @@ if __name__ == "__main__":
     else:
         del uvloop
 
-    with logger():
-        bot.SkeletonClique().run(config.TOKEN)
+
+def run_cluster(info: cluster.ClusterInfo) -> None:
+
+    setup(f"SkeletonClique-cluster-{info.id}")
+
+    with logger(f"-cluster-{info.id}"):
+        bot.SkeletonClique(cluster_info=info).run(config.TOKEN)
+
+
+if __name__ == "__main__":
+
+    if (clusters := getattr(config, "CLUSTERS", 1)) > 1:
+
+        setup("SkeletonClique-launcher")
+
+        with logger("-launcher"):
+            cluster.ClusterLauncher(
+                run_cluster,
+                token=config.TOKEN,
+                clusters=clusters,
+                shards=getattr(config, "SHARD_COUNT", None),
+                port=getattr(config, "CLUSTER_PORT", 20000)
+            ).run()
+
+    else:
+
+        setup("SkeletonClique-bot")
+
+        with logger():
+            bot.SkeletonClique().run(config.TOKEN)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Literal
 
 # Packages
+import discord
 from discord.ext import commands
 
 # My stuff
@@ -12,11 +13,13 @@ from core import colours, emojis, values
 from utilities import context, exceptions
 
 
-async def global_check(ctx: context.Context) -> Literal[True]:
+REQUIRED_PERMISSIONS: int = values.PERMISSIONS.value
+READ_MESSAGES: int = discord.Permissions(read_messages=True).value
+
 
-    user_config = await ctx.bot.user_manager.get_config(ctx.author.id)
+async def global_check(ctx: context.Context) -> Literal[True]:
 
-    if user_config.blacklisted is True:
+    if ctx.author.id in ctx.bot.user_manager.blacklist:
         raise exceptions.EmbedError(
             colour=colours.RED,
             emoji=emojis.CROSS,
@@ -24,13 +27,11 @@ async def global_check(ctx: context.Context) -> Literal[True]:
                         f"*If you would like to appeal this please join my [support server]({values.SUPPORT_LINK}).*"
         )
 
-    current = dict(ctx.channel.permissions_for(ctx.me))
+    current = ctx.channel.permissions_for(ctx.me).value
     if not ctx.guild:
-        current["read_messages"] = True
-
-    needed = {permission: value for permission, value in values.PERMISSIONS if value is True}
+        current |= READ_MESSAGES
 
-    if missing := [permission for permission, value in needed.items() if current[permission] != value]:
-        raise commands.BotMissingPermissions(missing)
+    if missing := REQUIRED_PERMISSIONS & ~current:
+        raise commands.BotMissingPermissions([permission for permission, value in discord.Permissions(missing) if value])
 
     return True
@@ -0,0 +1,8 @@
+# Future
+from __future__ import annotations
+
+# My stuff
+from utilities.cluster import protocol
+from utilities.cluster.broker import SINGLETONS, ClusterBroker
+from utilities.cluster.client import ClusterClient, ClusterInfo, Response
+from utilities.cluster.launcher import ClusterLauncher, recommended_shards, shard_slices
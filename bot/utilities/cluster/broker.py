@@ -0,0 +1,198 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import hmac
+import itertools
+import logging
+from typing import Any, Optional
+
+# My stuff
+from utilities.cluster import protocol
+
+
+__log__: logging.Logger = logging.getLogger("utilities.cluster.broker")
+
+TIMEOUT = 5.0
+SINGLETONS = ("reminders",)
+
+
+class ClusterBroker:
+    """
+    Runs in the launcher process. Every cluster connects to it over a local socket; requests are fanned out to the
+    target clusters and their responses are gathered into a single reply, and singleton jobs are assigned to one
+    connected cluster. An owner keeps its singletons until it disconnects, so a restarting cluster doesn't cause
+    jobs to move back and forth.
+
+    Clusters can run owner commands on each other through the broker, so a connection is only accepted once its
+    `HELLO` carries the secret the launcher generated for this run and handed to every cluster it spawned.
+    """
+
+    def __init__(self, *, host: str, port: int, secret: str, singletons: tuple[str, ...] = SINGLETONS) -> None:
+
+        self.host: str = host
+        self.port: int = port
+        self.singletons: tuple[str, ...] = singletons
+
+        self._secret: str = secret
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clusters: dict[int, asyncio.StreamWriter] = {}
+        self._roles: dict[str, int] = {}
+
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._nonces: itertools.count[int] = itertools.count()
+
+    def __repr__(self) -> str:
+        return f"<ClusterBroker host='{self.host}' port={self.port} clusters={len(self._clusters)}>"
+
+    # Properties
+
+    @property
+    def clusters(self) -> list[int]:
+        return sorted(self._clusters)
+
+    @property
+    def roles(self) -> dict[str, int]:
+        return dict(self._roles)
+
+    # Lifecycle
+
+    async def start(self) -> None:
+
+        self._server = await asyncio.start_server(self._handle, host=self.host, port=self.port)
+        __log__.info(f"[CLUSTER] Broker listening on {self.host}:{self.port}.")
+
+    async def close(self) -> None:
+
+        if (server := self._server) is None:
+            return
+
+        self._server = None
+        server.close()
+
+        for writer in self._clusters.values():
+            writer.close()
+
+        await server.wait_closed()
+
+    # Connections
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+
+        cluster_id: Optional[int] = None
+
+        try:
+            hello = await protocol.receive(reader)
+
+            if hello.get("op") != protocol.HELLO:
+                return
+
+            if not hmac.compare_digest(str(hello.get("secret", "")).encode(), self._secret.encode()):
+                __log__.warning(f"[CLUSTER] Rejected a connection from {writer.get_extra_info('peername')} with an invalid secret.")
+                return
+
+            cluster_id = int(hello["cluster"])
+
+            if (previous := self._clusters.get(cluster_id)) is not None:
+                previous.close()
+
+            self._clusters[cluster_id] = writer
+            __log__.info(f"[CLUSTER] Cluster {cluster_id} connected.")
+
+            await self._elect()
+
+            while True:
+
+                message = await protocol.receive(reader)
+
+                if message["op"] == protocol.REQUEST:
+                    asyncio.create_task(self._route(writer, message))
+
+                elif message["op"] == protocol.RESPONSE:
+                    if (future := self._pending.get(message["nonce"])) is not None and not future.done():
+                        future.set_result(message)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as error:
+            __log__.error(f"[CLUSTER] Connection to cluster {cluster_id} failed. {type(error).__name__}: {error}")
+
+        finally:
+            writer.close()
+
+            if cluster_id is not None and self._clusters.get(cluster_id) is writer:
+
+                del self._clusters[cluster_id]
+                __log__.warning(f"[CLUSTER] Cluster {cluster_id} disconnected.")
+
+                if self._server is not None:
+                    await self._elect()
+
+    async def _elect(self) -> None:
+
+        for singleton in self.singletons:
+            if self._roles.get(singleton) not in self._clusters:
+
+                if self._clusters:
+                    self._roles[singleton] = min(self._clusters)
+                    __log__.info(f"[CLUSTER] Cluster {self._roles[singleton]} now owns '{singleton}'.")
+                else:
+                    self._roles.pop(singleton, None)
+
+        await self._broadcast({"op": protocol.ROLES, "roles": self._roles})
+
+    async def _broadcast(self, payload: dict[str, Any]) -> None:
+
+        for cluster_id, writer in list(self._clusters.items()):
+            try:
+                await protocol.send(writer, payload)
+            except ConnectionError:
+                __log__.warning(f"[CLUSTER] Could not send '{payload['op']}' to cluster {cluster_id}.")
+
+    # Routing
+
+    async def _route(self, source: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+
+        target: Optional[int] = message.get("target")
+        targets = self.clusters if target is None else [target]
+
+        futures: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        nonces: list[int] = []
+
+        for cluster_id in targets:
+
+            if (writer := self._clusters.get(cluster_id)) is None:
+                continue
+
+            nonce = next(self._nonces)
+            future = futures[cluster_id] = asyncio.get_running_loop().create_future()
+
+            self._pending[nonce] = future
+            nonces.append(nonce)
+
+            try:
+                await protocol.send(writer, {"op": protocol.REQUEST, "nonce": nonce, "route": message["route"], "data": message.get("data")})
+            except ConnectionError:
+                future.set_result({"error": "cluster disconnected."})
+
+        if futures:
+            await asyncio.wait(futures.values(), timeout=message.get("timeout") or TIMEOUT)
+
+        for nonce in nonces:
+            del self._pending[nonce]
+
+        responses: dict[str, dict[str, Any]] = {}
+
+        for cluster_id, future in futures.items():
+            result = future.result() if future.done() else {"error": "timed out."}
+            responses[str(cluster_id)] = {"data": result.get("data"), "error": result.get("error")}
+
+        if target is not None and target not in futures:
+            responses[str(target)] = {"error": "cluster is not connected."}
+
+        try:
+            await protocol.send(source, {"op": protocol.RESPONSE, "nonce": message["nonce"], "responses": responses})
+        except ConnectionError:
+            pass
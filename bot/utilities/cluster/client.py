@@ -0,0 +1,264 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+# My stuff
+from utilities.cluster import protocol
+from utilities.cluster.broker import TIMEOUT
+
+
+__log__: logging.Logger = logging.getLogger("utilities.cluster.client")
+
+RECONNECT_DELAY = 5.0
+
+Route = Callable[[Any], Awaitable[Any]]
+RoleListener = Callable[[bool], Awaitable[None]]
+
+
+class ClusterInfo:
+
+    __slots__ = ("id", "shard_ids", "shard_count", "host", "port", "secret", "metrics_port")
+
+    def __init__(self, id: int, shard_ids: list[int], shard_count: int, *, host: str, port: int, secret: str, metrics_port: int) -> None:
+
+        self.id: int = id
+        self.shard_ids: list[int] = shard_ids
+        self.shard_count: int = shard_count
+        self.host: str = host
+        self.port: int = port
+        self.secret: str = secret
+        self.metrics_port: int = metrics_port
+
+    def __repr__(self) -> str:
+        return f"<ClusterInfo id={self.id} shards={self.shard_ids[0]}-{self.shard_ids[-1]} shard_count={self.shard_count}>"
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return self.id, self.shard_ids, self.shard_count, self.host, self.port, self.secret, self.metrics_port
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.id, self.shard_ids, self.shard_count, self.host, self.port, self.secret, self.metrics_port = state
+
+
+class Response:
+
+    __slots__ = ("cluster", "data", "error")
+
+    def __init__(self, cluster: int, data: Any, error: Optional[str]) -> None:
+
+        self.cluster: int = cluster
+        self.data: Any = data
+        self.error: Optional[str] = error
+
+    def __repr__(self) -> str:
+        return f"<Response cluster={self.cluster} error={self.error!r}>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ClusterClient:
+    """
+    One per cluster process. Keeps a connection to the launchers broker, answers requests from other clusters with
+    the registered routes, and tracks which singleton jobs this cluster currently owns.
+    """
+
+    def __init__(self, info: ClusterInfo) -> None:
+
+        self.info: ClusterInfo = info
+
+        self._routes: dict[str, Route] = {}
+        self._role_listeners: dict[str, list[RoleListener]] = {}
+        self._roles: dict[str, int] = {}
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._connected: asyncio.Event = asyncio.Event()
+
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._nonces: itertools.count[int] = itertools.count()
+
+    def __repr__(self) -> str:
+        return f"<ClusterClient id={self.id} connected={self.connected} roles={self._roles}>"
+
+    # Properties
+
+    @property
+    def id(self) -> int:
+        return self.info.id
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    @property
+    def roles(self) -> dict[str, int]:
+        return dict(self._roles)
+
+    @property
+    def routes(self) -> list[str]:
+        return list(self._routes)
+
+    # Routes and roles
+
+    def add_route(self, name: str, callback: Route) -> None:
+        self._routes[name] = callback
+
+    def remove_route(self, name: str) -> None:
+        self._routes.pop(name, None)
+
+    def add_role_listener(self, singleton: str, callback: RoleListener) -> None:
+        self._role_listeners.setdefault(singleton, []).append(callback)
+
+    def remove_role_listener(self, singleton: str, callback: RoleListener) -> None:
+        if callback in (listeners := self._role_listeners.get(singleton, [])):
+            listeners.remove(callback)
+
+    def owner(self, singleton: str) -> Optional[int]:
+        return self._roles.get(singleton)
+
+    def owns(self, singleton: str) -> bool:
+        return self._roles.get(singleton) == self.id
+
+    # Lifecycle
+
+    async def connect(self) -> None:
+
+        self._task = asyncio.create_task(self._run())
+        await self._connected.wait()
+
+    async def close(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _run(self) -> None:
+
+        while True:
+
+            try:
+                self._reader, self._writer = await asyncio.open_connection(host=self.info.host, port=self.info.port)
+                await protocol.send(self._writer, {"op": protocol.HELLO, "cluster": self.id, "secret": self.info.secret})
+
+                self._connected.set()
+                __log__.info(f"[CLUSTER] Cluster {self.id} connected to the broker.")
+
+                while True:
+                    await self._dispatch(await protocol.receive(self._reader))
+
+            except (asyncio.IncompleteReadError, ConnectionError) as error:
+                __log__.warning(f"[CLUSTER] Lost connection to the broker, retrying in {RECONNECT_DELAY}s. {type(error).__name__}: {error}")
+
+            except Exception:
+                # A bad message or a failed connection attempt leaves the stream in an unknown state, so it's dropped.
+                __log__.exception(f"[CLUSTER] Connection to the broker failed, retrying in {RECONNECT_DELAY}s.")
+
+            finally:
+                self._connected.clear()
+
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_result({"responses": {}})
+
+                # The broker may have moved our singletons to another cluster while we were gone.
+                await self._set_roles({})
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+
+        if message["op"] == protocol.ROLES:
+            await self._set_roles(message["roles"])
+
+        elif message["op"] == protocol.REQUEST:
+            asyncio.create_task(self._respond(message))
+
+        elif message["op"] == protocol.RESPONSE:
+            if (future := self._pending.get(message["nonce"])) is not None and not future.done():
+                future.set_result(message)
+
+    async def _set_roles(self, roles: dict[str, int]) -> None:
+
+        old, self._roles = self._roles, roles
+
+        for singleton, listeners in self._role_listeners.items():
+
+            if (owned := roles.get(singleton) == self.id) == (old.get(singleton) == self.id):
+                continue
+
+            __log__.info(f"[CLUSTER] Cluster {self.id} {'gained' if owned else 'lost'} '{singleton}'.")
+
+            for listener in listeners:
+                try:
+                    await listener(owned)
+                except Exception as error:
+                    __log__.error(f"[CLUSTER] Role listener for '{singleton}' failed. {type(error).__name__}: {error}")
+
+    async def _respond(self, message: dict[str, Any]) -> None:
+
+        payload: dict[str, Any] = {"op": protocol.RESPONSE, "nonce": message["nonce"]}
+
+        if (route := self._routes.get(message["route"])) is None:
+            payload["error"] = f"unknown route '{message['route']}'."
+        else:
+            try:
+                payload["data"] = await route(message.get("data"))
+            except Exception as error:
+                payload["error"] = f"{type(error).__name__}: {error}"
+
+        if self._writer is None:
+            return
+
+        try:
+            await protocol.send(self._writer, payload)
+        except Exception as error:
+            __log__.warning(f"[CLUSTER] Could not answer '{message['route']}' request. {type(error).__name__}: {error}")
+
+    # Requests
+
+    async def request(self, route: str, data: Any = None, *, target: Optional[int] = None, timeout: float = TIMEOUT) -> list[Response]:
+        """
+        Calls a route on one cluster, or on every cluster (this one included) when no target is given. Clusters that
+        didn't answer in time are returned with an error rather than raising.
+        """
+
+        if self._writer is None or not self.connected:
+            return []
+
+        nonce = next(self._nonces)
+        future = self._pending[nonce] = asyncio.get_running_loop().create_future()
+
+        try:
+            await protocol.send(self._writer, {"op": protocol.REQUEST, "nonce": nonce, "route": route, "data": data, "target": target, "timeout": timeout})
+            message = await asyncio.wait_for(future, timeout=timeout + 1)
+        except (asyncio.TimeoutError, ConnectionError):
+            return []
+        finally:
+            del self._pending[nonce]
+
+        return sorted(
+            (Response(int(cluster), response.get("data"), response.get("error")) for cluster, response in message["responses"].items()),
+            key=lambda response: response.cluster
+        )
+
+    async def request_owner(self, singleton: str, route: str, data: Any = None, *, timeout: float = TIMEOUT) -> Optional[Response]:
+
+        if (owner := self.owner(singleton)) is None:
+            return None
+
+        return next(iter(await self.request(route, data, target=owner, timeout=timeout)), None)
@@ -0,0 +1,200 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.context
+import secrets
+import signal
+import sys
+import time
+from collections.abc import Callable
+from typing import Optional
+
+# Packages
+import aiohttp
+
+# My stuff
+from utilities.cluster.broker import ClusterBroker
+from utilities.cluster.client import ClusterInfo
+from utilities.monitoring.metrics import METRICS_PORT
+
+
+__log__: logging.Logger = logging.getLogger("utilities.cluster.launcher")
+
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+
+CHECK_INTERVAL = 1.0
+RESTART_DELAY = 5.0
+MAX_RESTART_DELAY = 300.0
+# A cluster that stays up this long is considered healthy again, and its next crash restarts it without backoff.
+STABLE_AFTER = MAX_RESTART_DELAY
+STOP_TIMEOUT = 30.0
+
+
+def shard_slices(shard_count: int, cluster_count: int) -> list[list[int]]:
+    """
+    Splits shard ids into contiguous, evenly sized slices, the first clusters taking one extra shard each when the
+    shards don't divide evenly.
+    """
+
+    size, extra = divmod(shard_count, cluster_count)
+    slices, start = [], 0
+
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < extra else 0)
+        slices.append(list(range(start, end)))
+        start = end
+
+    return [shard_ids for shard_ids in slices if shard_ids]
+
+
+async def recommended_shards(token: str) -> int:
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+class ClusterLauncher:
+    """
+    Starts the broker and one process per cluster, each running the bot for its slice of shards, and restarts any
+    cluster whose process exits with a backoff until the launcher itself is told to stop.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[ClusterInfo], None],
+        *,
+        token: str,
+        clusters: int,
+        shards: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 20000,
+        metrics_port: int = METRICS_PORT
+    ) -> None:
+
+        self.target: Callable[[ClusterInfo], None] = target
+        self.token: str = token
+        self.cluster_count: int = clusters
+        self.shard_count: Optional[int] = shards
+
+        # Each cluster serves its own metrics, on the port after the previous cluster's.
+        self.metrics_port: int = metrics_port
+
+        # Generated for each run and only passed to the clusters through their spawn arguments.
+        self._secret: str = secrets.token_hex(32)
+
+        self.broker: ClusterBroker = ClusterBroker(host=host, port=port, secret=self._secret)
+
+        self._context: multiprocessing.context.SpawnContext = multiprocessing.get_context("spawn")
+        self._clusters: list[ClusterInfo] = []
+        self._processes: dict[int, multiprocessing.context.SpawnProcess] = {}
+        self._restarts: dict[int, int] = {}
+        self._started: dict[int, float] = {}
+        self._stopping: asyncio.Event = asyncio.Event()
+
+    def __repr__(self) -> str:
+        return f"<ClusterLauncher clusters={self.cluster_count} shards={self.shard_count}>"
+
+    # Processes
+
+    def _spawn(self, info: ClusterInfo) -> None:
+
+        process = self._context.Process(target=self.target, args=(info,), name=f"cluster-{info.id}", daemon=False)
+        process.start()
+
+        self._processes[info.id] = process
+        self._started[info.id] = time.monotonic()
+        __log__.info(f"[CLUSTER] Started cluster {info.id} (pid {process.pid}) with shards {info.shard_ids[0]}-{info.shard_ids[-1]}, metrics on port {info.metrics_port}.")
+
+    async def _restart(self, info: ClusterInfo) -> None:
+
+        if time.monotonic() - self._started.get(info.id, 0.0) >= STABLE_AFTER:
+            self._restarts.pop(info.id, None)
+
+        delay = min(RESTART_DELAY * 2 ** self._restarts.get(info.id, 0), MAX_RESTART_DELAY)
+        self._restarts[info.id] = self._restarts.get(info.id, 0) + 1
+
+        __log__.warning(f"[CLUSTER] Cluster {info.id} exited with code {self._processes[info.id].exitcode}, restarting in {delay:.0f}s.")
+
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            self._spawn(info)
+
+    async def _watch(self) -> None:
+
+        restarting: set[int] = set()
+
+        while not self._stopping.is_set():
+
+            for info in self._clusters:
+
+                if info.id in restarting or self._processes[info.id].is_alive():
+                    continue
+
+                restarting.add(info.id)
+                asyncio.create_task(self._restart(info)).add_done_callback(lambda _, cluster_id=info.id: restarting.discard(cluster_id))
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    # Running
+
+    async def start(self) -> None:
+
+        if self.shard_count is None:
+            self.shard_count = await recommended_shards(self.token)
+            __log__.info(f"[CLUSTER] Discord recommends {self.shard_count} shards.")
+
+        self._clusters = [
+            ClusterInfo(
+                cluster_id, shard_ids, self.shard_count,
+                host=self.broker.host, port=self.broker.port, secret=self._secret, metrics_port=self.metrics_port + cluster_id
+            )
+            for cluster_id, shard_ids in enumerate(shard_slices(self.shard_count, self.cluster_count))
+        ]
+
+        await self.broker.start()
+
+        if sys.platform != "win32":
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                asyncio.get_running_loop().add_signal_handler(signum, self.stop)
+
+        for info in self._clusters:
+            self._spawn(info)
+
+        try:
+            await self._watch()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join, STOP_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+
+        await self.broker.close()
+        __log__.info("[CLUSTER] All clusters stopped.")
+
+    def run(self) -> None:
+
+        try:
+            asyncio.run(self.start())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,40 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import json
+import struct
+from typing import Any
+
+
+HEADER = struct.Struct(">I")
+MAX_SIZE = 2 ** 24
+
+# Operations
+
+HELLO = "hello"
+ROLES = "roles"
+REQUEST = "request"
+RESPONSE = "response"
+
+
+async def send(writer: asyncio.StreamWriter, payload: dict[str, Any]) -> None:
+
+    data = json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+    writer.write(HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def receive(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """
+    Reads one length prefixed message. Raises `asyncio.IncompleteReadError` once the other side has gone away.
+    """
+
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+
+    if size > MAX_SIZE:
+        raise ValueError(f"cluster message of {size} bytes is larger than the maximum of {MAX_SIZE}.")
+
+    return json.loads(await reader.readexactly(size))
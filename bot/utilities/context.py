@@ -12,7 +12,7 @@ from discord.ext import commands
 
 # My stuff
 from core import colours, emojis
-from utilities import exceptions, paginators, utils
+from utilities import exceptions, monitoring, paginators, utils
 
 
 if TYPE_CHECKING:
@@ -41,6 +41,12 @@ class Context(commands.Context):
     def author(self) -> discord.User | discord.Member:
         return self.message.author
 
+    # Overwritten methods
+
+    async def send(self, *args: Any, **kwargs: Any) -> discord.Message:
+        with monitoring.TRACER.span("discord.send"):
+            return await super().send(*args, **kwargs)
+
     # Paginators
 
     async def paginate(
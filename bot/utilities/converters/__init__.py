@@ -3,6 +3,7 @@ from __future__ import annotations
 
 # My stuff
 from utilities.converters.datetime import DatetimeConverter
+from utilities.converters.flags import Arguments, Switches
 from utilities.converters.image import ImageConverter
 from utilities.converters.person import PersonConverter
 from utilities.converters.reminder import ReminderConverter, ReminderRepeatTypeConverter
@@ -5,7 +5,6 @@ from __future__ import annotations
 from typing import Any
 
 # Packages
-import dateparser.search
 import pendulum
 from discord.ext import commands
 
@@ -31,6 +30,9 @@ class DatetimeConverter(commands.Converter):
 
     async def convert(self, ctx: context.Context, argument: str) -> tuple[str, dict[str, pendulum.DateTime]]:
 
+        # Packages
+        import dateparser.search  # Loads its language data on import, so it's prewarmed once the bot is ready instead.
+
         searches: Any = dateparser.search.search_dates(argument, languages=["en"], settings=SETTINGS)
         if not searches:
             raise exceptions.EmbedError(
@@ -0,0 +1,88 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import re
+from collections.abc import Iterable
+
+# Packages
+from discord.ext import commands
+
+
+FLAG = re.compile(r"(?:^|\s)--(\w[\w-]*)")
+QUOTES = {
+    "\"": "\"",
+    "“":  "”",
+    "„":  "‟",
+    "‘":  "’",
+    "«":  "»",
+    "「": "」",
+}
+
+
+class Arguments:
+    """
+    A free text query followed by any number of `--switch` flags, parsed in a single pass.
+    """
+
+    __slots__ = ("query", "flags")
+
+    def __init__(self, query: str, flags: frozenset[str]) -> None:
+        self.query: str = query
+        self.flags: frozenset[str] = flags
+
+    def __repr__(self) -> str:
+        return f"<Arguments query={self.query!r} flags={set(self.flags) or '{}'}>"
+
+    @classmethod
+    def parse(cls, text: str) -> Arguments:
+
+        if (match := FLAG.search(text)) is None:
+            query, flags = text, frozenset()
+        else:
+            query, flags = text[:match.start()], frozenset(name.casefold() for name in FLAG.findall(text, match.start()))
+
+        query = query.strip()
+
+        if len(query) >= 2 and QUOTES.get(query[0]) == query[-1]:
+            query = query[1:-1].strip()
+
+        return cls(query, flags)
+
+
+class Switches(commands.FlagConverter, delimiter=" ", prefix="--", case_insensitive=True):
+    """
+    Flag converter where every flag is a boolean switch that is enabled by being present. Instances can be built
+    straight from already parsed flag names, which is how `custom.QueryCommand` uses them.
+    """
+
+    # Not annotated, otherwise the flag converter would treat it as a flag.
+    __switches__ = None
+
+    @classmethod
+    def switches(cls) -> dict[str, str]:
+
+        if (switches := cls.__dict__.get("__switches__")) is None:
+            switches = {name.casefold(): flag.attribute for name, flag in cls.get_flags().items()}
+            cls.__switches__ = switches
+
+        return switches
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> Switches:
+
+        self = cls.__new__(cls)
+
+        for flag in cls.get_flags().values():
+            setattr(self, flag.attribute, flag.default)
+
+        switches = cls.switches()
+        for name in names:
+            if (attribute := switches.get(name)) is not None:
+                setattr(self, attribute, True)
+
+        return self
+
+    @classmethod
+    async def convert(cls, ctx: commands.Context, argument: str) -> Switches:
+        return cls.from_names(Arguments.parse(argument).flags)
@@ -0,0 +1,169 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Optional
+
+# My stuff
+from utilities import enums
+from utilities.monitoring import METRICS
+
+
+if TYPE_CHECKING:
+    # Packages
+    import aioredis
+
+__log__: logging.Logger = logging.getLogger("utilities.cooldowns")
+
+
+class TimingWheel:
+    """
+    Tracks keys that expire a fixed duration after being added. Keys are placed in the slot for the tick they
+    expire on, and advancing the wheel drops whole slots at once, so adding, checking and expiring are all O(1)
+    per key regardless of how many keys are active.
+    """
+
+    __slots__ = ("duration", "resolution", "_slots", "_active", "_tick")
+
+    def __init__(self, duration: float, *, resolution: float = 1.0) -> None:
+
+        self.duration: float = duration
+        self.resolution: float = resolution
+
+        # A key can expire up to `ceil(duration / resolution) + 1` ticks ahead, which must not wrap onto the current tick.
+        self._slots: list[set[Hashable]] = [set() for _ in range(math.ceil(duration / resolution) + 2)]
+        self._active: dict[Hashable, int] = {}
+        self._tick: int = self._current_tick()
+
+    def __repr__(self) -> str:
+        return f"<TimingWheel duration={self.duration} resolution={self.resolution} active={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._advance()
+        return key in self._active
+
+    def _current_tick(self) -> int:
+        return int(time.monotonic() / self.resolution)
+
+    def _advance(self) -> None:
+
+        if (tick := self._current_tick()) == self._tick:
+            return
+
+        for expired in range(self._tick + 1, self._tick + 1 + min(tick - self._tick, len(self._slots))):
+
+            slot = self._slots[expired % len(self._slots)]
+
+            for key in slot:
+                if self._active.get(key) == expired:
+                    del self._active[key]
+
+            slot.clear()
+
+        self._tick = tick
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Adds a key unless it is already active. Returns whether it was added.
+        """
+
+        self._advance()
+
+        if key in self._active:
+            return False
+
+        # Ticks are floored, so expiring relative to the current tick could drop a key up to one tick early. Rounding
+        # the actual expiry time up means it is never expired early, at the cost of up to one tick of extra cooldown.
+        expires = math.ceil((time.monotonic() + self.duration) / self.resolution)
+
+        self._active[key] = expires
+        self._slots[expires % len(self._slots)].add(key)
+
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._active.pop(key, None)
+
+
+class CooldownEngine:
+    """
+    Cooldowns with a local timing wheel as the first check. In `CooldownSync.REDIS` mode, keys that pass the
+    wheel are also claimed with `SET key NX EX` so that every process shares one cooldown. All claims made in the
+    same event loop iteration are sent as one pipeline.
+    """
+
+    def __init__(self, redis: Optional[aioredis.Redis], *, name: str, duration: int, sync: enums.CooldownSync = enums.CooldownSync.LOCAL) -> None:
+
+        self.name: str = name
+        self.duration: int = duration
+        self.sync: enums.CooldownSync = sync
+
+        self._redis: Optional[aioredis.Redis] = redis
+        self._wheel: TimingWheel = TimingWheel(duration)
+
+        self._pending: list[tuple[str, asyncio.Future[bool]]] = []
+        self._flush_task: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f"<CooldownEngine name='{self.name}' duration={self.duration} sync={self.sync} active={len(self._wheel)}>"
+
+    @property
+    def active(self) -> int:
+        return len(self._wheel)
+
+    def redis_key(self, *parts: int) -> str:
+        return f"{'_'.join(str(part) for part in parts)}_{self.name}"
+
+    async def acquire(self, *parts: int) -> bool:
+        """
+        Starts the cooldown for the given key parts and returns True, or returns False if it's already running.
+        """
+
+        if not self._wheel.add(parts):
+            METRICS.cooldowns.inc(self.name, "local")
+            return False
+
+        if self.sync is enums.CooldownSync.LOCAL or self._redis is None:
+            METRICS.cooldowns.inc(self.name, "acquired")
+            return True
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._pending.append((self.redis_key(*parts), future))
+
+        # The flush task first runs on the next loop iteration, so every claim queued before then shares its pipeline.
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+        acquired = await future
+        METRICS.cooldowns.inc(self.name, "acquired" if acquired else "remote")
+
+        return acquired
+
+    async def _flush(self) -> None:
+
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+
+        try:
+            with METRICS.redis_latency.time("PIPELINE"):
+                async with self._redis.pipeline(transaction=False) as pipeline:  # type: ignore
+                    for key, _ in pending:
+                        pipeline.set(key, "", nx=True, ex=self.duration)
+                    results = await pipeline.execute()
+
+        except Exception as error:
+            # Fall back to the local decision rather than dropping everything when redis is unavailable.
+            __log__.warning(f"[COOLDOWNS] Could not sync {len(pending)} '{self.name}' cooldowns with redis. {type(error).__name__}: {error}")
+            results = [True] * len(pending)
+
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(bool(result))
@@ -2,4 +2,5 @@
 from __future__ import annotations
 
 # My stuff
+from utilities.custom.command import QueryCommand
 from utilities.custom.player import Player
@@ -0,0 +1,53 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import inspect
+from typing import Any
+
+# Packages
+from discord.ext import commands
+
+# My stuff
+from utilities import monitoring
+from utilities.converters.flags import Arguments, Switches
+
+
+class QueryCommand(commands.Command):
+    """
+    Command whose input is a free text query followed by `--switch` flags, e.g. `play lost in japan --now`.
+
+    The rest of the message is parsed once. The query, without needing quotes, goes to the first positional
+    parameter, any later positional parameters get their defaults, and a keyword-only `Switches` parameter is
+    built directly from the parsed flag names.
+    """
+
+    async def _parse_arguments(self, ctx: commands.Context) -> None:
+
+        ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
+        ctx.kwargs = {}
+
+        arguments = Arguments.parse(ctx.view.read_rest())
+        query = arguments.query or None
+
+        for name, param in self.clean_params.items():
+
+            converter: Any = param.annotation
+
+            if param.kind == param.KEYWORD_ONLY:
+
+                if not (inspect.isclass(converter) and issubclass(converter, Switches)):
+                    raise TypeError(f"'{self.qualified_name}' keyword-only parameter '{name}' must be a Switches converter.")
+
+                ctx.kwargs[name] = converter.from_names(arguments.flags)
+                break
+
+            if query is not None:
+                # Converters are run directly instead of through `transform`, so they need the same span it is traced with.
+                with monitoring.TRACER.span(f"convert:{name}", converter=getattr(converter, "__name__", converter)):
+                    ctx.args.append(await commands.run_converters(ctx, converter, query, param))  # type: ignore
+                query = None
+            elif param.default is not param.empty:
+                ctx.args.append(param.default)
+            else:
+                raise commands.MissingRequiredArgument(param)
@@ -0,0 +1,8 @@
+# Future
+from __future__ import annotations
+
+# My stuff
+from utilities.database import queries
+from utilities.database.codecs import register_codecs
+from utilities.database.migrator import EXPECTED_INDEXES, IndexStatus, Migration, Migrator
+from utilities.database.repository import Repository, init_connection
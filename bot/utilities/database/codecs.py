@@ -0,0 +1,62 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import datetime as dt
+
+# Packages
+import asyncpg
+import pendulum
+
+
+POSTGRES_EPOCH = pendulum.datetime(2000, 1, 1, tz="UTC")
+POSTGRES_EPOCH_DATE = pendulum.date(2000, 1, 1)
+
+INFINITY = 2 ** 63 - 1
+NEGATIVE_INFINITY = -2 ** 63
+DATE_INFINITY = 2 ** 31 - 1
+DATE_NEGATIVE_INFINITY = -2 ** 31
+
+
+# Timestamps are sent as microseconds since the postgres epoch, so they can be turned straight into pendulum
+# objects without going through datetime first.
+
+def _encode_timestamp(value: dt.datetime) -> tuple[int]:
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt.timezone.utc)
+
+    delta = value - POSTGRES_EPOCH
+    return ((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds,)
+
+
+def _decode_timestamp(value: tuple[int]) -> pendulum.DateTime:
+
+    if value[0] == INFINITY:
+        return pendulum.DateTime.max.replace(tzinfo=pendulum.UTC)
+    if value[0] == NEGATIVE_INFINITY:
+        return pendulum.DateTime.min.replace(tzinfo=pendulum.UTC)
+
+    return POSTGRES_EPOCH + dt.timedelta(microseconds=value[0])
+
+
+def _encode_date(value: dt.date) -> tuple[int]:
+    return ((value - POSTGRES_EPOCH_DATE).days,)
+
+
+def _decode_date(value: tuple[int]) -> pendulum.Date:
+
+    if value[0] == DATE_INFINITY:
+        return pendulum.Date.max
+    if value[0] == DATE_NEGATIVE_INFINITY:
+        return pendulum.Date.min
+
+    return POSTGRES_EPOCH_DATE + dt.timedelta(days=value[0])
+
+
+async def register_codecs(connection: asyncpg.Connection) -> None:
+
+    for typename in ("timestamptz", "timestamp"):
+        await connection.set_type_codec(typename, schema="pg_catalog", encoder=_encode_timestamp, decoder=_decode_timestamp, format="tuple")
+
+    await connection.set_type_codec("date", schema="pg_catalog", encoder=_encode_date, decoder=_decode_date, format="tuple")
@@ -0,0 +1,64 @@
+-- Base schema. Tables use IF NOT EXISTS so that databases created before migrations existed are adopted as is.
+
+CREATE TABLE IF NOT EXISTS users (
+    id                 BIGINT PRIMARY KEY,
+    created_at         TIMESTAMPTZ NOT NULL DEFAULT now(),
+    blacklisted        BOOLEAN NOT NULL DEFAULT FALSE,
+    blacklisted_reason TEXT,
+    timezone           TEXT,
+    timezone_private   BOOLEAN NOT NULL DEFAULT FALSE,
+    birthday           DATE,
+    birthday_private   BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id        BIGSERIAL PRIMARY KEY,
+    user_id   BIGINT NOT NULL UNIQUE REFERENCES users (id) ON DELETE CASCADE,
+    level_ups BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS guilds (
+    id         BIGINT PRIMARY KEY,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    embed_size SMALLINT NOT NULL DEFAULT 3
+);
+
+CREATE TABLE IF NOT EXISTS members (
+    id       BIGSERIAL PRIMARY KEY,
+    user_id  BIGINT NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    guild_id BIGINT NOT NULL,
+    xp       BIGINT NOT NULL DEFAULT 0,
+    coins    BIGINT NOT NULL DEFAULT 0,
+    UNIQUE (user_id, guild_id)
+);
+
+CREATE TABLE IF NOT EXISTS todos (
+    id         BIGSERIAL PRIMARY KEY,
+    user_id    BIGINT NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    content    TEXT NOT NULL,
+    jump_url   TEXT
+);
+
+CREATE TABLE IF NOT EXISTS reminders (
+    id          BIGSERIAL PRIMARY KEY,
+    user_id     BIGINT NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    channel_id  BIGINT NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    datetime    TIMESTAMPTZ NOT NULL,
+    content     TEXT NOT NULL,
+    jump_url    TEXT,
+    repeat_type SMALLINT NOT NULL DEFAULT 1,
+    notified    BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    id         BIGSERIAL PRIMARY KEY,
+    user_id    BIGINT NOT NULL,
+    guild_id   BIGINT NOT NULL REFERENCES guilds (id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    name       TEXT NOT NULL,
+    content    TEXT,
+    alias      BIGINT REFERENCES tags (id) ON DELETE CASCADE,
+    jump_url   TEXT
+);
@@ -0,0 +1,25 @@
+-- Indexes for the access paths the bot actually uses.
+
+-- Leaderboards and ranks order a guild's members by xp.
+CREATE INDEX IF NOT EXISTS members_guild_id_xp_idx ON members (guild_id, xp DESC);
+
+-- Reminders are loaded per user, and due reminders are scanned by time among those not yet delivered.
+CREATE INDEX IF NOT EXISTS reminders_user_id_idx ON reminders (user_id);
+CREATE INDEX IF NOT EXISTS reminders_undelivered_datetime_idx ON reminders (datetime) WHERE notified IS FALSE;
+
+-- Tag names are unique per guild regardless of case, and deleting a tag also deletes its aliases. Existing tags whose
+-- names only differ in case from an older tag in the same guild would stop the unique index from being built, so they
+-- keep their content and owner but are renamed with their id appended, for example "Foo" becomes "Foo (42)".
+UPDATE tags
+SET name = tags.name || ' (' || tags.id || ')'
+FROM tags AS original
+WHERE original.guild_id = tags.guild_id AND lower(original.name) = lower(tags.name) AND original.id < tags.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS tags_guild_id_lower_name_idx ON tags (guild_id, lower(name));
+CREATE INDEX IF NOT EXISTS tags_alias_idx ON tags (alias) WHERE alias IS NOT NULL;
+
+-- Todos are loaded per user.
+CREATE INDEX IF NOT EXISTS todos_user_id_idx ON todos (user_id);
+
+-- The blacklist only ever covers a handful of users.
+CREATE INDEX IF NOT EXISTS users_blacklisted_idx ON users (id) WHERE blacklisted IS TRUE;
@@ -0,0 +1,2 @@
+-- The channel each guild wants its daily birthday announcements sent to, if any.
+ALTER TABLE guilds ADD COLUMN IF NOT EXISTS birthday_channel_id BIGINT;
@@ -0,0 +1,6 @@
+-- The time a repeating reminder's occurrences are counted from. It only changes when the reminder's time is set by
+-- its user, so occurrences that had to be moved, such as a monthly reminder on the 31st in a shorter month, don't
+-- shift the ones after them.
+ALTER TABLE reminders ADD COLUMN IF NOT EXISTS anchor TIMESTAMPTZ;
+UPDATE reminders SET anchor = datetime WHERE anchor IS NULL;
+ALTER TABLE reminders ALTER COLUMN anchor SET NOT NULL;
@@ -0,0 +1,161 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import logging
+import pathlib
+import re
+from typing import TYPE_CHECKING, Optional
+
+# Packages
+import asyncpg
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.database.migrator")
+
+MIGRATIONS_PATH = pathlib.Path(__file__).parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.sql$")
+
+# Arbitrary key for pg_advisory_xact_lock, so that two processes starting at once don't migrate concurrently.
+LOCK_KEY = 0x5C11C0E
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version    INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+# Every index the bot's queries are written to use, as (table, index).
+EXPECTED_INDEXES: tuple[tuple[str, str], ...] = (
+    ("members", "members_user_id_guild_id_key"),
+    ("members", "members_guild_id_xp_idx"),
+    ("notifications", "notifications_user_id_key"),
+    ("reminders", "reminders_user_id_idx"),
+    ("reminders", "reminders_undelivered_datetime_idx"),
+    ("tags", "tags_guild_id_lower_name_idx"),
+    ("tags", "tags_alias_idx"),
+    ("todos", "todos_user_id_idx"),
+    ("users", "users_blacklisted_idx"),
+)
+
+INDEX_STATS = """
+SELECT indexrelname AS name, relname AS table, idx_scan AS scans, pg_relation_size(indexrelid) AS size
+FROM pg_stat_user_indexes WHERE schemaname = current_schema()
+"""
+
+
+class Migration:
+
+    __slots__ = ("version", "name", "path")
+
+    def __init__(self, version: int, name: str, path: pathlib.Path) -> None:
+        self.version: int = version
+        self.name: str = name
+        self.path: pathlib.Path = path
+
+    def __repr__(self) -> str:
+        return f"<Migration version={self.version} name='{self.name}'>"
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+
+class IndexStatus:
+
+    __slots__ = ("table", "name", "present", "scans", "size")
+
+    def __init__(self, table: str, name: str, *, present: bool, scans: Optional[int] = None, size: Optional[int] = None) -> None:
+        self.table: str = table
+        self.name: str = name
+        self.present: bool = present
+        self.scans: Optional[int] = scans
+        self.size: Optional[int] = size
+
+    def __repr__(self) -> str:
+        return f"<IndexStatus table='{self.table}' name='{self.name}' present={self.present} scans={self.scans}>"
+
+
+class Migrator:
+    """
+    Applies the numbered SQL files in `migrations/` in order, each in its own transaction, and records applied
+    versions in the `schema_migrations` table.
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+    def __repr__(self) -> str:
+        return f"<Migrator migrations={len(self.migrations)}>"
+
+    @property
+    def migrations(self) -> list[Migration]:
+
+        migrations = []
+
+        for path in sorted(MIGRATIONS_PATH.glob("*.sql")):
+            if (match := MIGRATION_FILE.match(path.name)) is None:
+                __log__.warning(f"[MIGRATIONS] Ignoring badly named migration file '{path.name}'.")
+                continue
+            migrations.append(Migration(int(match.group("version")), match.group("name"), path))
+
+        return migrations
+
+    async def applied(self) -> dict[int, asyncpg.Record]:
+
+        async with self.bot.db.acquire() as connection:
+            await connection.execute(CREATE_MIGRATIONS_TABLE)
+            return {record["version"]: record for record in await connection.fetch("SELECT * FROM schema_migrations")}
+
+    async def pending(self) -> list[Migration]:
+        applied = await self.applied()
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    async def run(self) -> list[Migration]:
+        """
+        Applies every pending migration and returns the ones that were applied.
+        """
+
+        done: list[Migration] = []
+
+        async with self.bot.db.acquire() as connection:
+
+            await connection.execute(CREATE_MIGRATIONS_TABLE)
+
+            for migration in self.migrations:
+
+                async with connection.transaction():
+
+                    await connection.execute("SELECT pg_advisory_xact_lock($1)", LOCK_KEY)
+
+                    if await connection.fetchval("SELECT EXISTS (SELECT 1 FROM schema_migrations WHERE version = $1)", migration.version):
+                        continue
+
+                    __log__.info(f"[MIGRATIONS] Applying migration {migration.version:04d} '{migration.name}'.")
+
+                    await connection.execute(migration.sql)
+                    await connection.execute("INSERT INTO schema_migrations (version, name) VALUES ($1, $2)", migration.version, migration.name)
+
+                done.append(migration)
+
+        if done:
+            __log__.info(f"[MIGRATIONS] Applied {len(done)} migration{'s' if len(done) > 1 else ''}.")
+
+        return done
+
+    async def check_indexes(self) -> list[IndexStatus]:
+
+        stats = {record["name"]: record for record in await self.bot.db.fetch(INDEX_STATS)}
+
+        return [
+            IndexStatus(table, name, present=True, scans=record["scans"], size=record["size"])
+            if (record := stats.get(name)) is not None else
+            IndexStatus(table, name, present=False)
+            for table, name in EXPECTED_INDEXES
+        ]
@@ -0,0 +1,106 @@
+# Future
+from __future__ import annotations
+
+
+# Users
+
+USER_UPSERT = "INSERT INTO users (id) VALUES ($1) ON CONFLICT (id) DO UPDATE SET id = excluded.id RETURNING *"
+USER_DELETE = "DELETE FROM users WHERE id = $1"
+USER_SET_BLACKLISTED = "UPDATE users SET blacklisted = $1, blacklisted_reason = $2 WHERE id = $3 RETURNING blacklisted, blacklisted_reason"
+USER_SET_TIMEZONE = "UPDATE users SET timezone = $1, timezone_private = $2 WHERE id = $3 RETURNING timezone, timezone_private"
+USER_SET_BIRTHDAY = "UPDATE users SET birthday = $1, birthday_private = $2 WHERE id = $3 RETURNING birthday, birthday_private"
+USERS_BLACKLISTED = "SELECT * FROM users WHERE blacklisted IS TRUE"
+USERS_BLACKLISTED_IDS = "SELECT id FROM users WHERE blacklisted IS TRUE"
+USERS_BY_IDS = "SELECT * FROM users WHERE id = ANY($1::bigint[])"
+USERS_PUBLIC_PROFILES = (
+    "SELECT id, CASE WHEN timezone_private THEN NULL ELSE timezone END AS timezone, CASE WHEN birthday_private THEN NULL ELSE birthday END AS birthday "
+    "FROM users WHERE (timezone IS NOT NULL AND timezone_private IS FALSE) OR (birthday IS NOT NULL AND birthday_private IS FALSE)"
+)
+
+# Notifications
+
+NOTIFICATIONS_UPSERT = "INSERT INTO notifications (user_id) VALUES ($1) ON CONFLICT (user_id) DO UPDATE SET user_id = excluded.user_id RETURNING *"
+NOTIFICATIONS_BY_USERS = "SELECT * FROM notifications WHERE user_id = ANY($1::bigint[])"
+
+# Members
+
+MEMBER_UPSERT = "INSERT INTO members (user_id, guild_id) VALUES ($1, $2) ON CONFLICT (user_id, guild_id) DO UPDATE SET user_id = excluded.user_id RETURNING *"
+MEMBER_DELETE = "DELETE FROM members WHERE user_id = $1 AND guild_id = $2"
+MEMBER_SET_XP = "UPDATE members SET xp = $1 WHERE user_id = $2 AND guild_id = $3"
+MEMBER_SET_COINS = "UPDATE members SET coins = $1 WHERE user_id = $2 AND guild_id = $3"
+MEMBERS_BY_USER = "SELECT * FROM members WHERE user_id = $1"
+MEMBERS_BY_USERS = "SELECT * FROM members WHERE user_id = ANY($1::bigint[])"
+MEMBERS_COUNT = "SELECT count(*) FROM members WHERE guild_id = $1"
+MEMBERS_LEADERBOARD = "SELECT user_id, xp, row_number() OVER (ORDER BY xp DESC) AS rank FROM members WHERE guild_id = $1 ORDER BY xp DESC LIMIT $2 OFFSET $3"
+MEMBER_RANK = (
+    "SELECT rank FROM (SELECT user_id, row_number() OVER (ORDER BY xp DESC) AS rank FROM members WHERE members.guild_id = $1) as guild_members "
+    "WHERE guild_members.user_id = $2"
+)
+
+# Todos
+
+TODO_INSERT = "INSERT INTO todos (user_id, content, jump_url) VALUES ($1, $2, $3) RETURNING *"
+TODO_DELETE = "DELETE FROM todos WHERE id = $1"
+TODO_SET_CONTENT = "UPDATE todos SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url"
+TODOS_BY_USER = "SELECT * FROM todos WHERE user_id = $1"
+TODOS_BY_USERS = "SELECT * FROM todos WHERE user_id = ANY($1::bigint[])"
+
+# Reminders
+
+REMINDER_INSERT = "INSERT INTO reminders (user_id, channel_id, datetime, anchor, content, jump_url, repeat_type) VALUES ($1, $2, $3, $3, $4, $5, $6) RETURNING *"
+REMINDER_DELETE = "DELETE FROM reminders WHERE id = $1"
+REMINDER_SET_NOTIFIED = "UPDATE reminders SET notified = $1 WHERE id = $2 RETURNING notified"
+REMINDER_SET_DATETIME = "UPDATE reminders SET datetime = $1, anchor = $1 WHERE id = $2 RETURNING datetime, anchor"
+REMINDER_ADVANCE = "UPDATE reminders SET datetime = $1, notified = $2 WHERE id = $3 AND datetime = $4 RETURNING datetime, notified"
+REMINDER_SET_CONTENT = "UPDATE reminders SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url"
+REMINDER_SET_REPEAT_TYPE = "UPDATE reminders SET repeat_type = $1 WHERE id = $2 RETURNING repeat_type"
+REMINDERS_BY_USER = "SELECT * FROM reminders WHERE user_id = $1"
+REMINDERS_BY_USERS = "SELECT * FROM reminders WHERE user_id = ANY($1::bigint[])"
+REMINDER_BY_ID = "SELECT * FROM reminders WHERE id = $1"
+REMINDERS_DUE = "SELECT * FROM reminders WHERE notified IS FALSE AND datetime <= $1 ORDER BY datetime"
+
+# Guilds
+
+GUILD_UPSERT = "INSERT INTO guilds (id) VALUES ($1) ON CONFLICT (id) DO UPDATE SET id = excluded.id RETURNING *"
+GUILD_DELETE = "DELETE FROM guilds WHERE id = $1"
+GUILD_SET_EMBED_SIZE = "UPDATE guilds SET embed_size = $1 WHERE id = $2 RETURNING embed_size"
+GUILD_SET_BIRTHDAY_CHANNEL = "UPDATE guilds SET birthday_channel_id = $1 WHERE id = $2 RETURNING birthday_channel_id"
+GUILDS_BIRTHDAY_CHANNELS = "SELECT id, birthday_channel_id FROM guilds WHERE birthday_channel_id IS NOT NULL"
+GUILDS_BY_IDS = "SELECT * FROM guilds WHERE id = ANY($1::bigint[])"
+
+# Tags
+
+TAG_INSERT = "INSERT INTO tags (user_id, guild_id, name, content, jump_url) VALUES ($1, $2, $3, $4, $5) RETURNING *"
+TAG_INSERT_ALIAS = "INSERT INTO tags (user_id, guild_id, name, alias, jump_url) VALUES ($1, $2, $3, $4, $5) RETURNING *"
+TAG_DELETE = "DELETE FROM tags WHERE id = $1 or alias = $1 RETURNING name"
+TAG_SET_CONTENT = "UPDATE tags SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url"
+TAG_SET_OWNER = "UPDATE tags SET user_id = $1 WHERE id = $2 RETURNING user_id"
+TAGS_BY_GUILD = "SELECT * FROM tags WHERE guild_id = $1"
+TAGS_BY_GUILDS = "SELECT * FROM tags WHERE guild_id = ANY($1::bigint[])"
+
+# Misc
+
+PING = "SELECT 1"
+
+
+# Statements run often enough that they are prepared on every connection when it is opened, rather than being
+# parsed and planned the first time each connection happens to run them.
+PREPARED: tuple[str, ...] = (
+    USER_UPSERT,
+    NOTIFICATIONS_UPSERT,
+    MEMBER_UPSERT,
+    MEMBER_SET_XP,
+    MEMBER_SET_COINS,
+    MEMBERS_BY_USER,
+    MEMBERS_LEADERBOARD,
+    MEMBER_RANK,
+    TODOS_BY_USER,
+    REMINDERS_BY_USER,
+    REMINDER_SET_NOTIFIED,
+    REMINDER_SET_DATETIME,
+    REMINDER_ADVANCE,
+    REMINDER_BY_ID,
+    REMINDERS_DUE,
+    GUILD_UPSERT,
+    TAGS_BY_GUILD,
+)
@@ -0,0 +1,225 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import logging
+from typing import TYPE_CHECKING, Optional
+
+# Packages
+import asyncpg
+import pendulum
+
+# My stuff
+from utilities.database import queries
+from utilities.database.codecs import register_codecs
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+    from utilities.monitoring import InstrumentedConnection
+
+__log__: logging.Logger = logging.getLogger("utilities.database.repository")
+
+
+async def init_connection(connection: InstrumentedConnection) -> None:
+    """
+    Pool `init` hook, run once for every new connection before it is handed out.
+    """
+
+    await register_codecs(connection)
+
+    try:
+        await connection.prepare_statements(queries.PREPARED)
+    except (asyncpg.UndefinedTableError, asyncpg.UndefinedColumnError) as error:
+        # The schema hasn't been migrated yet. The pool's connections are expired once migrations have run, so
+        # the connections that replace them will prepare their statements here.
+        __log__.warning(f"[POSTGRESQL] Could not prepare statements before migrating. {error}")
+
+    __log__.debug(f"[POSTGRESQL] Initialised connection with {connection.statements} prepared statements.")
+
+
+class Repository:
+    """
+    Every query the bot runs, behind one typed method each. The SQL itself lives in `utilities.database.queries`.
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+    def __repr__(self) -> str:
+        return "<Repository>"
+
+    # Users
+
+    async def upsert_user(self, user_id: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.USER_UPSERT, user_id)
+
+    async def users(self, user_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.USERS_BY_IDS, user_ids)
+
+    async def delete_user(self, user_id: int) -> None:
+        await self.bot.db.execute(queries.USER_DELETE, user_id)
+
+    async def set_user_blacklisted(self, user_id: int, blacklisted: bool, reason: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.USER_SET_BLACKLISTED, blacklisted, reason, user_id)
+
+    async def set_user_timezone(self, user_id: int, timezone: Optional[str], private: bool) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.USER_SET_TIMEZONE, timezone, private, user_id)
+
+    async def set_user_birthday(self, user_id: int, birthday: Optional[pendulum.Date], private: bool) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.USER_SET_BIRTHDAY, birthday, private, user_id)
+
+    async def blacklisted_users(self) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.USERS_BLACKLISTED)
+
+    async def blacklisted_user_ids(self) -> set[int]:
+        return {record["id"] for record in await self.bot.db.fetch(queries.USERS_BLACKLISTED_IDS)}
+
+    async def public_profiles(self) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.USERS_PUBLIC_PROFILES)
+
+    # Notifications
+
+    async def upsert_notifications(self, user_id: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.NOTIFICATIONS_UPSERT, user_id)
+
+    async def users_notifications(self, user_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.NOTIFICATIONS_BY_USERS, user_ids)
+
+    # Members
+
+    async def upsert_member(self, user_id: int, guild_id: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.MEMBER_UPSERT, user_id, guild_id)
+
+    async def delete_member(self, user_id: int, guild_id: int) -> None:
+        await self.bot.db.execute(queries.MEMBER_DELETE, user_id, guild_id)
+
+    async def set_member_xp(self, user_id: int, guild_id: int, xp: int) -> None:
+        await self.bot.db.execute(queries.MEMBER_SET_XP, xp, user_id, guild_id)
+
+    async def set_member_coins(self, user_id: int, guild_id: int, coins: int) -> None:
+        await self.bot.db.execute(queries.MEMBER_SET_COINS, coins, user_id, guild_id)
+
+    async def user_members(self, user_id: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.MEMBERS_BY_USER, user_id)
+
+    async def users_members(self, user_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.MEMBERS_BY_USERS, user_ids)
+
+    async def count_members(self, guild_id: int) -> int:
+        return await self.bot.db.fetchval(queries.MEMBERS_COUNT, guild_id)
+
+    async def leaderboard(self, guild_id: int, *, limit: Optional[int], offset: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.MEMBERS_LEADERBOARD, guild_id, limit, offset)
+
+    async def member_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        return await self.bot.db.fetchval(queries.MEMBER_RANK, guild_id, user_id)
+
+    # Todos
+
+    async def insert_todo(self, user_id: int, content: str, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TODO_INSERT, user_id, content, jump_url)
+
+    async def delete_todo(self, todo_id: int) -> None:
+        await self.bot.db.execute(queries.TODO_DELETE, todo_id)
+
+    async def set_todo_content(self, todo_id: int, content: str, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TODO_SET_CONTENT, content, jump_url, todo_id)
+
+    async def user_todos(self, user_id: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.TODOS_BY_USER, user_id)
+
+    async def users_todos(self, user_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.TODOS_BY_USERS, user_ids)
+
+    # Reminders
+
+    async def insert_reminder(
+        self,
+        user_id: int,
+        channel_id: int,
+        datetime: pendulum.DateTime,
+        content: str,
+        jump_url: Optional[str],
+        repeat_type: int
+    ) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.REMINDER_INSERT, user_id, channel_id, datetime, content, jump_url, repeat_type)
+
+    async def delete_reminder(self, reminder_id: int) -> None:
+        await self.bot.db.execute(queries.REMINDER_DELETE, reminder_id)
+
+    async def set_reminder_notified(self, reminder_id: int, notified: bool) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.REMINDER_SET_NOTIFIED, notified, reminder_id)
+
+    async def set_reminder_datetime(self, reminder_id: int, datetime: pendulum.DateTime) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.REMINDER_SET_DATETIME, datetime, reminder_id)
+
+    async def advance_reminder(self, reminder_id: int, previous: pendulum.DateTime, datetime: pendulum.DateTime, notified: bool) -> Optional[asyncpg.Record]:
+        return await self.bot.db.fetchrow(queries.REMINDER_ADVANCE, datetime, notified, reminder_id, previous)
+
+    async def set_reminder_content(self, reminder_id: int, content: str, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.REMINDER_SET_CONTENT, content, jump_url, reminder_id)
+
+    async def set_reminder_repeat_type(self, reminder_id: int, repeat_type: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.REMINDER_SET_REPEAT_TYPE, repeat_type, reminder_id)
+
+    async def user_reminders(self, user_id: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.REMINDERS_BY_USER, user_id)
+
+    async def users_reminders(self, user_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.REMINDERS_BY_USERS, user_ids)
+
+    async def reminder(self, reminder_id: int) -> Optional[asyncpg.Record]:
+        return await self.bot.db.fetchrow(queries.REMINDER_BY_ID, reminder_id)
+
+    async def due_reminders(self, until: pendulum.DateTime) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.REMINDERS_DUE, until)
+
+    # Guilds
+
+    async def upsert_guild(self, guild_id: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.GUILD_UPSERT, guild_id)
+
+    async def guilds(self, guild_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.GUILDS_BY_IDS, guild_ids)
+
+    async def delete_guild(self, guild_id: int) -> None:
+        await self.bot.db.execute(queries.GUILD_DELETE, guild_id)
+
+    async def set_guild_embed_size(self, guild_id: int, embed_size: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.GUILD_SET_EMBED_SIZE, embed_size, guild_id)
+
+    async def set_guild_birthday_channel(self, guild_id: int, channel_id: Optional[int]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.GUILD_SET_BIRTHDAY_CHANNEL, channel_id, guild_id)
+
+    async def birthday_channels(self) -> dict[int, int]:
+        return {record["id"]: record["birthday_channel_id"] for record in await self.bot.db.fetch(queries.GUILDS_BIRTHDAY_CHANNELS)}
+
+    # Tags
+
+    async def insert_tag(self, user_id: int, guild_id: int, name: str, content: str, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TAG_INSERT, user_id, guild_id, name, content, jump_url)
+
+    async def insert_tag_alias(self, user_id: int, guild_id: int, name: str, original: int, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TAG_INSERT_ALIAS, user_id, guild_id, name, original, jump_url)
+
+    async def delete_tag(self, tag_id: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.TAG_DELETE, tag_id)
+
+    async def set_tag_content(self, tag_id: int, content: str, jump_url: Optional[str]) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TAG_SET_CONTENT, content, jump_url, tag_id)
+
+    async def set_tag_owner(self, tag_id: int, user_id: int) -> asyncpg.Record:
+        return await self.bot.db.fetchrow(queries.TAG_SET_OWNER, user_id, tag_id)
+
+    async def guild_tags(self, guild_id: int) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.TAGS_BY_GUILD, guild_id)
+
+    async def guilds_tags(self, guild_ids: list[int]) -> list[asyncpg.Record]:
+        return await self.bot.db.fetch(queries.TAGS_BY_GUILDS, guild_ids)
+
+    # Misc
+
+    async def ping(self) -> None:
+        await self.bot.db.fetchval(queries.PING)
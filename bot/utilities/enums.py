@@ -64,3 +64,9 @@ class Filters(Enum):
 
     ROTATION = 1
     NIGHTCORE = 2
+
+
+class CooldownSync(Enum):
+
+    LOCAL = 1
+    REDIS = 2
@@ -5,21 +5,24 @@ from __future__ import annotations
 import multiprocessing
 import multiprocessing.connection
 import sys
-from typing import Any, Callable, Literal
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 # Packages
 import aiohttp
-import bs4
 import humanize
 import yarl
-from wand.color import Color
-from wand.image import Image
 
 # My stuff
 from core import colours, emojis
 from utilities import context, exceptions, utils
 
 
+# Wand is only imported inside the edit functions and `do_edit_image`, which run in the image worker processes, so
+# the bot process never loads ImageMagick.
+if TYPE_CHECKING:
+    # Packages
+    from wand.image import Image
+
 CMD = "bash" if sys.platform == "win32" else "/bin/bash"
 
 PixelInterpolateMethods = Literal["undefined", "average", "average9", "average16", "background", "bilinear", "blend", "catrom", "integer", "mesh", "nearest", "spline"]
@@ -48,12 +51,18 @@ def blueshift(image: Image, factor: float) -> None:
 
 def border(image: Image, colour: str, width: int, height: int) -> None:
 
+    # Packages
+    from wand.color import Color
+
     with Color(colour) as color:
         image.border(color=color, width=width, height=height, compose="atop")
 
 
 def colorize(image: Image, colour: str) -> None:
 
+    # Packages
+    from wand.color import Color
+
     with Color(colour) as color, Color("rgb(50%, 50%, 50%)") as alpha:
         image.colorize(color=color, alpha=alpha)
 
@@ -96,6 +105,9 @@ def flop(image: Image) -> None:
 
 def frame(image: Image, matte: str, width: int, height: int, inner_bevel: float, outer_bevel: float) -> None:
 
+    # Packages
+    from wand.color import Color
+
     with Color(matte) as color:
         image.frame(matte=color, width=width, height=height, inner_bevel=inner_bevel, outer_bevel=outer_bevel, compose="atop")
 
@@ -173,6 +185,10 @@ async def request_image_bytes(*, session: aiohttp.ClientSession, url: str) -> by
     async with session.get(url) as request:
 
         if yarl.URL(url).host in COMMON_GIF_SITES:
+
+            # Packages
+            import bs4
+
             page = bs4.BeautifulSoup(await request.text(), features="html.parser")
             tag = page.find("meta", property="og:url")
             if tag is not None:
@@ -214,12 +230,14 @@ async def edit_image(ctx: context.Context, edit_function: Callable[..., Any], ur
     receiving_pipe, sending_pipe = multiprocessing.Pipe(duplex=False)
     image_bytes = await request_image_bytes(session=ctx.bot.session, url=url)
 
-    process = multiprocessing.Process(target=do_edit_image, daemon=True, args=(edit_function, image_bytes, sending_pipe), kwargs=kwargs)
-    process.start()
+    with ctx.bot.metrics.image_workers.track():
 
-    data = await ctx.bot.loop.run_in_executor(None, receiving_pipe.recv)
+        process = multiprocessing.Process(target=do_edit_image, daemon=True, args=(edit_function, image_bytes, sending_pipe), kwargs=kwargs)
+        process.start()
 
-    process.join()
+        data = await ctx.bot.loop.run_in_executor(None, receiving_pipe.recv)
+
+        process.join()
 
     receiving_pipe.close()
     sending_pipe.close()
@@ -256,6 +274,10 @@ async def edit_image(ctx: context.Context, edit_function: Callable[..., Any], ur
 
 def do_edit_image(edit_function: Callable[..., Any], image_bytes: bytes, pipe: multiprocessing.connection.Connection, **kwargs) -> None:
 
+    # Packages
+    from wand.color import Color
+    from wand.image import Image
+
     try:
         with Image(blob=image_bytes) as image, Color("transparent") as colour:
 
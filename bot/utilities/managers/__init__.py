@@ -2,5 +2,9 @@
 from __future__ import annotations
 
 # My stuff
+from utilities.managers.coherence import CacheCoherence
 from utilities.managers.guilds import GuildManager
+from utilities.managers.profiles import ProfileIndex
+from utilities.managers.reminders import ReminderScheduler
+from utilities.managers.store import ConfigStore
 from utilities.managers.users import UserManager
@@ -0,0 +1,274 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import json
+import logging
+import uuid
+from typing import TYPE_CHECKING, Any, Optional
+
+# Packages
+import aioredis
+import pendulum
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.coherence")
+
+CHANNEL = "cache:invalidations"
+RECONNECT_DELAY = 5.0
+
+# Operations
+
+PATCH = "p"
+DELETE = "d"
+EVICT = "e"
+
+
+class CacheCoherence:
+    """
+    Keeps the user and guild caches of every process in step. Each mutation publishes a small message naming the
+    object that changed, by kind and keys, with either the changed fields, a deletion, or an eviction of the
+    aggregate that owns it when the change is structural. Peers patch their copy in place if they have it cached,
+    and ignore the message otherwise, since the next load will read the new state from postgres. The aggregate's
+    entry in the `ConfigStore` is deleted before publishing, unless only a member config changed.
+
+    Kinds and their keys are `user` (user id), `member` (user id, guild id), `todo` and `reminder` (user id, id),
+    `guild` (guild id) and `tag` (guild id, id).
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+        self.origin: str = uuid.uuid4().hex[:12]
+        self.published: int = 0
+        self.applied: int = 0
+
+        self._pubsub: Optional[aioredis.client.PubSub] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f"<CacheCoherence origin='{self.origin}' running={self.running} published={self.published} applied={self.applied}>"
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # Lifecycle
+
+    async def start(self) -> None:
+
+        if self.running:
+            return
+
+        self._task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    # Publishing
+
+    async def _publish(self, operation: str, kind: str, keys: tuple[int, ...], patch: Optional[dict[str, Any]] = None) -> None:
+
+        # The stored copy of the aggregate is stale whether or not anyone else is listening. Member configs aren't
+        # part of it, so xp and coins changes leave it alone.
+        if kind != "member":
+            await self.bot.store.delete("guild" if kind in ("guild", "tag") else "user", keys[0])
+
+        if not self.running:
+            return
+
+        message = {"o": self.origin, "op": operation, "k": kind, "i": keys}
+        if patch:
+            message["p"] = patch
+
+        try:
+            await self.bot.redis.publish(CHANNEL, json.dumps(message, separators=(",", ":")))
+        except aioredis.RedisError as error:
+            __log__.warning(f"[COHERENCE] Could not publish '{operation}' for {kind} {keys}. {type(error).__name__}: {error}")
+        else:
+            self.published += 1
+
+    async def patch(self, kind: str, *keys: int, **fields: Any) -> None:
+        await self._publish(PATCH, kind, keys, fields)
+
+    async def delete(self, kind: str, *keys: int) -> None:
+        await self._publish(DELETE, kind, keys)
+
+    async def evict(self, kind: str, *keys: int) -> None:
+        await self._publish(EVICT, kind, keys)
+
+    # Receiving
+
+    async def _listen(self) -> None:
+
+        resync = False
+
+        while True:
+
+            try:
+                self._pubsub = self.bot.redis.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.subscribe(CHANNEL)
+
+                __log__.info(f"[COHERENCE] Listening for cache invalidations as '{self.origin}'.")
+
+                # Anything published while we weren't listening was missed. This is only done once subscribed again,
+                # as configs loaded before then could miss invalidations too, and nothing else would ever drop them.
+                if resync:
+                    await self._resync()
+                    resync = False
+
+                async for message in self._pubsub.listen():
+
+                    if message["type"] != "message":
+                        continue
+
+                    try:
+                        await self._apply(json.loads(message["data"]))
+                    except Exception as error:
+                        __log__.error(f"[COHERENCE] Could not apply invalidation {message['data']!r}. {type(error).__name__}: {error}")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as error:
+
+                if isinstance(error, aioredis.RedisError):
+                    __log__.warning(f"[COHERENCE] Lost connection to redis, resubscribing in {RECONNECT_DELAY}s. {type(error).__name__}: {error}")
+                else:
+                    __log__.exception(f"[COHERENCE] Listener failed unexpectedly, resubscribing in {RECONNECT_DELAY}s.")
+
+                resync = True
+
+                await self._reset()
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _resync(self) -> None:
+
+        __log__.info("[COHERENCE] Evicting all cached configs after missing invalidations.")
+
+        self.bot.user_manager.clear()
+        self.bot.guild_manager.clear()
+
+        # Changes to reminders due within the current window may have been missed too.
+        try:
+            await self.bot.reminders.set_owner(self.bot.owns_singleton("reminders"))
+        except Exception as error:
+            __log__.error(f"[COHERENCE] Could not reload reminders. {type(error).__name__}: {error}")
+
+    async def _reset(self) -> None:
+
+        if (pubsub := self._pubsub) is None:
+            return
+
+        self._pubsub = None
+
+        try:
+            await pubsub.close()
+        except aioredis.RedisError:
+            pass
+
+    async def _apply(self, message: dict[str, Any]) -> None:
+
+        if message["o"] == self.origin:
+            return
+
+        operation, kind, keys, patch = message["op"], message["k"], message["i"], message.get("p", {})
+
+        if kind in ("guild", "tag"):
+            self._apply_guild(operation, kind, keys, patch)
+        else:
+            await self._apply_user(operation, kind, keys, patch)
+
+        self.applied += 1
+
+    async def _apply_user(self, operation: str, kind: str, keys: list[int], patch: dict[str, Any]) -> None:
+
+        user_manager = self.bot.user_manager
+
+        # The blacklist and public profiles are kept for every user, not only cached ones.
+        if kind == "user":
+
+            if operation == DELETE or (operation == PATCH and patch.get("blacklisted") is False):
+                user_manager.blacklist.discard(keys[0])
+            elif operation == PATCH and patch.get("blacklisted") is True:
+                user_manager.blacklist.add(keys[0])
+
+            if operation == DELETE:
+                user_manager.profiles.remove_user(keys[0])
+            if "timezone" in patch:
+                user_manager.profiles.set_timezone(keys[0], None if patch["timezone_private"] else patch["timezone"])
+            if "birthday" in patch:
+                birthday = patch["birthday"]
+                user_manager.profiles.set_birthday(keys[0], None if patch["birthday_private"] or not birthday else pendulum.Date.fromisoformat(birthday))
+
+        # Reminders are sent from their rows rather than from cached configs, so the scheduler hears about all of them.
+        if kind == "user" and operation == DELETE:
+            self.bot.reminders.cancel_user(keys[0])
+        elif kind == "reminder":
+            await self.bot.reminders.refresh(keys[1])
+
+        if (user_config := user_manager.cache.get(keys[0])) is None:
+            return
+
+        if kind == "user" or operation == EVICT:
+
+            if operation == PATCH:
+                user_config.apply_patch(patch)
+            else:
+                user_manager.evict(user_config.id)
+
+            return
+
+        children: dict[int, Any] = {"member": user_config.member_configs, "todo": user_config.todos, "reminder": user_config.reminders}[kind]
+
+        if (child := children.get(keys[1])) is None:
+            # Member configs are loaded one at a time as they're needed, but todos and reminders are loaded all at
+            # once, so a patch for one we don't have means our copy of the user is missing it.
+            if operation == PATCH and kind != "member":
+                user_manager.evict(user_config.id)
+            return
+
+        if operation == DELETE:
+            del children[keys[1]]
+        else:
+            child.apply_patch(patch)
+
+    def _apply_guild(self, operation: str, kind: str, keys: list[int], patch: dict[str, Any]) -> None:
+
+        guild_manager = self.bot.guild_manager
+
+        if (guild_config := guild_manager.cache.get(keys[0])) is None:
+            return
+
+        if kind == "guild" or operation == EVICT:
+
+            if operation == PATCH:
+                guild_config.apply_patch(patch)
+            else:
+                guild_manager.evict(guild_config.id)
+
+            return
+
+        if operation == DELETE:
+            # Deleting a tag deletes its aliases too.
+            for name in [tag.name for tag in guild_config.tags.values() if keys[1] in (tag.id, tag.alias)]:
+                del guild_config.tags[name]
+            return
+
+        if (tag := guild_config.get_tag(tag_id=keys[1])) is None:
+            guild_manager.evict(guild_config.id)
+            return
+
+        tag.apply_patch(patch)
@@ -0,0 +1,230 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+# Packages
+import discord
+
+# My stuff
+from core import colours
+from utilities import utils
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.delivery")
+
+# Channels sent to at once, and messages sent per second across all of them, which stays under discord's global limit
+# of 50 so that the rest of the bot isn't rate limited by a burst of reminders.
+CONCURRENCY = 8
+RATE = 25
+
+# Discord's limits on the embeds in one message.
+EMBEDS = 10
+EMBED_CHARACTERS = 6000
+
+RETRIES = 3
+RETRY_DELAY = 5.0
+
+Callback = Callable[[Any, bool], Awaitable[None]]
+
+
+class ReminderDelivery:
+    """
+    Sends reminders that are due, as handed over by the `ReminderScheduler`. Reminders for the same channel that are
+    waiting at the same time are sent together, as one message mentioning every user with an embed per reminder, up
+    to discord's embed limits. A fixed number of workers take channels off a queue and every message they send takes
+    a token from a shared bucket, so a burst of reminders is spread out instead of being sent all at once.
+
+    `callback` is called with each reminder once it has been dealt with, and whether it was. Reminders that couldn't
+    be sent because of an error that might go away are not, so that they're loaded and sent again later.
+    """
+
+    def __init__(self, bot: SkeletonClique, *, callback: Callback) -> None:
+        self.bot: SkeletonClique = bot
+
+        self._callback: Callback = callback
+
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._waiting: dict[int, list[Any]] = {}
+        self._workers: list[asyncio.Task[None]] = []
+
+        self._tokens: float = RATE
+        self._updated: float = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<ReminderDelivery running={self.running} queued={self.queued}>"
+
+    @property
+    def running(self) -> bool:
+        return any(not worker.done() for worker in self._workers)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(records) for records in self._waiting.values())
+
+    # Lifecycle
+
+    def start(self) -> None:
+
+        if self.running:
+            return
+
+        self._workers = [asyncio.create_task(self._work()) for _ in range(CONCURRENCY)]
+
+    def close(self) -> None:
+
+        for worker in self._workers:
+            worker.cancel()
+
+        self._workers = []
+
+    # Queueing
+
+    def submit(self, records: list[Any]) -> None:
+
+        for record in records:
+
+            # Reminders for a channel that is already waiting join it, and are sent in the same messages.
+            if (waiting := self._waiting.get(record["channel_id"])) is not None:
+                waiting.append(record)
+                continue
+
+            self._waiting[record["channel_id"]] = [record]
+            self._queue.put_nowait(record["channel_id"])
+
+    async def _acquire(self) -> None:
+
+        while True:
+
+            now = time.monotonic()
+            self._tokens = min(RATE, self._tokens + (now - self._updated) * RATE)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / RATE)
+
+    async def _work(self) -> None:
+
+        while True:
+
+            channel_id = await self._queue.get()
+            await self._send(channel_id, self._waiting.pop(channel_id))
+
+    async def _complete(self, record: Any, delivered: bool, method: str = "failed") -> None:
+
+        self.bot.metrics.reminder_lateness.observe(time.time() - record["datetime"].timestamp(), method)
+
+        try:
+            await self._callback(record, delivered)
+        except Exception as error:
+            __log__.error(f"[DELIVERY] Could not complete reminder '{record['id']}'. {type(error).__name__}: {error}")
+
+    # Sending
+
+    @staticmethod
+    def _embed(record: Any, *, mention: bool) -> discord.Embed:
+
+        owner = f"<@{record['user_id']}> " if mention else ""
+
+        return discord.Embed(
+            colour=colours.MAIN,
+            title="Reminder:",
+            description=f"{owner}[`{utils.format_difference(record['created_at'])} ago:`]({record['jump_url']})\n\n{record['content']}"
+        )
+
+    def _messages(self, records: list[Any]) -> Iterator[tuple[list[Any], list[discord.Embed]]]:
+
+        # When a message holds reminders for more than one user, each embed says whose it is.
+        mention = len({record["user_id"] for record in records}) > 1
+
+        chunk, embeds, characters = [], [], 0
+
+        for record in sorted(records, key=lambda record: record["datetime"]):
+
+            embed = self._embed(record, mention=mention)
+
+            if embeds and (len(embeds) == EMBEDS or characters + len(embed) > EMBED_CHARACTERS):
+                yield chunk, embeds
+                chunk, embeds, characters = [], [], 0
+
+            chunk.append(record)
+            embeds.append(embed)
+            characters += len(embed)
+
+        if chunk:
+            yield chunk, embeds
+
+    async def _send(self, channel_id: int, records: list[Any]) -> None:
+
+        # The channel may belong to a shard in another cluster, a partial channel can still be sent to over http.
+        channel: Any = self.bot.get_channel(channel_id) or self.bot.get_partial_messageable(channel_id)
+
+        for chunk, embeds in self._messages(records):
+
+            try:
+                await self._send_message(channel, chunk, embeds)
+            except Exception as error:
+                __log__.error(f"[DELIVERY] Could not send reminders to channel '{channel_id}'. {type(error).__name__}: {error}")
+                for record in chunk:
+                    await self._complete(record, False)
+
+    async def _send_message(self, channel: Any, chunk: list[Any], embeds: list[discord.Embed]) -> None:
+
+        content = " ".join(dict.fromkeys(f"<@{record['user_id']}>" for record in chunk))
+
+        for attempt in range(RETRIES):
+
+            await self._acquire()
+
+            try:
+                await channel.send(content, embeds=embeds)
+            except discord.HTTPException as error:
+
+                # The channel is gone or can't be sent to, so the reminders are sent to their users instead.
+                if error.status != 429 and error.status < 500:
+                    await self._send_direct(chunk)
+                    break
+
+                # discord.py has already retried rate limited requests, so this was a burst it couldn't absorb.
+                await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+
+            else:
+                for record in chunk:
+                    await self._complete(record, True, "channel")
+                break
+
+        else:
+            __log__.warning(f"[DELIVERY] Gave up sending {len(chunk)} reminder{'s' if len(chunk) != 1 else ''} to channel '{channel.id}'.")
+            for record in chunk:
+                await self._complete(record, False)
+
+    async def _send_direct(self, records: list[Any]) -> None:
+
+        for record in records:
+
+            await self._acquire()
+
+            try:
+                # The user cache only holds users sharing a guild with this cluster, so fall back to fetching them.
+                if (user := self.bot.get_user(record["user_id"])) is None:
+                    user = await self.bot.fetch_user(record["user_id"])
+                await user.send(embed=self._embed(record, mention=False))
+            except (discord.NotFound, discord.Forbidden):
+                # Undeliverable reminders are still marked as delivered, otherwise every load would pick them up again.
+                await self._complete(record, True, "undeliverable")
+            except discord.HTTPException:
+                await self._complete(record, False)
+            else:
+                await self._complete(record, True, "direct")
@@ -2,11 +2,18 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
+import collections
 import logging
+import time
 from typing import TYPE_CHECKING
 
+# Packages
+import asyncpg
+
 # My stuff
 from utilities import objects
+from utilities.managers import snapshots
 
 
 if TYPE_CHECKING:
@@ -22,15 +29,24 @@ class GuildManager:
         self.bot: SkeletonClique = bot
 
         self.cache: dict[int, objects.GuildConfig] = {}
+        self.last_used: dict[int, float] = {}
 
     async def fetch_config(self, guild_id: int) -> objects.GuildConfig:
 
-        data = await self.bot.db.fetchrow("INSERT INTO guilds (id) values ($1) ON CONFLICT (id) DO UPDATE SET id = excluded.id RETURNING *", guild_id)
-        guild_config = objects.GuildConfig(bot=self.bot, data=data)
+        if (guild_config := await self.bot.store.get_guild(guild_id)) is None:
+
+            # Read before postgres, so that a change made while loading stops the stale copy from being stored.
+            generation = await self.bot.store.generation("guild", guild_id)
+
+            data = await self.bot.repository.upsert_guild(guild_id)
+            guild_config = objects.GuildConfig(bot=self.bot, data=data)
 
-        await guild_config.fetch_tags()
+            await guild_config.fetch_tags()
+
+            await self.bot.store.set_guild(guild_config, generation)
 
         self.cache[guild_config.id] = guild_config
+        self.last_used[guild_config.id] = time.time()
 
         __log__.debug(f"[GUILDS] Cached config for '{guild_id}'.")
         return guild_config
@@ -38,16 +54,68 @@ class GuildManager:
     async def get_config(self, guild_id: int) -> objects.GuildConfig:
 
         if (guild_config := self.cache.get(guild_id)) is not None:
+            self.last_used[guild_id] = time.time()
+            self.bot.metrics.cache_requests.inc("guilds", "hit")
             return guild_config
 
+        self.bot.metrics.cache_requests.inc("guilds", "miss")
         return await self.fetch_config(guild_id)
 
     async def delete_config(self, guild_id: int) -> None:
 
-        await self.bot.db.execute("DELETE FROM guilds WHERE id = $1", guild_id)
-        try:
-            del self.cache[guild_id]
-        except KeyError:
-            pass
+        await self.bot.repository.delete_guild(guild_id)
+        self.evict(guild_id)
+
+        await self.bot.coherence.delete("guild", guild_id)
 
         __log__.info(f"[GUILDS] Deleted config for '{guild_id}'.")
+
+    # Snapshots
+
+    async def save_snapshot(self) -> None:
+        await snapshots.save(self.bot, "guilds", {guild_id: used for guild_id, used in self.last_used.items() if guild_id in self.cache})
+
+    async def restore_snapshot(self) -> None:
+
+        if not (entries := await snapshots.load(self.bot, "guilds")):
+            return
+
+        guild_ids = [guild_id for guild_id, _ in entries]
+
+        guilds, tags = await asyncio.gather(
+            self.bot.repository.guilds(guild_ids),
+            self.bot.repository.guilds_tags(guild_ids),
+        )
+
+        guilds = {data["id"]: data for data in guilds}
+
+        guild_tags: collections.defaultdict[int, list[asyncpg.Record]] = collections.defaultdict(list)
+        for data in tags:
+            guild_tags[data["guild_id"]].append(data)
+
+        for guild_id, used in entries:
+
+            if guild_id in self.cache or (data := guilds.get(guild_id)) is None:
+                continue
+
+            guild_config = objects.GuildConfig(bot=self.bot, data=data)
+            guild_config.load_tags(guild_tags[guild_id])
+
+            self.cache[guild_id] = guild_config
+            self.last_used[guild_id] = used
+
+        __log__.info(f"[GUILDS] Restored {len(self.cache)} configs from snapshot.")
+
+    # Evicting
+
+    def evict(self, guild_id: int) -> None:
+        """
+        Drops a config from the cache so that it's loaded fresh next time.
+        """
+
+        self.cache.pop(guild_id, None)
+        self.last_used.pop(guild_id, None)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.last_used.clear()
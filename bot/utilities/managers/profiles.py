@@ -0,0 +1,203 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import bisect
+import calendar
+import datetime
+import logging
+from typing import TYPE_CHECKING, Optional
+
+# Packages
+import discord
+import pendulum
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.profiles")
+
+
+class ProfileIndex:
+    """
+    The public timezones and birthdays of every user, loaded once at startup, plus per guild indexes of them that
+    are built the first time a guild is asked about and kept up to date from then on: timezone name to member ids,
+    and a list of (month, day, member id) kept in calendar order.
+
+    Private timezones and birthdays are never indexed.
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+        self._timezones: dict[int, str] = {}
+        self._birthdays: dict[int, datetime.date] = {}
+
+        self._guild_timezones: dict[int, dict[str, set[int]]] = {}
+        self._guild_birthdays: dict[int, list[tuple[int, int, int]]] = {}
+
+    def __repr__(self) -> str:
+        return f"<ProfileIndex timezones={len(self._timezones)} birthdays={len(self._birthdays)} guilds={len(self._guild_timezones)}>"
+
+    # Loading
+
+    async def load(self) -> None:
+
+        for record in await self.bot.repository.public_profiles():
+            if record["timezone"] is not None:
+                self._timezones[record["id"]] = record["timezone"]
+            if record["birthday"] is not None:
+                self._birthdays[record["id"]] = record["birthday"]
+
+        __log__.info(f"[PROFILES] Loaded {len(self._timezones)} public timezones and {len(self._birthdays)} public birthdays.")
+
+    def _build(self, guild: discord.Guild) -> tuple[dict[str, set[int]], list[tuple[int, int, int]]]:
+
+        if (timezones := self._guild_timezones.get(guild.id)) is not None:
+            return timezones, self._guild_birthdays[guild.id]
+
+        timezones, birthdays = {}, []
+
+        # Walk whichever side is smaller, the guilds members or the users with something public.
+        if guild.member_count and guild.member_count < len(self._timezones) + len(self._birthdays):
+            user_ids = [member.id for member in guild.members]
+        else:
+            user_ids = [user_id for user_id in self._timezones.keys() | self._birthdays.keys() if guild.get_member(user_id) is not None]
+
+        for user_id in user_ids:
+            if (timezone := self._timezones.get(user_id)) is not None:
+                timezones.setdefault(timezone, set()).add(user_id)
+            if (birthday := self._birthdays.get(user_id)) is not None:
+                birthdays.append((birthday.month, birthday.day, user_id))
+
+        birthdays.sort()
+
+        # Members that haven't been chunked yet won't be announced by a join event, so the index would go stale.
+        if guild.chunked:
+            self._guild_timezones[guild.id] = timezones
+            self._guild_birthdays[guild.id] = birthdays
+
+        return timezones, birthdays
+
+    # Updating
+
+    def _member_of(self, guild_id: int, user_id: int) -> bool:
+        return (guild := self.bot.get_guild(guild_id)) is not None and guild.get_member(user_id) is not None
+
+    def set_timezone(self, user_id: int, timezone: Optional[str]) -> None:
+
+        if (old := self._timezones.pop(user_id, None)) is not None:
+            for timezones in self._guild_timezones.values():
+                if (user_ids := timezones.get(old)) is not None:
+                    user_ids.discard(user_id)
+                    if not user_ids:
+                        del timezones[old]
+
+        if timezone is None:
+            return
+
+        self._timezones[user_id] = timezone
+
+        for guild_id, timezones in self._guild_timezones.items():
+            if self._member_of(guild_id, user_id):
+                timezones.setdefault(timezone, set()).add(user_id)
+
+    def set_birthday(self, user_id: int, birthday: Optional[datetime.date]) -> None:
+
+        if (old := self._birthdays.pop(user_id, None)) is not None:
+            for birthdays in self._guild_birthdays.values():
+                entry = (old.month, old.day, user_id)
+                if (index := bisect.bisect_left(birthdays, entry)) < len(birthdays) and birthdays[index] == entry:
+                    del birthdays[index]
+
+        if birthday is None:
+            return
+
+        self._birthdays[user_id] = birthday
+
+        for guild_id, birthdays in self._guild_birthdays.items():
+            if self._member_of(guild_id, user_id):
+                bisect.insort(birthdays, (birthday.month, birthday.day, user_id))
+
+    def remove_user(self, user_id: int) -> None:
+        self.set_timezone(user_id, None)
+        self.set_birthday(user_id, None)
+
+    def add_member(self, guild_id: int, user_id: int) -> None:
+
+        if (timezones := self._guild_timezones.get(guild_id)) is None:
+            return
+
+        if (timezone := self._timezones.get(user_id)) is not None:
+            timezones.setdefault(timezone, set()).add(user_id)
+        if (birthday := self._birthdays.get(user_id)) is not None:
+            bisect.insort(self._guild_birthdays[guild_id], (birthday.month, birthday.day, user_id))
+
+    def remove_member(self, guild_id: int, user_id: int) -> None:
+
+        if (timezones := self._guild_timezones.get(guild_id)) is None:
+            return
+
+        if (timezone := self._timezones.get(user_id)) is not None and (user_ids := timezones.get(timezone)) is not None:
+            user_ids.discard(user_id)
+            if not user_ids:
+                del timezones[timezone]
+
+        if (birthday := self._birthdays.get(user_id)) is not None:
+            birthdays = self._guild_birthdays[guild_id]
+            entry = (birthday.month, birthday.day, user_id)
+            if (index := bisect.bisect_left(birthdays, entry)) < len(birthdays) and birthdays[index] == entry:
+                del birthdays[index]
+
+    def remove_guild(self, guild_id: int) -> None:
+        self._guild_timezones.pop(guild_id, None)
+        self._guild_birthdays.pop(guild_id, None)
+
+    # Queries
+
+    def timezones(self, guild: discord.Guild) -> list[tuple[pendulum.DateTime, list[int]]]:
+        """
+        The current time in each timezone used by the guilds members, with the ids of those members, ordered by UTC
+        offset. The time is only worked out once per timezone.
+        """
+
+        timezones, _ = self._build(guild)
+
+        return sorted(
+            ((pendulum.now(tz=timezone), sorted(user_ids)) for timezone, user_ids in timezones.items()),
+            key=lambda entry: entry[0].offset
+        )
+
+    def born_on(self, guild: discord.Guild, date: datetime.date) -> list[int]:
+        """
+        The ids of the guilds members whose birthday is on the given date. Birthdays on the 29th of February are
+        counted on the 28th in years that aren't leap years.
+        """
+
+        _, birthdays = self._build(guild)
+
+        days = [(date.month, date.day)]
+        if days[0] == (2, 28) and not calendar.isleap(date.year):
+            days.append((2, 29))
+
+        user_ids = []
+
+        for month, day in days:
+            start, end = bisect.bisect_left(birthdays, (month, day)), bisect.bisect_left(birthdays, (month, day + 1))
+            user_ids.extend(user_id for _, _, user_id in birthdays[start:end])
+
+        return user_ids
+
+    def birthdays(self, guild: discord.Guild) -> list[tuple[int, datetime.date]]:
+        """
+        The ids and birthdays of the guilds members, in the order they come up starting from today.
+        """
+
+        _, birthdays = self._build(guild)
+
+        today = pendulum.now(tz="UTC")
+        index = bisect.bisect_left(birthdays, (today.month, today.day))
+
+        return [(user_id, self._birthdays[user_id]) for _, _, user_id in birthdays[index:] + birthdays[:index]]
@@ -0,0 +1,264 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+# Packages
+import asyncpg
+import pendulum
+
+# My stuff
+from utilities import enums, objects
+from utilities.managers.delivery import ReminderDelivery
+from utilities.timers import HierarchicalTimingWheel
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.reminders")
+
+# Reminders due within the next WINDOW seconds are held in memory, and the window is reloaded every INTERVAL seconds.
+# The window is longer than the interval so that a slow load never leaves a gap between one window and the next.
+WINDOW = 60 * 5
+INTERVAL = 60 * 2
+RETRY_DELAY = 5.0
+
+
+class ReminderScheduler:
+    """
+    Sends reminders straight from their rows in postgres, without loading the configs of the users they belong to.
+
+    Every few minutes the undelivered reminders due before the end of the next window are loaded with one range query
+    over `reminders_undelivered_datetime_idx` and added to a `HierarchicalTimingWheel`, which adds, moves and cancels
+    them in O(1) and is turned once a second. Reminders that were due while the bot was offline are part of the first
+    load, so they're sent as soon as it starts. Reminders created or changed in between loads are added to the wheel
+    directly if they fall inside the current window, by this process with `schedule`, or by other processes through
+    `CacheCoherence`, which calls `refresh`. Reminders that come due on the same tick are handed to `ReminderDelivery`
+    together, so that those for the same channel can be sent in one message.
+
+    Only the process that owns the `reminders` singleton holds or sends anything.
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+        self._wheel: HierarchicalTimingWheel = HierarchicalTimingWheel(time.time())
+        self._pending: dict[int, Any] = {}
+        self._firing: set[int] = set()
+        self._changed: Optional[dict[int, Any]] = None
+
+        self._horizon: float = 0.0
+        self._next_load: float = 0.0
+
+        self.delivery: ReminderDelivery = ReminderDelivery(bot=bot, callback=self._complete)
+
+        self._wake: asyncio.Event = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f"<ReminderScheduler running={self.running} pending={self.pending} firing={len(self._firing)}>"
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # Lifecycle
+
+    def start(self) -> None:
+
+        if self.running:
+            return
+
+        self.delivery.start()
+        self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        self.delivery.close()
+
+    async def set_owner(self, owned: bool) -> None:
+
+        if owned:
+            self._next_load = 0.0
+        else:
+            self._clear()
+
+        self._wake.set()
+
+    def _clear(self) -> None:
+        self._wheel.clear()
+        self._pending.clear()
+        self._horizon = 0.0
+
+    # Scheduling
+
+    def schedule(self, record: Any) -> None:
+        """
+        Adds or replaces the held copy of a reminder, given its row or `Reminder.to_record()`. Reminders that have
+        been delivered, or aren't due until after the current window, are dropped; the load that covers their due
+        time will pick them up.
+        """
+
+        if not self.bot.owns_singleton("reminders") or (reminder_id := record["id"]) in self._firing:
+            return
+
+        if self._changed is not None:
+            self._changed[reminder_id] = record
+
+        if record["notified"] or (when := record["datetime"].timestamp()) > self._horizon:
+            self._pending.pop(reminder_id, None)
+            self._wheel.cancel(reminder_id)
+            return
+
+        self._pending[reminder_id] = record
+        self._wheel.add(reminder_id, when)
+
+        self._wake.set()
+
+    def cancel(self, reminder_id: int) -> None:
+
+        if self._changed is not None:
+            self._changed[reminder_id] = None
+
+        self._pending.pop(reminder_id, None)
+        self._wheel.cancel(reminder_id)
+
+    def cancel_user(self, user_id: int) -> None:
+
+        for reminder_id in [reminder_id for reminder_id, record in self._pending.items() if record["user_id"] == user_id]:
+            self.cancel(reminder_id)
+
+    async def refresh(self, reminder_id: int) -> None:
+        """
+        Reloads one reminder after another process changed it.
+        """
+
+        if not self.bot.owns_singleton("reminders"):
+            return
+
+        if (record := await self.bot.repository.reminder(reminder_id)) is None:
+            self.cancel(reminder_id)
+        else:
+            self.schedule(record)
+
+    # Loading
+
+    async def _load(self) -> None:
+
+        now = time.time()
+        self._next_load = now + INTERVAL
+
+        # Reminders scheduled or cancelled while the query runs may have changed after the rows it returns were read.
+        self._changed = {}
+
+        try:
+            records = await self.bot.repository.due_reminders(pendulum.from_timestamp(now + WINDOW, tz="UTC"))
+        except (asyncpg.PostgresError, OSError) as error:
+            __log__.warning(f"[REMINDERS] Could not load due reminders. {type(error).__name__}: {error}")
+            return
+        finally:
+            changed, self._changed = self._changed, None
+
+        self._horizon = now + WINDOW
+
+        pending, self._pending = self._pending, {}
+
+        for record in records:
+            if record["id"] not in self._firing:
+                self._pending[record["id"]] = record
+                self._wheel.add(record["id"], record["datetime"].timestamp())
+
+        # Reminders that are no longer due in the window, because they were deleted or moved elsewhere.
+        for reminder_id in pending.keys() - self._pending.keys():
+            self._wheel.cancel(reminder_id)
+
+        for reminder_id, record in changed.items():
+            if record is None:
+                self.cancel(reminder_id)
+            else:
+                self.schedule(record)
+
+        __log__.debug(f"[REMINDERS] Loaded {len(self._pending)} reminder{'s' if len(self._pending) != 1 else ''} due in the next {WINDOW} seconds.")
+
+    async def _run(self) -> None:
+
+        while True:
+
+            # Nothing else restarts this task, so an unexpected error must not end it.
+            try:
+
+                if not self.bot.owns_singleton("reminders"):
+                    self._clear()
+                else:
+
+                    if time.time() >= self._next_load:
+                        await self._load()
+
+                    if due := self._wheel.advance(time.time()):
+                        self._firing.update(due)
+                        self.delivery.submit([self._pending.pop(reminder_id) for reminder_id in due])
+
+                timeout = (min(self._next_load, self._wheel.next_tick) if self._wheel else self._next_load) - time.time()
+
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(timeout, 0.0) if self.bot.owns_singleton("reminders") else INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                __log__.exception(f"[REMINDERS] Scheduler failed unexpectedly, retrying in {RETRY_DELAY}s.")
+                await asyncio.sleep(RETRY_DELAY)
+
+    # Firing
+
+    async def _complete(self, record: Any, delivered: bool) -> None:
+
+        try:
+            if delivered:
+                await self._advance(record)
+        finally:
+            self._firing.discard(record["id"])
+
+    async def _advance(self, record: Any) -> None:
+
+        reminder_id, user_id, previous = record["id"], record["user_id"], record["datetime"]
+
+        if (repeat_type := enums.ReminderRepeatType(record["repeat_type"])) == enums.ReminderRepeatType.NEVER:
+            datetime, notified = previous, True
+        else:
+            # A repeating reminder that was missed while offline is sent once, then moved past every missed occurrence.
+            anchor = pendulum.instance(record["anchor"], tz="UTC")
+            datetime, notified = objects.reminder.next_occurrence(anchor, repeat_type, after=pendulum.now(tz="UTC")), False
+
+        # Nothing is updated if the reminder was deleted, or edited by its user, while it was being sent.
+        if (data := await self.bot.repository.advance_reminder(reminder_id, previous, datetime, notified)) is None:
+            return
+
+        datetime = pendulum.instance(data["datetime"], tz="UTC")
+        patch = {"datetime": datetime.isoformat(), "notified": data["notified"]}
+
+        if not notified:
+            self._firing.discard(reminder_id)
+            self.schedule(dict(record, datetime=datetime))
+
+        if (user_config := self.bot.user_manager.cache.get(user_id)) is not None and (reminder := user_config.get_reminder(reminder_id)) is not None:
+            reminder.apply_patch(patch)
+
+        await self.bot.coherence.patch("reminder", user_id, reminder_id, **patch)
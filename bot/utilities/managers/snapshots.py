@@ -0,0 +1,74 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import json
+import logging
+import time
+from typing import TYPE_CHECKING
+
+# Packages
+import aioredis
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.snapshots")
+
+# Bump this whenever the shape of a snapshot changes, so that one written by older code is ignored.
+VERSION = 1
+
+LIMIT = 5000
+MAX_AGE = 60 * 60 * 24
+TTL = 60 * 60 * 24
+
+
+def key(bot: SkeletonClique, kind: str) -> str:
+    # Each cluster serves its own slice of guilds, so each keeps its own snapshot.
+    return f"snapshots:v{VERSION}:{bot.cluster.id if bot.cluster else 0}:{kind}"
+
+
+async def save(bot: SkeletonClique, kind: str, last_used: dict[int, float]) -> None:
+    """
+    Stores the ids of the most recently used entries of a cache along with when each was last used, most recent
+    first. Only the ids are kept; the configs themselves are loaded from postgres again when the snapshot is restored.
+    """
+
+    if bot.redis is None:
+        return
+
+    if not (entries := sorted(last_used.items(), key=lambda entry: entry[1], reverse=True)[:LIMIT]):
+        return
+
+    try:
+        await bot.redis.set(key(bot, kind), json.dumps([[id, round(used)] for id, used in entries], separators=(",", ":")), ex=TTL)
+    except aioredis.RedisError as error:
+        __log__.warning(f"[SNAPSHOTS] Could not save {kind} snapshot. {type(error).__name__}: {error}")
+        return
+
+    __log__.info(f"[SNAPSHOTS] Saved {kind} snapshot with {len(entries)} entries.")
+
+
+async def load(bot: SkeletonClique, kind: str) -> list[tuple[int, float]]:
+    """
+    Returns the entries of a saved snapshot, most recently used first, skipping any that hadn't been used in a while.
+    The snapshot is deleted once read so that a crash loop can't keep restoring it.
+    """
+
+    if bot.redis is None:
+        return []
+
+    try:
+        async with bot.redis.pipeline(transaction=True) as pipeline:
+            data, _ = await pipeline.get(key(bot, kind)).delete(key(bot, kind)).execute()
+    except aioredis.RedisError as error:
+        __log__.warning(f"[SNAPSHOTS] Could not load {kind} snapshot. {type(error).__name__}: {error}")
+        return []
+
+    if data is None:
+        return []
+
+    cutoff = time.time() - MAX_AGE
+    return [(id, used) for id, used in json.loads(data) if used >= cutoff]
@@ -0,0 +1,223 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+# Packages
+import aioredis
+import msgpack
+
+# My stuff
+from utilities import monitoring, objects
+
+
+if TYPE_CHECKING:
+    # My stuff
+    from core.bot import SkeletonClique
+
+__log__: logging.Logger = logging.getLogger("utilities.managers.store")
+
+# Bump this whenever the shape of a serialized config changes, so that entries written by older code are never read.
+VERSION = 4
+TTL = 60 * 60 * 6
+
+DATE = 1
+
+# Writes the blob only if no change has been made to the aggregate since its generation was read.
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def _default(obj: Any) -> Any:
+
+    if isinstance(obj, datetime.datetime):
+        return msgpack.Timestamp.from_datetime(obj)
+    if isinstance(obj, datetime.date):
+        return msgpack.ExtType(DATE, obj.toordinal().to_bytes(3, "big"))
+
+    raise TypeError(f"cannot serialize object of type '{type(obj).__name__}'.")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+
+    if code == DATE:
+        return datetime.date.fromordinal(int.from_bytes(data, "big"))
+
+    return msgpack.ExtType(code, data)
+
+
+def pack(data: dict[str, Any]) -> bytes:
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def unpack(data: bytes) -> dict[str, Any]:
+    return msgpack.unpackb(data, ext_hook=_ext_hook, timestamp=3, raw=False)
+
+
+class ConfigStore:
+    """
+    A second level cache in redis for user and guild configs, shared by every process. Each config is stored as one
+    msgpack blob holding the rows of the aggregate, so loading one costs a single GET instead of the queries needed
+    to hydrate it from postgres. Member configs are left out, as their xp and coins change on almost every message
+    from active users and would invalidate the whole blob each time, so they're always loaded from postgres.
+
+    Entries are deleted whenever the aggregate they belong to changes (see `CacheCoherence`) and written again the
+    next time it's loaded from postgres. Each delete also bumps a generation counter, and a load only writes its blob
+    back if the generation is the one it read before querying postgres, so a load that raced with a change can't
+    store what it read from before it.
+    """
+
+    def __init__(self, bot: SkeletonClique) -> None:
+        self.bot: SkeletonClique = bot
+
+        self.redis: Optional[aioredis.Redis] = None
+        self._set_if_generation: Optional[Any] = None
+
+    def __repr__(self) -> str:
+        return f"<ConfigStore version={VERSION} connected={self.redis is not None}>"
+
+    # Keys
+
+    @staticmethod
+    def key(kind: str, id: int) -> str:
+        return f"configs:v{VERSION}:{kind}:{id}"
+
+    @staticmethod
+    def generation_key(kind: str, id: int) -> str:
+        return f"configs:v{VERSION}:{kind}:{id}:generation"
+
+    # Lifecycle
+
+    async def connect(self, url: str) -> None:
+        # Blobs are binary, so they need a connection that doesn't decode responses.
+        self.redis = monitoring.InstrumentedRedis.from_url(url=url, decode_responses=False, retry_on_timeout=True)
+        self._set_if_generation = self.redis.register_script(SET_IF_GENERATION)
+
+    async def close(self) -> None:
+
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    # Reading and writing
+
+    async def _get(self, kind: str, id: int) -> Optional[dict[str, Any]]:
+
+        if self.redis is None:
+            return None
+
+        try:
+            data = await self.redis.get(self.key(kind, id))
+        except aioredis.RedisError as error:
+            __log__.warning(f"[STORE] Could not read {kind} '{id}'. {type(error).__name__}: {error}")
+            return None
+
+        if data is None:
+            self.bot.metrics.cache_requests.inc(f"{kind}s_store", "miss")
+            return None
+
+        self.bot.metrics.cache_requests.inc(f"{kind}s_store", "hit")
+        return unpack(data)
+
+    async def generation(self, kind: str, id: int) -> Optional[int]:
+        """
+        Returns the generation of an aggregate, to be read before loading it from postgres and passed back when
+        storing it. None means that it can't be stored.
+        """
+
+        if self.redis is None:
+            return None
+
+        try:
+            generation = await self.redis.get(self.generation_key(kind, id))
+        except aioredis.RedisError as error:
+            __log__.warning(f"[STORE] Could not read the generation of {kind} '{id}'. {type(error).__name__}: {error}")
+            return None
+
+        return int(generation or 0)
+
+    async def _set(self, kind: str, id: int, data: dict[str, Any], generation: Optional[int]) -> None:
+
+        if self.redis is None or self._set_if_generation is None or generation is None:
+            return
+
+        try:
+            stored = await self._set_if_generation(keys=[self.key(kind, id), self.generation_key(kind, id)], args=[pack(data), generation, TTL])
+        except aioredis.RedisError as error:
+            __log__.warning(f"[STORE] Could not write {kind} '{id}'. {type(error).__name__}: {error}")
+            return
+
+        if not stored:
+            __log__.debug(f"[STORE] Did not write {kind} '{id}', it was changed while being loaded.")
+
+    async def delete(self, kind: str, id: int) -> None:
+
+        if self.redis is None:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                pipeline.incr(self.generation_key(kind, id))
+                pipeline.expire(self.generation_key(kind, id), TTL)
+                pipeline.delete(self.key(kind, id))
+                await pipeline.execute()
+        except aioredis.RedisError as error:
+            __log__.warning(f"[STORE] Could not delete {kind} '{id}'. {type(error).__name__}: {error}")
+
+    # Users
+
+    async def get_user(self, user_id: int) -> Optional[objects.UserConfig]:
+
+        if (data := await self._get("user", user_id)) is None:
+            return None
+
+        user_config = objects.UserConfig(bot=self.bot, data=data["user"])
+        user_config.load_notifications(data["notifications"])
+        user_config.load_todos(data["todos"])
+        user_config.load_reminders(data["reminders"])
+
+        return user_config
+
+    async def set_user(self, user_config: objects.UserConfig, generation: Optional[int]) -> None:
+
+        await self._set(
+            "user", user_config.id,
+            {
+                "user":          user_config.to_record(),
+                "notifications": user_config.notifications.to_record(),
+                "todos":         [todo.to_record() for todo in user_config.todos.values()],
+                "reminders":     [reminder.to_record() for reminder in user_config.reminders.values()],
+            },
+            generation
+        )
+
+    # Guilds
+
+    async def get_guild(self, guild_id: int) -> Optional[objects.GuildConfig]:
+
+        if (data := await self._get("guild", guild_id)) is None:
+            return None
+
+        guild_config = objects.GuildConfig(bot=self.bot, data=data["guild"])
+        guild_config.load_tags(data["tags"])
+
+        return guild_config
+
+    async def set_guild(self, guild_config: objects.GuildConfig, generation: Optional[int]) -> None:
+
+        await self._set(
+            "guild", guild_config.id,
+            {
+                "guild": guild_config.to_record(),
+                "tags":  [tag.to_record() for tag in guild_config.tags.values()],
+            },
+            generation
+        )
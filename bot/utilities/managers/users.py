@@ -2,23 +2,27 @@
 from __future__ import annotations
 
 # Standard Library
+import asyncio
+import collections
 import io
 import logging
 import math
 import os
 import pathlib
 import random
+import time
 from typing import TYPE_CHECKING, Optional
 
 # Packages
 import asyncpg
 import discord
-from colorthief import ColorThief
-from PIL import Image, ImageDraw, ImageFont
+import pendulum
 
 # My stuff
 from core import colours, emojis
 from utilities import exceptions, objects, utils
+from utilities.managers import snapshots
+from utilities.managers.profiles import ProfileIndex
 
 
 if TYPE_CHECKING:
@@ -61,18 +65,31 @@ class UserManager:
         self.bot: SkeletonClique = bot
 
         self.cache: dict[int, objects.UserConfig] = {}
+        self.last_used: dict[int, float] = {}
+        self.blacklist: set[int] = set()
+        self.profiles: ProfileIndex = ProfileIndex(bot=bot)
 
     async def fetch_config(self, user_id: int) -> objects.UserConfig:
 
-        data = await self.bot.db.fetchrow("INSERT INTO users (id) VALUES ($1) ON CONFLICT (id) DO UPDATE SET id = excluded.id RETURNING *", user_id)
-        user_config = objects.UserConfig(bot=self.bot, data=data)
+        if (user_config := await self.bot.store.get_user(user_id)) is None:
 
-        await user_config.fetch_notifications()
-        await user_config.fetch_todos()
-        await user_config.fetch_reminders()
+            # Read before postgres, so that a change made while loading stops the stale copy from being stored.
+            generation = await self.bot.store.generation("user", user_id)
+
+            data = await self.bot.repository.upsert_user(user_id)
+            user_config = objects.UserConfig(bot=self.bot, data=data)
+
+            await user_config.fetch_notifications()
+            await user_config.fetch_todos()
+            await user_config.fetch_reminders()
+
+            await self.bot.store.set_user(user_config, generation)
+
+        # Member configs aren't stored, so they're loaded from postgres whether or not the rest of the config was.
         await user_config.fetch_member_configs()
 
         self.cache[user_config.id] = user_config
+        self.last_used[user_config.id] = time.time()
 
         __log__.debug(f"[USERS] Cached config for '{user_id}'.")
         return user_config
@@ -80,65 +97,123 @@ class UserManager:
     async def get_config(self, user_id: int) -> objects.UserConfig:
 
         if (user_config := self.cache.get(user_id)) is not None:
+            self.last_used[user_id] = time.time()
+            self.bot.metrics.cache_requests.inc("users", "hit")
             return user_config
 
+        self.bot.metrics.cache_requests.inc("users", "miss")
         return await self.fetch_config(user_id)
 
+    async def load_blacklist(self) -> None:
+
+        self.blacklist = await self.bot.repository.blacklisted_user_ids()
+        __log__.info(f"[USERS] Loaded {len(self.blacklist)} blacklisted user{'s' if len(self.blacklist) != 1 else ''}.")
+
     async def delete_config(self, user_id: int) -> None:
 
-        await self.bot.db.execute("DELETE FROM users WHERE id = $1", user_id)
-        try:
-            del self.cache[user_id]
-        except KeyError:
-            pass
+        await self.bot.repository.delete_user(user_id)
+        self.blacklist.discard(user_id)
+        self.profiles.remove_user(user_id)
+
+        self.evict(user_id)
+        self.bot.reminders.cancel_user(user_id)
+
+        await self.bot.coherence.delete("user", user_id)
 
         __log__.info(f"[USERS] Deleted config for '{user_id}'.")
 
+    # Snapshots
+
+    async def save_snapshot(self) -> None:
+        await snapshots.save(self.bot, "users", {user_id: used for user_id, used in self.last_used.items() if user_id in self.cache})
+
+    async def restore_snapshot(self) -> None:
+        """
+        Loads the configs that were in use when the last process closed, most recently used first, with one query
+        per table for all of them rather than the usual queries per user.
+        """
+
+        if not (entries := await snapshots.load(self.bot, "users")):
+            return
+
+        user_ids = [user_id for user_id, _ in entries]
+
+        users, notifications, todos, reminders, member_configs = await asyncio.gather(
+            self.bot.repository.users(user_ids),
+            self.bot.repository.users_notifications(user_ids),
+            self.bot.repository.users_todos(user_ids),
+            self.bot.repository.users_reminders(user_ids),
+            self.bot.repository.users_members(user_ids),
+        )
+
+        users = {data["id"]: data for data in users}
+        notifications = {data["user_id"]: data for data in notifications}
+
+        children: dict[str, collections.defaultdict[int, list[asyncpg.Record]]] = {
+            "todos":          collections.defaultdict(list),
+            "reminders":      collections.defaultdict(list),
+            "member_configs": collections.defaultdict(list),
+        }
+        for name, records in (("todos", todos), ("reminders", reminders), ("member_configs", member_configs)):
+            for data in records:
+                children[name][data["user_id"]].append(data)
+
+        for user_id, used in entries:
+
+            # Users deleted since the snapshot was taken, or that never finished being created, are loaded normally.
+            if user_id in self.cache or (data := users.get(user_id)) is None or user_id not in notifications:
+                continue
+
+            user_config = objects.UserConfig(bot=self.bot, data=data)
+            user_config.load_notifications(notifications[user_id])
+            user_config.load_todos(children["todos"][user_id])
+            user_config.load_reminders(children["reminders"][user_id])
+            user_config.load_member_configs(children["member_configs"][user_id])
+
+            self.cache[user_id] = user_config
+            self.last_used[user_id] = used
+
+        __log__.info(f"[USERS] Restored {len(self.cache)} configs from snapshot.")
+
+    # Evicting
+
+    def evict(self, user_id: int) -> None:
+        """
+        Drops a config from the cache so that it's loaded fresh next time.
+        """
+
+        self.cache.pop(user_id, None)
+        self.last_used.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.last_used.clear()
+
     # Stats
 
-    def timezones(self, *, guild_id: int) -> list[objects.UserConfig]:
+    def timezones(self, *, guild_id: int) -> list[tuple[pendulum.DateTime, list[int]]]:
 
         if not (guild := self.bot.get_guild(guild_id)):
             raise ValueError(f"guild with id \"{guild_id}\" was not found.")
 
-        return sorted(
-            filter(
-                lambda config: (guild.get_member(config.id) if guild else self.bot.get_user(config.id)) is not None and not config.timezone_private and config.timezone is not None,
-                self.configs.values()
-            ),
-            key=lambda config: config.time.offset_hours
-        )
+        return self.profiles.timezones(guild)
 
-    def birthdays(self, *, guild_id: int) -> list[objects.UserConfig]:
+    def birthdays(self, *, guild_id: int) -> list[tuple[int, pendulum.Date]]:
 
         if not (guild := self.bot.get_guild(guild_id)):
             raise ValueError(f"guild with id \"{guild_id}\" was not found.")
 
-        return sorted(
-            filter(
-                lambda config: (guild.get_member(config.id) if guild else self.bot.get_user(config.id)) is not None and not config.birthday_private and config.birthday is not None,
-                self.configs.values()
-            ),
-            key=lambda config: config.next_birthday
-        )
+        return self.profiles.birthdays(guild)
 
     # Leaderboards
 
     async def leaderboard(self, *, guild_id: int, page: int, limit: Optional[int] = 10) -> list[asyncpg.Record]:
 
-        data = await self.bot.db.fetch(
-            "SELECT user_id, xp, row_number() OVER (ORDER BY xp DESC) AS rank FROM members WHERE guild_id = $1 ORDER BY xp DESC LIMIT $2 OFFSET $3",
-            guild_id, limit, (page - 1) * (limit or 0)
-        )
-        return data
+        return await self.bot.repository.leaderboard(guild_id, limit=limit, offset=(page - 1) * (limit or 0))
 
     async def rank(self, *, guild_id: int, user_id: int) -> int:
 
-        data = await self.bot.db.fetchrow(
-            "SELECT rank FROM (SELECT user_id, row_number() OVER (ORDER BY xp DESC) AS rank FROM members WHERE members.guild_id = $1) as guild_members WHERE guild_members.user_id = $2",
-            guild_id, user_id
-        )
-        return data["rank"]
+        return await self.bot.repository.member_rank(guild_id, user_id)
 
     # Images
 
@@ -173,6 +248,9 @@ class UserManager:
     @staticmethod
     def create_leaderboard_image(data: list[tuple[discord.Member, int, int, io.BytesIO]]) -> io.BytesIO:
 
+        # Packages
+        from PIL import Image, ImageDraw, ImageFont
+
         with Image.open(fp=random.choice(IMAGES["SAI"]["leaderboard"])) as image:
 
             draw = ImageDraw.Draw(im=image)
@@ -278,6 +356,10 @@ class UserManager:
     @staticmethod
     def create_level_card_image(data: tuple[discord.Member, int, int, int, int, io.BytesIO]) -> io.BytesIO:
 
+        # Packages
+        from colorthief import ColorThief
+        from PIL import Image, ImageDraw, ImageFont
+
         member, xp, needed_xp, level, rank, avatar_bytes = data
 
         with Image.open(fp=random.choice(IMAGES["SAI"]["level_cards"])) as image:
@@ -356,17 +438,16 @@ class UserManager:
 
         timezone_avatars = {}
 
-        for config in timezones:
+        for time, user_ids in timezones:
 
-            avatar_bytes = io.BytesIO(await (self.bot.get_user(config.id).avatar.replace(format="png", size=256)).read())
-            timezone = config.time.format("HH:mm (ZZ)")
+            timezone = time.format("HH:mm (ZZ)")
 
-            if users := timezone_avatars.get(timezone, []):
-                if len(users) > 36:
+            for user_id in user_ids:
+
+                if len(users := timezone_avatars.setdefault(timezone, [])) > 36:
                     break
-                timezone_avatars[timezone].append(avatar_bytes)
-            else:
-                timezone_avatars[timezone] = [avatar_bytes]
+
+                users.append(io.BytesIO(await (self.bot.get_user(user_id).avatar.replace(format="png", size=256)).read()))
 
         buffer = await self.bot.loop.run_in_executor(None, self.create_grid_image, timezone_avatars)
         file = discord.File(fp=buffer, filename="timecard.png")
@@ -388,17 +469,12 @@ class UserManager:
 
         birthday_avatars = {}
 
-        for config in birthdays:
+        for user_id, birthday in birthdays:
 
-            avatar_bytes = io.BytesIO(await (self.bot.get_user(config.id).avatar.replace(format="png", size=256)).read())
-            birthday_month = config.birthday.format("MMMM")
+            if len(users := birthday_avatars.setdefault(birthday.strftime("%B"), [])) > 36:
+                continue
 
-            if users := birthday_avatars.get(birthday_month, []):
-                if len(users) > 36:
-                    break
-                birthday_avatars[birthday_month].append(avatar_bytes)
-            else:
-                birthday_avatars[birthday_month] = [avatar_bytes]
+            users.append(io.BytesIO(await (self.bot.get_user(user_id).avatar.replace(format="png", size=256)).read()))
 
         buffer = await self.bot.loop.run_in_executor(None, self.create_grid_image, birthday_avatars)
         file = discord.File(fp=buffer, filename="birthday.png")
@@ -412,6 +488,9 @@ class UserManager:
     @staticmethod
     def create_grid_image(data: dict[str, io.BytesIO]) -> io.BytesIO:
 
+        # Packages
+        from PIL import Image, ImageDraw, ImageFont
+
         width_x, height_y = ((1600 * min(len(data), 5)) + 100), ((1800 * math.ceil(len(data) / 5)) + 100)
 
         with Image.new(mode="RGBA", size=(width_x, height_y), color=colours.MAIN.to_rgb()) as image:
@@ -0,0 +1,12 @@
+# Future
+from __future__ import annotations
+
+# My stuff
+from utilities.monitoring.instruments import InstrumentedConnection, InstrumentedPool, InstrumentedRedis
+from utilities.monitoring.loop import Block, LoopMonitor
+from utilities.monitoring.memory import MemoryDiff, MemorySnapshot, MemoryTracker
+from utilities.monitoring.metrics import METRICS, METRICS_PORT, Counter, Gauge, Histogram, Metric, Metrics, MetricsRegistry, MetricsServer
+from utilities.monitoring.profiler import Profile, SamplingProfiler, render_flamegraph
+from utilities.monitoring.queries import QUERIES, QueryStats, QueryTemplate, SlowQuery, normalize
+from utilities.monitoring.timeseries import RingSeries, SeriesPair, SocketStats, sparkline
+from utilities.monitoring.tracing import TRACER, Span, Trace, Tracer
@@ -0,0 +1,171 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import contextlib
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import Any
+
+# Packages
+import aioredis
+import asyncpg
+
+# My stuff
+from utilities.monitoring.metrics import METRICS
+from utilities.monitoring.queries import QUERIES
+from utilities.monitoring.tracing import TRACER
+
+
+def _status_rows(status: str) -> int:
+    """
+    Pulls the row count out of a command status such as 'UPDATE 3' or 'INSERT 0 1'.
+    """
+    return int(last) if (last := status.rsplit(" ", 1)[-1]).isdigit() else 0
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """
+    Connection that records every query it runs, and runs queries through statements prepared with
+    `prepare_statements` when there is one for the exact query text, skipping the parse and plan steps.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._statements: dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+    @property
+    def statements(self) -> int:
+        return len(self._statements)
+
+    async def prepare_statements(self, queries: Iterable[str]) -> None:
+
+        for query in queries:
+            if query not in self._statements:
+                self._statements[query] = await self.prepare(query)
+
+    @contextlib.contextmanager
+    def _instrument(self, method: str, query: str) -> Iterator[list[int]]:
+
+        start = time.perf_counter()
+        result: list[int] = [0]
+
+        with TRACER.span(f"db.{method}", query=query):
+            try:
+                yield result
+            finally:
+                duration = time.perf_counter() - start
+                METRICS.db_latency.observe(duration, method)
+                QUERIES.record(method, query, duration, result[0])
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        with self._instrument("execute", query) as rows:
+            if (statement := self._statements.get(query)) is not None:
+                await statement.fetch(*args, timeout=timeout)
+                status = statement.get_statusmsg()
+            else:
+                status = await super().execute(query, *args, timeout=timeout)
+            rows[0] = _status_rows(status)
+            return status
+
+    async def executemany(self, command: str, args: Any, *, timeout: float | None = None) -> None:
+        with self._instrument("executemany", command) as rows:
+            args = list(args)
+            rows[0] = len(args)
+            return await super().executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None, record_class: Any = None) -> list[asyncpg.Record]:
+        with self._instrument("fetch", query) as rows:
+            if (statement := self._statements.get(query)) is not None and record_class is None:
+                records = await statement.fetch(*args, timeout=timeout)
+            else:
+                records = await super().fetch(query, *args, timeout=timeout, record_class=record_class)
+            rows[0] = len(records)
+            return records
+
+    async def fetchrow(self, query: str, *args: Any, timeout: float | None = None, record_class: Any = None) -> asyncpg.Record | None:
+        with self._instrument("fetchrow", query) as rows:
+            if (statement := self._statements.get(query)) is not None and record_class is None:
+                record = await statement.fetchrow(*args, timeout=timeout)
+            else:
+                record = await super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+            rows[0] = int(record is not None)
+            return record
+
+    async def fetchval(self, query: str, *args: Any, column: int = 0, timeout: float | None = None) -> Any:
+        with self._instrument("fetchval", query) as rows:
+            if (statement := self._statements.get(query)) is not None:
+                value = await statement.fetchval(*args, column=column, timeout=timeout)
+            else:
+                value = await super().fetchval(query, *args, column=column, timeout=timeout)
+            rows[0] = int(value is not None)
+            return value
+
+
+class InstrumentedPool:
+    """
+    Wraps an asyncpg pool so that the time spent waiting for a free connection is measured separately from the
+    time spent running queries on it. Queries themselves are recorded by `InstrumentedConnection`.
+    """
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self._pool: asyncpg.Pool = pool
+
+    def __repr__(self) -> str:
+        return f"<InstrumentedPool size={self._pool.get_size()} idle={self._pool.get_idle_size()}>"
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._pool, item)
+
+    @classmethod
+    async def create(cls, **kwargs: Any) -> InstrumentedPool:
+        return cls(await asyncpg.create_pool(connection_class=InstrumentedConnection, **kwargs))
+
+    @property
+    def pool(self) -> asyncpg.Pool:
+        return self._pool
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncIterator[InstrumentedConnection]:
+
+        start = time.perf_counter()
+
+        with TRACER.span("db.acquire"):
+            connection = await self._pool.acquire(timeout=timeout)
+
+        METRICS.db_pool_wait.observe(time.perf_counter() - start)
+
+        try:
+            yield connection
+        finally:
+            await self._pool.release(connection)
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        async with self.acquire() as connection:
+            return await connection.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args: Any, *, timeout: float | None = None) -> None:
+        async with self.acquire() as connection:
+            return await connection.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None, record_class: Any = None) -> list[asyncpg.Record]:
+        async with self.acquire() as connection:
+            return await connection.fetch(query, *args, timeout=timeout, record_class=record_class)
+
+    async def fetchrow(self, query: str, *args: Any, timeout: float | None = None, record_class: Any = None) -> asyncpg.Record | None:
+        async with self.acquire() as connection:
+            return await connection.fetchrow(query, *args, timeout=timeout, record_class=record_class)
+
+    async def fetchval(self, query: str, *args: Any, column: int = 0, timeout: float | None = None) -> Any:
+        async with self.acquire() as connection:
+            return await connection.fetchval(query, *args, column=column, timeout=timeout)
+
+
+class InstrumentedRedis(aioredis.Redis):
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0]).upper()
+
+        with METRICS.redis_latency.time(command), TRACER.span(f"redis.{command}"):
+            return await super().execute_command(*args, **options)
@@ -0,0 +1,168 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+# My stuff
+from utilities.monitoring.metrics import METRICS
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.loop")
+
+INTERVAL = 0.25
+THRESHOLD = 0.1
+MAX_BLOCKS = 50
+MAX_FRAMES = 20
+
+
+class Block:
+
+    __slots__ = ("timestamp", "heartbeat", "stacks", "duration")
+
+    def __init__(self, heartbeat: float, stack: str) -> None:
+
+        self.timestamp: float = time.time()
+        self.heartbeat: float = heartbeat
+        self.stacks: collections.Counter[str] = collections.Counter([stack])
+        self.duration: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"<Block timestamp={self.timestamp} duration={self.duration} samples={sum(self.stacks.values())}>"
+
+    @property
+    def stack(self) -> str:
+        return self.stacks.most_common(1)[0][0]
+
+    @property
+    def location(self) -> str:
+        return lines[-1].strip() if (lines := [line for line in self.stack.splitlines() if line.strip().startswith("File ")]) else "unknown"
+
+
+class LoopMonitor:
+    """
+    Measures event loop scheduling lag with a task that sleeps for a fixed interval, and runs a watchdog thread
+    that samples the loop thread's stack whenever that task hasn't woken up for longer than the threshold.
+    """
+
+    def __init__(self, *, interval: float = INTERVAL, threshold: float = THRESHOLD, max_blocks: int = MAX_BLOCKS) -> None:
+
+        self.interval: float = interval
+        self.threshold: float = threshold
+
+        self._blocks: collections.deque[Block] = collections.deque(maxlen=max_blocks)
+
+        self._heartbeat: float = time.monotonic()
+        self._last_lag: float = 0.0
+        self._max_lag: float = 0.0
+
+        self._task: Optional[asyncio.Task[None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._stopped: threading.Event = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"<LoopMonitor interval={self.interval} threshold={self.threshold} blocks={len(self._blocks)} running={self.running}>"
+
+    # Properties
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def blocks(self) -> list[Block]:
+        return list(self._blocks)
+
+    @property
+    def last_lag(self) -> float:
+        return self._last_lag
+
+    @property
+    def max_lag(self) -> float:
+        return self._max_lag
+
+    # Lifecycle
+
+    def start(self) -> None:
+
+        if self.running:
+            return
+
+        self._thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+
+        self._task = asyncio.create_task(self._measure())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+        __log__.info(f"[LOOP] Monitoring event loop lag every {self.interval}s with a {self.threshold}s block threshold.")
+
+    def stop(self) -> None:
+
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # Measuring
+
+    async def _measure(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+
+            lag = max(loop.time() - start - self.interval, 0.0)
+
+            self._heartbeat = time.monotonic()
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+
+            METRICS.loop_lag.observe(lag)
+
+    def _watch(self) -> None:
+
+        block: Optional[Block] = None
+
+        while not self._stopped.wait(self.threshold / 2):
+
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+
+            if stalled > self.threshold:
+
+                if (frame := sys._current_frames().get(self._thread_id)) is None:  # type: ignore
+                    continue
+
+                stack = "".join(traceback.format_stack(frame, limit=MAX_FRAMES))
+
+                if block is None or block.heartbeat != heartbeat:
+
+                    if block is not None and block.duration is None:
+                        block.duration = self._last_lag
+
+                    block = Block(heartbeat, stack)
+                    self._blocks.append(block)
+                    METRICS.loop_blocks.inc()
+                else:
+                    block.stacks[stack] += 1
+
+            elif block is not None and block.heartbeat != heartbeat:
+
+                block.duration = self._last_lag
+                __log__.warning(f"[LOOP] Event loop was blocked for {block.duration:.3f}s at {block.location}")
+
+                block = None
@@ -0,0 +1,155 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import collections
+import gc
+import logging
+import time
+import tracemalloc
+from typing import Literal, Optional
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.memory")
+
+FRAMES = 10
+
+FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+
+class MemorySnapshot:
+
+    def __init__(self, snapshot: tracemalloc.Snapshot, types: collections.Counter[str]) -> None:
+
+        self.timestamp: float = time.time()
+        self.snapshot: tracemalloc.Snapshot = snapshot
+        self.types: collections.Counter[str] = types
+
+    def __repr__(self) -> str:
+        return f"<MemorySnapshot timestamp={self.timestamp} traced={self.size}>"
+
+    @property
+    def size(self) -> int:
+        return sum(statistic.size for statistic in self.snapshot.statistics("filename"))
+
+
+class MemoryDiff:
+
+    def __init__(self, old: MemorySnapshot, new: MemorySnapshot, *, group_by: GroupBy = "lineno") -> None:
+
+        self.old: MemorySnapshot = old
+        self.new: MemorySnapshot = new
+
+        self.statistics: list[tracemalloc.StatisticDiff] = new.snapshot.compare_to(old.snapshot, group_by)
+        self.types: list[tuple[str, int]] = sorted(
+            ((name, new.types.get(name, 0) - old.types.get(name, 0)) for name in set(new.types) | set(old.types)),
+            key=lambda item: item[1],
+            reverse=True
+        )
+
+    def __repr__(self) -> str:
+        return f"<MemoryDiff elapsed={self.elapsed:.0f} size_diff={self.size_diff}>"
+
+    @property
+    def elapsed(self) -> float:
+        return self.new.timestamp - self.old.timestamp
+
+    @property
+    def size_diff(self) -> int:
+        return sum(statistic.size_diff for statistic in self.statistics)
+
+    def growers(self, limit: int = 15) -> list[tracemalloc.StatisticDiff]:
+        return [statistic for statistic in self.statistics if statistic.size_diff > 0][:limit]
+
+    def type_growers(self, limit: int = 15) -> list[tuple[str, int]]:
+        return [(name, diff) for name, diff in self.types if diff > 0][:limit]
+
+
+class MemoryTracker:
+    """
+    Starts tracemalloc only when the first snapshot is asked for, keeps the two most recent snapshots, and can be
+    stopped again to drop tracing overhead and the memory held by the traces.
+    """
+
+    def __init__(self, *, frames: int = FRAMES) -> None:
+
+        self.frames: int = frames
+
+        self._previous: Optional[MemorySnapshot] = None
+        self._latest: Optional[MemorySnapshot] = None
+
+    def __repr__(self) -> str:
+        return f"<MemoryTracker tracing={self.tracing} snapshots={len(self.snapshots)}>"
+
+    # Properties
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @property
+    def snapshots(self) -> list[MemorySnapshot]:
+        return [snapshot for snapshot in (self._previous, self._latest) if snapshot is not None]
+
+    @property
+    def traced(self) -> tuple[int, int]:
+        return tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+
+    @property
+    def overhead(self) -> int:
+        return tracemalloc.get_tracemalloc_memory() if self.tracing else 0
+
+    # Lifecycle
+
+    def start(self, frames: Optional[int] = None) -> None:
+
+        if self.tracing:
+            return
+
+        self.frames = frames or self.frames
+        tracemalloc.start(self.frames)
+
+        __log__.info(f"[MEMORY] Started tracemalloc with {self.frames} frames per trace.")
+
+    def stop(self) -> None:
+
+        self._previous = None
+        self._latest = None
+
+        if self.tracing:
+            tracemalloc.stop()
+            __log__.info("[MEMORY] Stopped tracemalloc.")
+
+    # Snapshots
+
+    @staticmethod
+    def _count_types() -> collections.Counter[str]:
+        return collections.Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+    def snapshot(self) -> MemorySnapshot:
+        """
+        Takes a snapshot, starting tracing first if needed. This walks the heap, so it should be run in a thread.
+        """
+
+        self.start()
+
+        snapshot = MemorySnapshot(tracemalloc.take_snapshot().filter_traces(FILTERS), self._count_types())
+
+        self._previous = self._latest
+        self._latest = snapshot
+
+        return snapshot
+
+    def diff(self, *, group_by: GroupBy = "lineno") -> Optional[MemoryDiff]:
+
+        if self._previous is None or self._latest is None:
+            return None
+
+        return MemoryDiff(self._previous, self._latest, group_by=group_by)
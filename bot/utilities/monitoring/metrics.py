@@ -0,0 +1,392 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import abc
+import bisect
+import contextlib
+import logging
+import math
+import time
+from collections.abc import Callable, Iterator
+from typing import Optional
+
+# Packages
+from aiohttp import web
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.metrics")
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9191
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(abc.ABC):
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+
+        self._name: str = name
+        self._documentation: str = documentation
+        self._labels: tuple[str, ...] = labels
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} name={self.name!r} labels={self.labels}>"
+
+    # Properties
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def documentation(self) -> str:
+        return self._documentation
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        return self._labels
+
+    # Utilities
+
+    def _key(self, values: tuple[str, ...]) -> tuple[str, ...]:
+
+        if len(values) != len(self._labels):
+            raise ValueError(f"'{self.name}' expected {len(self._labels)} label values {self._labels}, got {len(values)}.")
+
+        return tuple(str(value) for value in values)
+
+    def _label_string(self, values: tuple[str, ...], extra: Optional[tuple[str, str]] = None) -> str:
+
+        pairs = [f"{label}=\"{_escape(value)}\"" for label, value in zip(self._labels, values)]
+        if extra:
+            pairs.append(f"{extra[0]}=\"{_escape(extra[1])}\"")
+
+        return f"{{{','.join(pairs)}}}" if pairs else ""
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()])
+
+
+class Counter(Metric):
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+
+        if amount < 0:
+            raise ValueError("counters can only be incremented by non-negative amounts.")
+
+        key = self._key(values)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, *values: str) -> float:
+        return self._values.get(self._key(values), 0)
+
+    def items(self) -> list[tuple[tuple[str, ...], float]]:
+        return list(self._values.items())
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{self._label_string(key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float | dict[tuple[str, ...], float]]] = None
+
+    def set(self, value: float, *values: str) -> None:
+        self._values[self._key(values)] = value
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        key = self._key(values)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *values: str, amount: float = 1) -> None:
+        self.inc(*values, amount=-amount)
+
+    def get(self, *values: str) -> float:
+        return self._values.get(self._key(values), 0)
+
+    def set_function(self, function: Callable[[], float | dict[tuple[str, ...], float]]) -> None:
+        """
+        Computes the gauge lazily at scrape time. The function returns a single value for unlabelled gauges, or a
+        mapping of label values to values for labelled ones.
+        """
+        self._function = function
+
+    @contextlib.contextmanager
+    def track(self, *values: str) -> Iterator[None]:
+
+        self.inc(*values)
+        try:
+            yield
+        finally:
+            self.dec(*values)
+
+    def samples(self) -> Iterator[str]:
+
+        values = self._values
+
+        if self._function is not None:
+            try:
+                result = self._function()
+            except Exception as error:
+                __log__.warning(f"[METRICS] Gauge function for '{self.name}' failed. {type(error).__name__}: {error}")
+                result = {}
+            values = result if isinstance(result, dict) else {(): result}
+
+        for key, value in values.items():
+            yield f"{self.name}{self._label_string(self._key(key))} {_format_value(value)}"
+
+
+class Histogram(Metric):
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), *, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labels)
+
+        self._buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._buckets
+
+    def observe(self, amount: float, *values: str) -> None:
+
+        key = self._key(values)
+
+        if (entry := self._values.get(key)) is None:
+            entry = self._values[key] = ([0] * (len(self._buckets) + 1), [0.0])
+
+        entry[0][bisect.bisect_left(self._buckets, amount)] += 1
+        entry[1][0] += amount
+
+    @contextlib.contextmanager
+    def time(self, *values: str) -> Iterator[None]:
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *values)
+
+    def count(self, *values: str) -> int:
+        return sum(entry[0]) if (entry := self._values.get(self._key(values))) else 0
+
+    def total(self, *values: str) -> float:
+        return entry[1][0] if (entry := self._values.get(self._key(values))) else 0.0
+
+    def distribution(self, *values: str) -> list[tuple[float, int]]:
+        return list(zip((*self._buckets, math.inf), entry[0])) if (entry := self._values.get(self._key(values))) else []
+
+    def quantile(self, quantile: float, *values: str) -> Optional[float]:
+        """
+        Estimates a quantile from bucket counts by linear interpolation, the same way histogram_quantile() does.
+        """
+
+        if not (entry := self._values.get(self._key(values))) or not (count := sum(entry[0])):
+            return None
+
+        rank = quantile * count
+        cumulative = 0
+
+        for index, bucket_count in enumerate(entry[0]):
+
+            if cumulative + bucket_count >= rank and bucket_count:
+
+                if index == len(self._buckets):
+                    return self._buckets[-1]
+
+                lower = self._buckets[index - 1] if index > 0 else 0.0
+                return lower + (self._buckets[index] - lower) * ((rank - cumulative) / bucket_count)
+
+            cumulative += bucket_count
+
+        return self._buckets[-1]
+
+    def samples(self) -> Iterator[str]:
+
+        for key, (counts, total) in self._values.items():
+
+            cumulative = 0
+            for bucket, count in zip((*self._buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{self._label_string(key, ('le', _format_value(bucket)))} {cumulative}"
+
+            yield f"{self.name}_sum{self._label_string(key)} {_format_value(total[0])}"
+            yield f"{self.name}_count{self._label_string(key)} {cumulative}"
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def __repr__(self) -> str:
+        return f"<MetricsRegistry metrics={len(self._metrics)}>"
+
+    def __iter__(self) -> Iterator[Metric]:
+        return iter(self._metrics.values())
+
+    def _register(self, metric: Metric) -> Metric:
+
+        if metric.name in self._metrics:
+            raise ValueError(f"a metric named '{metric.name}' is already registered.")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))  # type: ignore
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))  # type: ignore
+
+    def histogram(self, name: str, documentation: str, labels: tuple[str, ...] = (), *, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets=buckets))  # type: ignore
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+class Metrics(MetricsRegistry):
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Gateway
+
+        self.socket_events: Counter = self.counter("bot_socket_events_total", "Gateway events received, by event type.", ("event",))
+        self.latency: Gauge = self.gauge("bot_gateway_latency_seconds", "Gateway heartbeat latency, by shard.", ("shard",))
+
+        # Commands
+
+        self.commands: Counter = self.counter("bot_commands_total", "Command invocations, by command and outcome.", ("command", "status"))
+        self.command_errors: Counter = self.counter("bot_command_errors_total", "Command errors, by command and error type.", ("command", "error"))
+        self.command_latency: Histogram = self.histogram("bot_command_duration_seconds", "Time taken to invoke a command, by command.", ("command",))
+
+        # Datastores
+
+        self.db_latency: Histogram = self.histogram("bot_db_query_duration_seconds", "Time taken by postgresql calls, by method.", ("method",))
+        self.db_pool_wait: Histogram = self.histogram(
+            "bot_db_pool_wait_seconds", "Time spent waiting to acquire a connection from the postgresql pool.",
+            buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+        )
+        self.redis_latency: Histogram = self.histogram("bot_redis_command_duration_seconds", "Time taken by redis commands, by command.", ("command",))
+
+        # Messages
+
+        self.message_stages: Histogram = self.histogram(
+            "bot_message_stage_duration_seconds", "Time taken by each message pipeline stage that ran, by stage.", ("stage",),
+            buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+        )
+
+        # Caches
+
+        self.cache_requests: Counter = self.counter("bot_cache_requests_total", "Cache lookups, by cache and result.", ("cache", "result"))
+        self.cache_size: Gauge = self.gauge("bot_cache_entries", "Entries held in each cache.", ("cache",))
+        self.cooldowns: Counter = self.counter("bot_cooldown_checks_total", "Cooldown checks, by cooldown and result.", ("cooldown", "result"))
+
+        # Queues and workers
+
+        self.image_workers: Gauge = self.gauge("bot_image_workers", "Image edits currently being processed.")
+        self.webhook_queue: Gauge = self.gauge("bot_webhook_queue_depth", "Log webhook messages waiting on paste uploads before they are edited.")
+        self.reminder_queue: Gauge = self.gauge("bot_reminder_queue_depth", "Due reminders waiting to be sent.")
+        self.reminder_lateness: Histogram = self.histogram(
+            "bot_reminder_lateness_seconds", "Time between when a reminder was due and when it was dealt with, by how it was sent.", ("method",),
+            buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0)
+        )
+
+        # Voice
+
+        self.voice_players: Gauge = self.gauge("bot_voice_players", "Connected voice players, by state.", ("state",))
+
+        # Event loop
+
+        self.loop_lag: Histogram = self.histogram(
+            "bot_event_loop_lag_seconds", "Delay between when the event loop should have woken a task and when it did.",
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+        )
+        self.loop_blocks: Counter = self.counter("bot_event_loop_blocks_total", "Times the event loop was blocked for longer than the monitor threshold.")
+
+        # Process
+
+        self.guilds: Gauge = self.gauge("bot_guilds", "Guilds the bot is in.")
+        self.users: Gauge = self.gauge("bot_users", "Users the bot can see.")
+        self.memory: Gauge = self.gauge("bot_process_resident_memory_bytes", "Resident memory of the bot process.")
+        self.uptime: Gauge = self.gauge("bot_uptime_seconds", "Seconds since the bot process started.")
+
+
+METRICS: Metrics = Metrics()
+
+
+class MetricsServer:
+
+    def __init__(self, registry: MetricsRegistry, *, host: str = METRICS_HOST, port: int = METRICS_PORT) -> None:
+
+        self._registry: MetricsRegistry = registry
+        self._host: str = host
+        self._port: int = port
+
+        self._runner: Optional[web.AppRunner] = None
+
+    def __repr__(self) -> str:
+        return f"<MetricsServer host={self._host!r} port={self._port} running={self._runner is not None}>"
+
+    async def _handle(self, _: web.Request) -> web.Response:
+        return web.Response(text=self._registry.render(), content_type="text/plain", charset="utf-8", headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self) -> None:
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        await web.TCPSite(self._runner, host=self._host, port=self._port).start()
+        __log__.info(f"[METRICS] Serving metrics on http://{self._host}:{self._port}/metrics")
+
+    async def close(self) -> None:
+
+        if self._runner is None:
+            return
+
+        await self._runner.cleanup()
+        self._runner = None
@@ -0,0 +1,210 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import collections
+import html
+import logging
+import os
+import sys
+import threading
+import time
+import types
+import zlib
+from typing import Optional
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.profiler")
+
+INTERVAL = 0.005
+MAX_DEPTH = 128
+
+FLAME_WIDTH = 1800
+FLAME_FRAME_HEIGHT = 16
+FLAME_FONT_SIZE = 11
+FLAME_MIN_WIDTH = 0.1
+
+
+def _frame_label(frame: types.FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Profile:
+
+    def __init__(self, stacks: collections.Counter[str], *, samples: int, duration: float, cpu_time: float, interval: float) -> None:
+
+        self.stacks: collections.Counter[str] = stacks
+        self.samples: int = samples
+        self.duration: float = duration
+        self.cpu_time: float = cpu_time
+        self.interval: float = interval
+
+    def __repr__(self) -> str:
+        return f"<Profile samples={self.samples} duration={self.duration:.2f} overhead={self.overhead:.2%}>"
+
+    @property
+    def overhead(self) -> float:
+        """
+        Fraction of one core that the sampler itself used while running.
+        """
+        return self.cpu_time / self.duration if self.duration else 0.0
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = 15) -> list[tuple[str, int]]:
+        """
+        Returns the frames most often seen at the top of a stack, i.e. where time was actually spent.
+        """
+
+        leaves: collections.Counter[str] = collections.Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+
+        return leaves.most_common(limit)
+
+    def flamegraph(self, *, title: str = "Flame graph") -> str:
+        return render_flamegraph(self.stacks, title=title)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that periodically reads the current frame of every thread, including the event loop
+    thread, and counts each stack in collapsed form. Nothing is hooked into the interpreter, so overhead is just
+    the sampler thread's own work.
+    """
+
+    def __init__(self, *, interval: float = INTERVAL) -> None:
+
+        self.interval: float = interval
+        self._lock: threading.Lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<SamplingProfiler interval={self.interval} running={self.running}>"
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float) -> Profile:
+        """
+        Samples for the given number of seconds and blocks while doing so, so it should be run in a thread.
+        """
+
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("a profile is already running.")
+
+        try:
+            return self._profile(seconds)
+        finally:
+            self._lock.release()
+
+    def _profile(self, seconds: float) -> Profile:
+
+        own_id = threading.get_ident()
+        names: dict[int, str] = {}
+
+        stacks: collections.Counter[str] = collections.Counter()
+        samples = 0
+
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        end = start + seconds
+
+        while (now := time.perf_counter()) < end:
+
+            threads = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():  # type: ignore
+
+                if thread_id == own_id:
+                    continue
+
+                frames: list[str] = []
+                current: Optional[types.FrameType] = frame
+
+                while current is not None and len(frames) < MAX_DEPTH:
+                    frames.append(_frame_label(current))
+                    current = current.f_back
+
+                name = names.setdefault(thread_id, threads.get(thread_id, str(thread_id)).replace(";", ":").replace(" ", "_"))
+                stacks[";".join([name, *reversed(frames)])] += 1
+
+            samples += 1
+            time.sleep(max(self.interval - (time.perf_counter() - now), 0))
+
+        return Profile(stacks, samples=samples, duration=time.perf_counter() - start, cpu_time=time.thread_time() - cpu_start, interval=self.interval)
+
+
+class _Node:
+
+    __slots__ = ("name", "value", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.value: int = 0
+        self.children: dict[str, _Node] = {}
+
+
+def render_flamegraph(stacks: collections.Counter[str], *, title: str = "Flame graph") -> str:
+    """
+    Renders collapsed stacks as a self-contained SVG flame graph, roots at the bottom, with a tooltip per frame.
+    """
+
+    root = _Node("all")
+
+    for stack, count in stacks.items():
+
+        root.value += count
+        node = root
+
+        for name in stack.split(";"):
+            node = node.children.setdefault(name, _Node(name))
+            node.value += count
+
+    depth = 0
+    rects: list[tuple[float, int, float, _Node]] = []
+    scale = FLAME_WIDTH / max(root.value, 1)
+
+    def walk(node: _Node, x: float, level: int) -> None:
+
+        nonlocal depth
+
+        if (width := node.value * scale) < FLAME_MIN_WIDTH:
+            return
+
+        depth = max(depth, level)
+        rects.append((x, level, width, node))
+
+        child_x = x
+        for child in sorted(node.children.values(), key=lambda c: c.name):
+            walk(child, child_x, level + 1)
+            child_x += child.value * scale
+
+    walk(root, 0, 0)
+
+    height = (depth + 1) * FLAME_FRAME_HEIGHT + 40
+    body: list[str] = []
+
+    for x, level, width, node in rects:
+
+        y = height - (level + 1) * FLAME_FRAME_HEIGHT - 10
+        hue = 10 + (zlib.crc32(node.name.encode()) % 45)
+        label = html.escape(node.name)
+        percent = node.value / max(root.value, 1) * 100
+        text = html.escape(node.name[:int(width / (FLAME_FONT_SIZE * 0.6))]) if width > FLAME_FONT_SIZE * 2 else ""
+
+        body.append(
+            f'<g><title>{label} ({node.value} samples, {percent:.2f}%)</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{width:.2f}" height="{FLAME_FRAME_HEIGHT - 1}" fill="hsl({hue},90%,60%)" rx="2"/>'
+            f'<text x="{x + 3:.2f}" y="{y + FLAME_FRAME_HEIGHT - 4}">{text}</text></g>'
+        )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{FLAME_WIDTH}" height="{height}" viewBox="0 0 {FLAME_WIDTH} {height}" '
+        f'font-family="monospace" font-size="{FLAME_FONT_SIZE}">'
+        f'<rect width="100%" height="100%" fill="#f8f8f8"/>'
+        f'<text x="{FLAME_WIDTH / 2}" y="20" text-anchor="middle" font-size="{FLAME_FONT_SIZE + 5}">{html.escape(title)}</text>'
+        f'{"".join(body)}</svg>'
+    )
@@ -0,0 +1,136 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import collections
+import functools
+import logging
+import re
+import time
+from typing import Optional
+
+# My stuff
+from utilities.monitoring.metrics import Histogram
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.queries")
+
+THRESHOLD = 0.1
+MAX_SLOW = 100
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(query: str) -> str:
+    """
+    Reduces a query to its template, collapsing whitespace and replacing inline literals with `?`. Bind parameters
+    are left alone, so queries that only differ by their arguments share a template.
+    """
+
+    query = _STRINGS.sub("?", query)
+    query = _NUMBERS.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip().rstrip(";")
+
+
+class SlowQuery:
+
+    __slots__ = ("timestamp", "method", "query", "duration", "rows")
+
+    def __init__(self, method: str, query: str, duration: float, rows: int) -> None:
+
+        self.timestamp: float = time.time()
+        self.method: str = method
+        self.query: str = query
+        self.duration: float = duration
+        self.rows: int = rows
+
+    def __repr__(self) -> str:
+        return f"<SlowQuery method='{self.method}' duration={self.duration:.3f} rows={self.rows}>"
+
+
+class QueryTemplate:
+
+    __slots__ = ("query", "count", "total", "rows")
+
+    def __init__(self, query: str) -> None:
+
+        self.query: str = query
+        self.count: int = 0
+        self.total: float = 0.0
+        self.rows: int = 0
+
+    def __repr__(self) -> str:
+        return f"<QueryTemplate count={self.count} total={self.total:.3f} rows={self.rows}>"
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class QueryStats:
+    """
+    Per template query statistics. Latency percentiles come from a bucketed histogram per template, so memory
+    stays constant no matter how many times a query runs, and queries slower than the threshold are kept in a
+    bounded log.
+    """
+
+    def __init__(self, *, threshold: float = THRESHOLD, max_slow: int = MAX_SLOW) -> None:
+
+        self.threshold: float = threshold
+
+        self._templates: dict[str, QueryTemplate] = {}
+        self._latency: Histogram = Histogram("db_query_template_duration_seconds", "Time taken by each query template.", ("query",), buckets=BUCKETS)
+        self._slow: collections.deque[SlowQuery] = collections.deque(maxlen=max_slow)
+
+        self.started_at: float = time.time()
+
+    def __repr__(self) -> str:
+        return f"<QueryStats templates={len(self._templates)} slow={len(self._slow)}>"
+
+    # Properties
+
+    @property
+    def templates(self) -> list[QueryTemplate]:
+        return sorted(self._templates.values(), key=lambda template: template.total, reverse=True)
+
+    @property
+    def slow(self) -> list[SlowQuery]:
+        return list(self._slow)
+
+    # Recording
+
+    def record(self, method: str, query: str, duration: float, rows: int) -> None:
+
+        key = normalize(query)
+
+        if (template := self._templates.get(key)) is None:
+            template = self._templates[key] = QueryTemplate(key)
+
+        template.count += 1
+        template.total += duration
+        template.rows += rows
+
+        self._latency.observe(duration, key)
+
+        if duration >= self.threshold:
+            self._slow.append(SlowQuery(method, key, duration, rows))
+            __log__.warning(f"[POSTGRESQL] Slow query ({duration * 1000:.1f}ms, {rows} rows): {key[:500]}")
+
+    def quantile(self, template: QueryTemplate, quantile: float) -> Optional[float]:
+        return self._latency.quantile(quantile, template.query)
+
+    def reset(self) -> None:
+
+        self._templates.clear()
+        self._latency = Histogram(self._latency.name, self._latency.documentation, self._latency.labels, buckets=self._latency.buckets)
+        self._slow.clear()
+
+        self.started_at = time.time()
+
+
+QUERIES = QueryStats()
@@ -0,0 +1,142 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import array
+import time
+from typing import Optional
+
+
+SPARKS = "▁▂▃▄▅▆▇█"
+
+SECOND_SLOTS = 600
+MINUTE_SLOTS = 1440
+
+
+def sparkline(values: list[float]) -> str:
+
+    if not values:
+        return ""
+
+    if (peak := max(values)) <= 0:
+        return SPARKS[0] * len(values)
+
+    return "".join(SPARKS[min(int(value / peak * (len(SPARKS) - 1) + 0.5), len(SPARKS) - 1)] for value in values)
+
+
+class RingSeries:
+    """
+    Fixed-size counter time series. Each slot covers `resolution` seconds, and slots are recycled as time moves
+    forward, so memory stays at `length` integers no matter how long the process runs.
+    """
+
+    __slots__ = ("resolution", "length", "_values", "_last")
+
+    def __init__(self, resolution: int, length: int) -> None:
+
+        self.resolution: int = resolution
+        self.length: int = length
+
+        self._values: array.array[int] = array.array("L", [0]) * length
+        self._last: int = int(time.time()) // resolution
+
+    def __repr__(self) -> str:
+        return f"<RingSeries resolution={self.resolution} length={self.length}>"
+
+    def _advance(self, bucket: int) -> None:
+
+        if bucket <= self._last:
+            return
+
+        for index in range(self._last + 1, self._last + 1 + min(bucket - self._last, self.length)):
+            self._values[index % self.length] = 0
+
+        self._last = bucket
+
+    def add(self, amount: int = 1, *, now: Optional[float] = None) -> None:
+
+        bucket = int(time.time() if now is None else now) // self.resolution
+        self._advance(bucket)
+
+        self._values[bucket % self.length] += amount
+
+    def values(self, *, now: Optional[float] = None, include_current: bool = False) -> list[int]:
+        """
+        Returns the series oldest first. The current slot is still filling, so it is left out unless asked for.
+        """
+
+        self._advance(int(time.time() if now is None else now) // self.resolution)
+
+        values = [self._values[index % self.length] for index in range(self._last - self.length + 1, self._last + 1)]
+        return values if include_current else values[:-1]
+
+
+class SeriesPair:
+
+    __slots__ = ("seconds", "minutes")
+
+    def __init__(self) -> None:
+        self.seconds: RingSeries = RingSeries(1, SECOND_SLOTS)
+        self.minutes: RingSeries = RingSeries(60, MINUTE_SLOTS)
+
+    def add(self, amount: int = 1, *, now: Optional[float] = None) -> None:
+        self.seconds.add(amount, now=now)
+        self.minutes.add(amount, now=now)
+
+
+class SocketStats:
+
+    def __init__(self) -> None:
+        self._series: dict[tuple[str, int], SeriesPair] = {}
+
+    def __repr__(self) -> str:
+        return f"<SocketStats series={len(self._series)}>"
+
+    def record(self, event_type: str, shard_id: Optional[int]) -> None:
+
+        key = (event_type, -1 if shard_id is None else shard_id)
+
+        if (series := self._series.get(key)) is None:
+            series = self._series[key] = SeriesPair()
+
+        series.add()
+
+    # Queries
+
+    @property
+    def events(self) -> list[str]:
+        return sorted({event for event, _ in self._series})
+
+    @property
+    def shards(self) -> list[int]:
+        return sorted({shard for _, shard in self._series})
+
+    def seconds(self, *, event: Optional[str] = None, shard: Optional[int] = None) -> list[int]:
+        return self._sum("seconds", event=event, shard=shard)
+
+    def minutes(self, *, event: Optional[str] = None, shard: Optional[int] = None) -> list[int]:
+        return self._sum("minutes", event=event, shard=shard)
+
+    def _sum(self, resolution: str, *, event: Optional[str], shard: Optional[int]) -> list[int]:
+
+        now = time.time()
+        total: Optional[list[int]] = None
+
+        for (event_type, shard_id), series in self._series.items():
+
+            if (event is not None and event_type != event) or (shard is not None and shard_id != shard):
+                continue
+
+            values = getattr(series, resolution).values(now=now)
+            total = values if total is None else [a + b for a, b in zip(total, values)]
+
+        return total or [0] * ((SECOND_SLOTS if resolution == "seconds" else MINUTE_SLOTS) - 1)
+
+    @staticmethod
+    def downsample(values: list[int], width: int) -> list[float]:
+
+        if width <= 0 or not values:
+            return []
+
+        size = max(len(values) // width, 1)
+        return [sum(values[index:index + size]) / size for index in range(len(values) - size * min(width, len(values) // size), len(values), size)]
@@ -0,0 +1,278 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import collections
+import contextvars
+import itertools
+import json
+import logging
+import time
+import types
+from typing import Any, Optional
+
+# Packages
+import aiohttp
+from discord.ext import commands
+
+
+__log__: logging.Logger = logging.getLogger("utilities.monitoring.tracing")
+
+SLOW_THRESHOLD = 0.5
+SLOW_TRACES = 50
+RECENT_TRACES = 50
+
+_CURRENT: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("span", default=None)
+_IDS = itertools.count(1)
+
+
+class Span:
+
+    __slots__ = ("name", "tags", "start", "end", "children", "parent", "root", "_token")
+
+    def __init__(self, name: str, *, parent: Optional[Span] = None, tags: Optional[dict[str, Any]] = None) -> None:
+
+        self.name: str = name
+        self.tags: dict[str, Any] = tags or {}
+        self.parent: Optional[Span] = parent
+        self.root: Span = self if parent is None else parent.root
+        self.children: list[Span] = []
+
+        self.start: float = time.perf_counter()
+        self.end: Optional[float] = None
+
+        self._token: Optional[contextvars.Token[Optional[Span]]] = None
+
+    def __repr__(self) -> str:
+        return f"<Span name={self.name!r} duration={self.duration:.6f} children={len(self.children)}>"
+
+    def __enter__(self) -> Span:
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]], exc: Optional[BaseException], traceback: Optional[types.TracebackType]) -> None:
+
+        self.finish()
+
+        if exc is not None:
+            self.tags["error"] = type(exc).__name__
+
+        if self._token is not None:
+            _CURRENT.reset(self._token)
+            self._token = None
+
+    @property
+    def duration(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start)
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def to_dict(self, origin: Optional[float] = None) -> dict[str, Any]:
+
+        origin = self.start if origin is None else origin
+
+        return {
+            "name":        self.name,
+            "offset_ms":   round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "tags":        {key: str(value) for key, value in self.tags.items()},
+            "children":    [child.to_dict(origin) for child in self.children],
+        }
+
+
+class _NullSpan:
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace(Span):
+
+    __slots__ = ("id", "timestamp", "discarded")
+
+    def __init__(self, name: str, *, tags: Optional[dict[str, Any]] = None) -> None:
+        super().__init__(name, tags=tags)
+
+        self.id: int = next(_IDS)
+        self.timestamp: float = time.time()
+        self.discarded: bool = False
+
+    def __repr__(self) -> str:
+        return f"<Trace id={self.id} name={self.name!r} duration={self.duration:.6f}>"
+
+    def discard(self) -> None:
+        self.discarded = True
+
+    def to_dict(self, origin: Optional[float] = None) -> dict[str, Any]:
+        return {"id": self.id, "timestamp": self.timestamp, **super().to_dict(origin)}
+
+    def render(self) -> str:
+
+        lines: list[str] = []
+
+        def walk(span: Span, depth: int) -> None:
+
+            tags = " ".join(f"{key}={value}" for key, value in span.tags.items())
+            lines.append(f"{'  ' * depth}{span.name:<{max(40 - depth * 2, 10)}} {span.duration * 1000:>10.3f}ms  +{(span.start - self.start) * 1000:.3f}ms {tags}".rstrip())
+
+            for child in span.children:
+                walk(child, depth + 1)
+
+        walk(self, 0)
+        return "\n".join(lines)
+
+
+class Tracer:
+
+    def __init__(self, *, threshold: float = SLOW_THRESHOLD, slow: int = SLOW_TRACES, recent: int = RECENT_TRACES) -> None:
+
+        self.threshold: float = threshold
+
+        self._slow: collections.deque[Trace] = collections.deque(maxlen=slow)
+        self._recent: collections.deque[Trace] = collections.deque(maxlen=recent)
+
+        self._instrumented: bool = False
+
+    def __repr__(self) -> str:
+        return f"<Tracer threshold={self.threshold} slow={len(self._slow)} recent={len(self._recent)}>"
+
+    # Properties
+
+    @property
+    def slow(self) -> list[Trace]:
+        return list(self._slow)
+
+    @property
+    def recent(self) -> list[Trace]:
+        return list(self._recent)
+
+    @property
+    def current(self) -> Optional[Span]:
+        return _CURRENT.get()
+
+    # Spans
+
+    def trace(self, name: str, **tags: Any) -> Trace:
+        return Trace(name, tags=tags)
+
+    def span(self, name: str, **tags: Any) -> Span | _NullSpan:
+        """
+        Opens a child span of the current span. Outside of a trace this returns a shared no-op span, so
+        instrumented calls that aren't part of a command cost next to nothing.
+
+        Tasks created during a command inherit its current span, and can outlive it. Once the span or its trace has
+        finished it is no longer added to, so those tasks can't keep growing traces that have already been recorded.
+        """
+
+        if (parent := _CURRENT.get()) is None or parent.end is not None or parent.root.end is not None:
+            return NULL_SPAN
+
+        span = Span(name, parent=parent, tags=tags)
+        parent.children.append(span)
+
+        return span
+
+    def record(self, trace: Trace) -> None:
+
+        trace.finish()
+
+        if trace.discarded:
+            return
+
+        self._recent.append(trace)
+
+        if trace.duration >= self.threshold:
+            self._slow.append(trace)
+            __log__.debug(f"[TRACING] Slow trace '{trace.name}' took {trace.duration * 1000:.2f}ms.")
+
+    def get(self, trace_id: int) -> Optional[Trace]:
+        return _find(trace_id, self._slow) or _find(trace_id, self._recent)
+
+    def export(self, *, slow_only: bool = True) -> str:
+        return json.dumps([trace.to_dict() for trace in (self._slow if slow_only else self._recent)], indent=2)
+
+    # Instrumentation
+
+    def instrument_commands(self) -> None:
+        """
+        Wraps the discord.py command pipeline so that checks, each argument conversion and the command callback
+        open their own spans under the trace of the invocation.
+        """
+
+        if self._instrumented is True:
+            return
+
+        tracer = self
+
+        can_run = commands.Command.can_run
+        transform = commands.Command.transform
+        hooked_wrapped_callback = commands.core.hooked_wrapped_callback
+
+        async def traced_can_run(command: commands.Command, ctx: commands.Context, *args: Any, **kwargs: Any) -> bool:
+            with tracer.span("checks", command=command.qualified_name):
+                return await can_run(command, ctx, *args, **kwargs)
+
+        async def traced_transform(command: commands.Command, ctx: commands.Context, param: Any, *args: Any, **kwargs: Any) -> Any:
+            with tracer.span(f"convert:{param.name}", converter=getattr(param.annotation, "__name__", param.annotation)):
+                return await transform(command, ctx, param, *args, **kwargs)
+
+        def traced_hooked_wrapped_callback(command: commands.Command, ctx: commands.Context, coro: Any) -> Any:
+
+            wrapped = hooked_wrapped_callback(command, ctx, coro)
+
+            async def traced(*args: Any, **kwargs: Any) -> Any:
+                with tracer.span("callback", command=command.qualified_name):
+                    return await wrapped(*args, **kwargs)
+
+            return traced
+
+        commands.Command.can_run = traced_can_run  # type: ignore
+        commands.Command.transform = traced_transform  # type: ignore
+        commands.core.hooked_wrapped_callback = traced_hooked_wrapped_callback
+
+        self._instrumented = True
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(_: aiohttp.ClientSession, context: types.SimpleNamespace, params: aiohttp.TraceRequestStartParams) -> None:
+
+            span = self.span(f"http.{params.method}", host=params.url.host, path=params.url.path)
+            if isinstance(span, Span):
+                context.span = span
+
+        async def on_request_end(_: aiohttp.ClientSession, context: types.SimpleNamespace, params: aiohttp.TraceRequestEndParams) -> None:
+
+            if (span := getattr(context, "span", None)) is not None:
+                span.tags["status"] = params.response.status
+                span.finish()
+
+        async def on_request_exception(_: aiohttp.ClientSession, context: types.SimpleNamespace, params: aiohttp.TraceRequestExceptionParams) -> None:
+
+            if (span := getattr(context, "span", None)) is not None:
+                span.tags["error"] = type(params.exception).__name__
+                span.finish()
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+
+        return trace_config
+
+
+def _find(trace_id: int, traces: collections.deque[Trace]) -> Optional[Trace]:
+    return next((trace for trace in traces if trace.id == trace_id), None)
+
+
+TRACER: Tracer = Tracer()
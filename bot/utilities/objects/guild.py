@@ -22,13 +22,16 @@ __log__: logging.Logger = logging.getLogger("utilities.objects.guild")
 
 class GuildConfig:
 
+    __slots__ = ("_bot", "_id", "_created_at", "_embed_size", "_birthday_channel_id", "_tags")
+
     def __init__(self, bot: SkeletonClique, data: dict[str, Any]) -> None:
         self._bot = bot
 
         self._id: int = data["id"]
-        self._created_at: pendulum.DateTime = pendulum.instance(data["created_at"], tz="UTC")
+        self._created_at: float = data["created_at"].timestamp()
 
         self._embed_size: enums.EmbedSize = enums.EmbedSize(data["embed_size"])
+        self._birthday_channel_id: Optional[int] = data["birthday_channel_id"]
 
         self._tags: dict[str, objects.Tag] = {}
 
@@ -47,12 +50,16 @@ class GuildConfig:
 
     @property
     def created_at(self) -> pendulum.DateTime:
-        return self._created_at
+        return pendulum.from_timestamp(self._created_at, tz="UTC")
 
     @property
     def embed_size(self) -> enums.EmbedSize:
         return self._embed_size
 
+    @property
+    def birthday_channel_id(self) -> Optional[int]:
+        return self._birthday_channel_id
+
     #
 
     @property
@@ -63,46 +70,66 @@ class GuildConfig:
 
     async def set_embed_size(self, embed_size: enums.EmbedSize) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE guilds SET embed_size = $1 WHERE id = $2 RETURNING embed_size", embed_size.value, self.id)
+        data = await self.bot.repository.set_guild_embed_size(self.id, embed_size.value)
         self._embed_size = enums.EmbedSize(data["embed_size"])
 
-    # Caching
+        await self.bot.coherence.patch("guild", self.id, embed_size=self._embed_size.value)
 
-    async def fetch_tags(self) -> None:
+    async def set_birthday_channel(self, channel_id: Optional[int]) -> None:
 
-        if not (tags := await self.bot.db.fetch("SELECT * FROM tags WHERE guild_id = $1", self.id)):
-            return
+        data = await self.bot.repository.set_guild_birthday_channel(self.id, channel_id)
+        self._birthday_channel_id = data["birthday_channel_id"]
+
+        await self.bot.coherence.patch("guild", self.id, birthday_channel_id=self._birthday_channel_id)
+
+    def to_record(self) -> dict[str, Any]:
+        return {"id": self.id, "created_at": self.created_at, "embed_size": self.embed_size.value, "birthday_channel_id": self.birthday_channel_id}
+
+    def apply_patch(self, patch: dict[str, Any]) -> None:
+
+        if "embed_size" in patch:
+            self._embed_size = enums.EmbedSize(patch["embed_size"])
+
+        self._birthday_channel_id = patch.get("birthday_channel_id", self._birthday_channel_id)
+
+    # Caching
+
+    def load_tags(self, tags: list[dict[str, Any]]) -> None:
 
         for tag_data in tags:
-            tag = objects.Tag(bot=self.bot, guild_config=self, data=tag_data)
+            tag = objects.Tag(guild_config=self, data=tag_data)
             self._tags[tag.name] = tag
 
+    async def fetch_tags(self) -> None:
+
+        if not (tags := await self.bot.repository.guild_tags(self.id)):
+            return
+
+        self.load_tags(tags)
         __log__.debug(f"[GUILDS] Fetched and cached tags ({len(tags)}) for '{self.id}'.")
 
     # Tags
 
     async def create_tag(self, *, user_id: int, name: str, content: str, jump_url: Optional[str] = None) -> objects.Tag:
 
-        data = await self.bot.db.fetchrow(
-            "INSERT INTO tags (user_id, guild_id, name, content, jump_url) VALUES ($1, $2, $3, $4, $5) RETURNING *",
-            user_id, self.id, name, content, jump_url
-        )
+        data = await self.bot.repository.insert_tag(user_id, self.id, name, content, jump_url)
 
-        tag = objects.Tag(bot=self.bot, guild_config=self, data=data)
+        tag = objects.Tag(guild_config=self, data=data)
         self._tags[tag.name] = tag
 
+        await self.bot.coherence.evict("guild", self.id)
+
         return tag
 
     async def create_tag_alias(self, *, user_id: int, name: str, original: int, jump_url: Optional[str] = None) -> objects.Tag:
 
-        data = await self.bot.db.fetchrow(
-            "INSERT INTO tags (user_id, guild_id, name, alias, jump_url) VALUES ($1, $2, $3, $4, $5) RETURNING *",
-            user_id, self.id, name, original, jump_url
-        )
+        data = await self.bot.repository.insert_tag_alias(user_id, self.id, name, original, jump_url)
 
-        tag = objects.Tag(bot=self.bot, guild_config=self, data=data)
+        tag = objects.Tag(guild_config=self, data=data)
         self._tags[tag.name] = tag
 
+        await self.bot.coherence.evict("guild", self.id)
+
         return tag
 
     def get_tag(self, *, tag_name: Optional[str] = None, tag_id: Optional[int] = None) -> Optional[objects.Tag]:
@@ -15,12 +15,12 @@ if TYPE_CHECKING:
 
 class MemberConfig:
 
-    def __init__(self, bot: SkeletonClique, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
-        self._bot = bot
+    __slots__ = ("_user_config", "_id", "_guild_id", "_xp", "_coins")
+
+    def __init__(self, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
         self._user_config = user_config
 
         self._id: int = data["id"]
-        self._user_id: int = data["user_id"]
         self._guild_id: int = data["guild_id"]
 
         self._xp: int = data["xp"]
@@ -33,7 +33,7 @@ class MemberConfig:
 
     @property
     def bot(self) -> SkeletonClique:
-        return self._bot
+        return self._user_config.bot
 
     @property
     def user_config(self) -> objects.UserConfig:
@@ -45,7 +45,7 @@ class MemberConfig:
 
     @property
     def user_id(self) -> int:
-        return self._user_id
+        return self._user_config.id
 
     @property
     def guild_id(self) -> int:
@@ -82,7 +82,8 @@ class MemberConfig:
         else:
             raise ValueError(f"'change_coins' expected one of {enums.Operation.SET, enums.Operation.ADD, enums.Operation.MINUS}, got '{operation!r}'.")
 
-        await self.bot.db.execute("UPDATE members SET coins = $1 WHERE user_id = $2 AND guild_id = $3", self.coins, self.user_id, self.guild_id)
+        await self.bot.repository.set_member_coins(self.user_id, self.guild_id, self.coins)
+        await self.bot.coherence.patch("member", self.user_id, self.guild_id, coins=self.coins)
 
     async def change_xp(self, xp: int, *, operation: enums.Operation) -> None:
 
@@ -95,4 +96,13 @@ class MemberConfig:
         else:
             raise ValueError(f"'change_xp' expected one of {enums.Operation.SET, enums.Operation.ADD, enums.Operation.MINUS}, got '{operation!r}'.")
 
-        await self.bot.db.execute("UPDATE members SET xp = $1 WHERE user_id = $2 AND guild_id = $3", self.xp, self.user_id, self.guild_id)
+        await self.bot.repository.set_member_xp(self.user_id, self.guild_id, self.xp)
+        await self.bot.coherence.patch("member", self.user_id, self.guild_id, xp=self.xp)
+
+    def to_record(self) -> dict[str, Any]:
+        return {"id": self.id, "user_id": self.user_id, "guild_id": self.guild_id, "xp": self.xp, "coins": self.coins}
+
+    def apply_patch(self, patch: dict[str, Any]) -> None:
+
+        self._xp = patch.get("xp", self._xp)
+        self._coins = patch.get("coins", self._coins)
@@ -15,12 +15,12 @@ if TYPE_CHECKING:
 
 class Notifications:
 
-    def __init__(self, bot: SkeletonClique, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
-        self._bot = bot
+    __slots__ = ("_user_config", "_id", "_level_ups")
+
+    def __init__(self, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
         self._user_config = user_config
 
         self._id: int = data["id"]
-        self._user_id: int = data["user_id"]
 
         self._level_ups: bool = data["level_ups"]
 
@@ -31,7 +31,7 @@ class Notifications:
 
     @property
     def bot(self) -> SkeletonClique:
-        return self._bot
+        return self._user_config.bot
 
     @property
     def user_config(self) -> objects.UserConfig:
@@ -43,10 +43,15 @@ class Notifications:
 
     @property
     def user_id(self) -> int:
-        return self._user_id
+        return self._user_config.id
 
     # Notifications
 
     @property
     def level_ups(self) -> bool:
         return self._level_ups
+
+    # Serialization
+
+    def to_record(self) -> dict[str, Any]:
+        return {"id": self.id, "user_id": self.user_id, "level_ups": self.level_ups}
@@ -5,13 +5,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
 # Packages
-import aioscheduler.task
-import discord
 import pendulum
 
 # My stuff
-from core import colours
-from utilities import enums, objects, utils
+from utilities import enums, objects
 
 
 if TYPE_CHECKING:
@@ -19,43 +16,64 @@ if TYPE_CHECKING:
     from core.bot import SkeletonClique
 
 
-REPEAT_TYPES = {
-    1:  lambda dt: dt.add(minutes=30),
-    2:  lambda dt: dt.add(hours=1),
-    3:  lambda dt: dt.add(hours=2),
-    4:  lambda dt: dt.add(hours=12),
-    5:  lambda dt: dt.add(days=1),
-    6:  lambda dt: dt.add(days=2),
-    7:  lambda dt: dt.add(days=7),
-    8:  lambda dt: dt.add(days=14),
-    9:  lambda dt: dt.add(weeks=2),
-    10: lambda dt: dt.add(months=1),
-    11: lambda dt: dt.add(months=2),
-    12: lambda dt: dt.add(months=6),
-    13: lambda dt: dt.add(years=1),
-    14: lambda dt: dt.add(years=2),
-    15: lambda dt: dt.add(seconds=30)
+# Repeats that are a fixed number of seconds apart, and repeats that are a number of calendar months apart.
+REPEAT_SECONDS: dict[enums.ReminderRepeatType, int] = {
+    enums.ReminderRepeatType.EVERY_HALF_HOUR:  60 * 30,
+    enums.ReminderRepeatType.EVERY_HOUR:       60 * 60,
+    enums.ReminderRepeatType.EVERY_OTHER_HOUR: 60 * 60 * 2,
+    enums.ReminderRepeatType.EVERY_HALF_DAY:   60 * 60 * 12,
+    enums.ReminderRepeatType.EVERY_DAY:        60 * 60 * 24,
+    enums.ReminderRepeatType.EVERY_OTHER_DAY:  60 * 60 * 24 * 2,
+    enums.ReminderRepeatType.EVERY_WEEK:       60 * 60 * 24 * 7,
+    enums.ReminderRepeatType.EVERY_OTHER_WEEK: 60 * 60 * 24 * 14,
+    enums.ReminderRepeatType.EVERY_HALF_MONTH: 60 * 60 * 24 * 14,
 }
+REPEAT_MONTHS: dict[enums.ReminderRepeatType, int] = {
+    enums.ReminderRepeatType.EVERY_MONTH:       1,
+    enums.ReminderRepeatType.EVERY_OTHER_MONTH: 2,
+    enums.ReminderRepeatType.EVERY_HALF_YEAR:   6,
+    enums.ReminderRepeatType.EVERY_YEAR:        12,
+    enums.ReminderRepeatType.EVERY_OTHER_YEAR:  24,
+}
+
+
+def next_occurrence(anchor: pendulum.DateTime, repeat_type: enums.ReminderRepeatType, *, after: pendulum.DateTime) -> pendulum.DateTime:
+    """
+    The first occurrence of a repeating reminder that is later than `after`, worked out in one step no matter how
+    many occurrences were missed. Occurrences are counted from the reminder's `anchor`, the time its user last set,
+    rather than from each other, so monthly reminders on the 31st go back to the 31st after shorter months.
+    """
+
+    if (seconds := REPEAT_SECONDS.get(repeat_type)) is not None:
+        return anchor.add(seconds=max(int((after - anchor).total_seconds() // seconds) + 1, 1) * seconds)
+
+    months = REPEAT_MONTHS[repeat_type]
+
+    # The difference in calendar months is at most one occurrence short, as the day of the month isn't counted.
+    occurrences = max(((after.year - anchor.year) * 12 + after.month - anchor.month) // months, 1)
+    if (occurrence := anchor.add(months=occurrences * months)) <= after:
+        occurrence = anchor.add(months=(occurrences + 1) * months)
+
+    return occurrence
 
 
 class Reminder:
 
-    def __init__(self, bot: SkeletonClique, user_config: objects.user.UserConfig, data: dict[str, Any]) -> None:
+    __slots__ = ("_user_config", "_id", "_channel_id", "_created_at", "_content", "_jump_url", "_repeat_type", "_notified", "_datetime", "_anchor")
+
+    def __init__(self, user_config: objects.user.UserConfig, data: dict[str, Any]) -> None:
 
-        self._bot = bot
         self._user_config = user_config
 
         self._id: int = data["id"]
-        self._user_id: int = data["user_id"]
         self._channel_id: int = data["channel_id"]
-        self._created_at: pendulum.DateTime = pendulum.instance(data["created_at"], tz="UTC")
+        self._created_at: float = data["created_at"].timestamp()
         self._content: str = data["content"]
         self._jump_url: str = data["jump_url"]
         self._repeat_type: enums.ReminderRepeatType = enums.ReminderRepeatType(data["repeat_type"])
         self._notified: bool = data["notified"]
         self._datetime: pendulum.DateTime = pendulum.instance(data["datetime"], tz="UTC")
-
-        self._task: Optional[aioscheduler.task.Task] = None
+        self._anchor: pendulum.DateTime = pendulum.instance(data["anchor"], tz="UTC")
 
     def __repr__(self) -> str:
         return f"<Reminder id=\"{self.id}\" channel_id=\"{self.channel_id}\" user_id=\"{self.user_id}\" datetime={self.datetime} notified={self.notified} done={self.done}>"
@@ -64,7 +82,7 @@ class Reminder:
 
     @property
     def bot(self) -> SkeletonClique:
-        return self._bot
+        return self._user_config.bot
 
     @property
     def user_config(self) -> objects.UserConfig:
@@ -76,7 +94,7 @@ class Reminder:
 
     @property
     def user_id(self) -> int:
-        return self._user_id
+        return self._user_config.id
 
     @property
     def channel_id(self) -> int:
@@ -84,7 +102,7 @@ class Reminder:
 
     @property
     def created_at(self) -> pendulum.DateTime:
-        return self._created_at
+        return pendulum.from_timestamp(self._created_at, tz="UTC")
 
     @property
     def content(self) -> str:
@@ -107,8 +125,8 @@ class Reminder:
         return self._datetime
 
     @property
-    def task(self) -> Optional[aioscheduler.task.Task]:
-        return self._task
+    def anchor(self) -> pendulum.DateTime:
+        return self._anchor
 
     #
 
@@ -120,70 +138,74 @@ class Reminder:
 
     async def delete(self) -> None:
 
-        if not self.done:
-            self.bot.scheduler.cancel(self.task)
+        self.bot.reminders.cancel(self.id)
 
-        await self.bot.db.execute("DELETE FROM reminders WHERE id = $1", self.id)
+        await self.bot.repository.delete_reminder(self.id)
         del self.user_config.reminders[self.id]
 
-    # Handling
-
-    def schedule(self) -> None:
-        self._task = self.bot.scheduler.schedule(self.handle_notification(), when=self.datetime.naive())
-
-    async def handle_notification(self) -> None:
-
-        # TODO user user_configs user attribute here.
-
-        user = self.bot.get_user(self.user_id)
-        channel: Any = self.bot.get_channel(self.channel_id)
-
-        embed = discord.Embed(
-            colour=colours.MAIN,
-            title="Reminder:",
-            description=f"[`{utils.format_difference(self.created_at)} ago:`]({self.jump_url})\n\n{self.content}"
-        )
-
-        try:
-            await channel.send(f"{user.mention if isinstance(user, discord.User) else f'<@{self.user_id}>'}", embed=embed)
-        except (discord.Forbidden, AttributeError):
-            try:
-                await user.send(embed=embed)
-            except (discord.Forbidden, AttributeError):
-                return
-
-        await self.set_notified()
-        if self.repeat_type != enums.ReminderRepeatType.NEVER:
-            await self.handle_repeat()
-
-    async def handle_repeat(self) -> None:
-
-        self._task = None
-
-        await self.change_datetime(REPEAT_TYPES[self.repeat_type.value](self._datetime))
-        await self.set_notified(False)
-
-        self.schedule()
+        await self.bot.coherence.delete("reminder", self.user_id, self.id)
 
     # Config
 
     async def set_notified(self, notified: bool = True) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE reminders SET notified = $1 WHERE id = $2 RETURNING notified", notified, self.id)
+        data = await self.bot.repository.set_reminder_notified(self.id, notified)
         self._notified = data["notified"]
+        self.bot.reminders.schedule(self.to_record())
+
+        await self.bot.coherence.patch("reminder", self.user_id, self.id, notified=self._notified)
 
     async def change_datetime(self, datetime: pendulum.DateTime) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE reminders SET datetime = $1 WHERE id = $2 RETURNING datetime", datetime, self.id)
+        data = await self.bot.repository.set_reminder_datetime(self.id, datetime)
         self._datetime = pendulum.instance(data["datetime"], tz="UTC")
+        self._anchor = pendulum.instance(data["anchor"], tz="UTC")
+        self.bot.reminders.schedule(self.to_record())
+
+        await self.bot.coherence.patch("reminder", self.user_id, self.id, datetime=self._datetime.isoformat(), anchor=self._anchor.isoformat())
 
     async def change_content(self, content: str, *, jump_url: Optional[str] = None) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE reminders SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url", content, jump_url, self.id)
+        data = await self.bot.repository.set_reminder_content(self.id, content, jump_url)
         self._content = data["content"]
         self._jump_url = data["jump_url"] or self.jump_url
+        self.bot.reminders.schedule(self.to_record())
+
+        await self.bot.coherence.patch("reminder", self.user_id, self.id, content=self._content, jump_url=self._jump_url)
 
     async def change_repeat_type(self, repeat_type: enums.ReminderRepeatType) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE reminders SET repeat_type = $1 WHERE id = $2 RETURNING repeat_type", repeat_type.value, self.id)
+        data = await self.bot.repository.set_reminder_repeat_type(self.id, repeat_type.value)
         self._repeat_type = enums.ReminderRepeatType(data["repeat_type"])
+        self.bot.reminders.schedule(self.to_record())
+
+        await self.bot.coherence.patch("reminder", self.user_id, self.id, repeat_type=self._repeat_type.value)
+
+    def to_record(self) -> dict[str, Any]:
+
+        return {
+            "id":          self.id,
+            "user_id":     self.user_id,
+            "channel_id":  self.channel_id,
+            "created_at":  self.created_at,
+            "content":     self.content,
+            "jump_url":    self.jump_url,
+            "repeat_type": self.repeat_type.value,
+            "notified":    self.notified,
+            "datetime":    self.datetime,
+            "anchor":      self.anchor,
+        }
+
+    def apply_patch(self, patch: dict[str, Any]) -> None:
+
+        self._content = patch.get("content", self._content)
+        self._jump_url = patch.get("jump_url", self._jump_url)
+        self._notified = patch.get("notified", self._notified)
+
+        if "repeat_type" in patch:
+            self._repeat_type = enums.ReminderRepeatType(patch["repeat_type"])
+
+        if "datetime" in patch:
+            self._datetime = pendulum.parse(patch["datetime"])
+        if "anchor" in patch:
+            self._anchor = pendulum.parse(patch["anchor"])
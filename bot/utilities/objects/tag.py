@@ -18,15 +18,15 @@ if TYPE_CHECKING:
 
 class Tag:
 
-    def __init__(self, bot: SkeletonClique, guild_config: objects.GuildConfig, data: dict[str, Any]) -> None:
+    __slots__ = ("_guild_config", "_id", "_user_id", "_created_at", "_name", "_alias", "_content", "_jump_url")
+
+    def __init__(self, guild_config: objects.GuildConfig, data: dict[str, Any]) -> None:
 
-        self._bot = bot
         self._guild_config = guild_config
 
         self._id: int = data["id"]
         self._user_id: int = data["user_id"]
-        self._guild_id: int = data["guild_id"]
-        self._created_at: pendulum.DateTime = pendulum.instance(data["created_at"], tz="UTC")
+        self._created_at: float = data["created_at"].timestamp()
         self._name: str = data["name"]
         self._alias: Optional[int] = data["alias"]
         self._content: Optional[str] = data["content"]
@@ -39,7 +39,7 @@ class Tag:
 
     @property
     def bot(self) -> SkeletonClique:
-        return self._bot
+        return self._guild_config.bot
 
     @property
     def guild_config(self) -> objects.GuildConfig:
@@ -55,11 +55,11 @@ class Tag:
 
     @property
     def guild_id(self) -> int:
-        return self._guild_id
+        return self._guild_config.id
 
     @property
     def created_at(self) -> pendulum.DateTime:
-        return self._created_at
+        return pendulum.from_timestamp(self._created_at, tz="UTC")
 
     @property
     def name(self) -> str:
@@ -81,19 +81,44 @@ class Tag:
 
     async def delete(self) -> None:
 
-        tags = await self.bot.db.fetch("DELETE FROM tags WHERE id = $1 or alias = $1 RETURNING name", self.id)
+        tags = await self.bot.repository.delete_tag(self.id)
         for tag in tags:
             del self.guild_config.tags[tag["name"]]
 
+        await self.bot.coherence.delete("tag", self.guild_id, self.id)
+
     # Config
 
     async def change_content(self, content: str, *, jump_url: Optional[str] = None) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE tags SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url", content, jump_url, self.id)
+        data = await self.bot.repository.set_tag_content(self.id, content, jump_url)
         self._content = data["content"]
         self._jump_url = data["jump_url"] or self.jump_url
 
+        await self.bot.coherence.patch("tag", self.guild_id, self.id, content=self._content, jump_url=self._jump_url)
+
     async def change_owner(self, user_id: int) -> None:
 
-        data = await self.bot.db.fetchrow("UPDATE tags SET user_id = $1 WHERE id = $2 RETURNING user_id", user_id, self.id)
+        data = await self.bot.repository.set_tag_owner(self.id, user_id)
         self._user_id = data["user_id"]
+
+        await self.bot.coherence.patch("tag", self.guild_id, self.id, user_id=self._user_id)
+
+    def to_record(self) -> dict[str, Any]:
+
+        return {
+            "id":         self.id,
+            "user_id":    self.user_id,
+            "guild_id":   self.guild_id,
+            "created_at": self.created_at,
+            "name":       self.name,
+            "alias":      self.alias,
+            "content":    self.content,
+            "jump_url":   self.jump_url,
+        }
+
+    def apply_patch(self, patch: dict[str, Any]) -> None:
+
+        self._content = patch.get("content", self._content)
+        self._jump_url = patch.get("jump_url", self._jump_url)
+        self._user_id = patch.get("user_id", self._user_id)
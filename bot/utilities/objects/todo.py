@@ -18,13 +18,13 @@ if TYPE_CHECKING:
 
 class Todo:
 
-    def __init__(self, bot: SkeletonClique, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
-        self._bot = bot
+    __slots__ = ("_user_config", "_id", "_created_at", "_content", "_jump_url")
+
+    def __init__(self, user_config: objects.UserConfig, data: dict[str, Any]) -> None:
         self._user_config = user_config
 
         self._id: int = data["id"]
-        self._user_id: int = data["user_id"]
-        self._created_at: pendulum.DateTime = pendulum.instance(data["created_at"], tz="UTC")
+        self._created_at: float = data["created_at"].timestamp()
         self._content: str = data["content"]
         self._jump_url: Optional[str] = data["jump_url"]
 
@@ -35,7 +35,7 @@ class Todo:
 
     @property
     def bot(self) -> SkeletonClique:
-        return self._bot
+        return self._user_config.bot
 
     @property
     def user_config(self) -> objects.UserConfig:
@@ -47,11 +47,11 @@ class Todo:
 
     @property
     def user_id(self) -> int:
-        return self._user_id
+        return self._user_config.id
 
     @property
     def created_at(self) -> pendulum.DateTime:
-        return self._created_at
+        return pendulum.from_timestamp(self._created_at, tz="UTC")
 
     @property
     def content(self) -> str:
@@ -64,12 +64,24 @@ class Todo:
     # Misc
 
     async def delete(self) -> None:
-        await self.bot.db.execute("DELETE FROM todos WHERE id = $1", self.id)
+        await self.bot.repository.delete_todo(self.id)
         del self.user_config._todos[self.id]
 
+        await self.bot.coherence.delete("todo", self.user_id, self.id)
+
     # Config
 
     async def change_content(self, content: str, *, jump_url: Optional[str] = None) -> None:
-        data = await self.bot.db.fetchrow("UPDATE todos SET content = $1, jump_url = $2 WHERE id = $3 RETURNING content, jump_url", content, jump_url, self.id)
+        data = await self.bot.repository.set_todo_content(self.id, content, jump_url)
         self._content = data["content"]
         self._jump_url = data["jump_url"] or self.jump_url
+
+        await self.bot.coherence.patch("todo", self.user_id, self.id, content=self._content, jump_url=self._jump_url)
+
+    def to_record(self) -> dict[str, Any]:
+        return {"id": self.id, "user_id": self.user_id, "created_at": self.created_at, "content": self.content, "jump_url": self.jump_url}
+
+    def apply_patch(self, patch: dict[str, Any]) -> None:
+
+        self._content = patch.get("content", self._content)
+        self._jump_url = patch.get("jump_url", self._jump_url)
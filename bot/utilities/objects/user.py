@@ -10,7 +10,7 @@ import pendulum
 from pendulum.tz.timezone import Timezone
 
 # My stuff
-from utilities import enums, objects
+from utilities import enums, objects, utils
 
 
 if TYPE_CHECKING:
@@ -23,12 +23,17 @@ __log__: logging.Logger = logging.getLogger("utilities.objects.user")
 
 class UserConfig:
 
+    __slots__ = (
+        "_bot", "_id", "_created_at", "_blacklisted", "_blacklisted_reason", "_timezone", "_timezone_private", "_birthday", "_birthday_private",
+        "_notifications", "_reminders", "_todos", "_member_configs",
+    )
+
     def __init__(self, bot: SkeletonClique, data: dict[str, Any]) -> None:
 
         self._bot: SkeletonClique = bot
 
         self._id: int = data["id"]
-        self._created_at: pendulum.DateTime = pendulum.instance(data["created_at"], tz="UTC")
+        self._created_at: float = data["created_at"].timestamp()
 
         self._blacklisted: bool = data["blacklisted"]
         self._blacklisted_reason: Optional[str] = data["blacklisted_reason"]
@@ -59,7 +64,7 @@ class UserConfig:
 
     @property
     def created_at(self) -> pendulum.DateTime:
-        return self._created_at
+        return pendulum.from_timestamp(self._created_at, tz="UTC")
 
     @property
     def blacklisted(self) -> bool:
@@ -107,26 +112,11 @@ class UserConfig:
 
     @property
     def age(self) -> Optional[int]:
-
-        if not self.birthday:
-            return None
-
-        now = pendulum.now(tz="UTC")
-        date = pendulum.date(year=now.year, month=now.month, day=now.day)
-
-        return (date - self.birthday).in_years()
+        return utils.age(self.birthday) if self.birthday else None
 
     @property
     def next_birthday(self) -> Optional[pendulum.DateTime]:
-
-        if not self.birthday or not self.age:
-            return None
-
-        now = pendulum.now(tz="UTC")
-        date = now.date()
-
-        year = date.year if date < self.birthday.add(years=self.age) else self.birthday.year + self.age + 1
-        return now.set(year=year, month=self.birthday.month, day=self.birthday.day, hour=0, minute=0, second=0, microsecond=0)
+        return utils.next_birthday(self.birthday) if self.birthday else None
 
     @property
     def time(self) -> Optional[pendulum.DateTime]:
@@ -140,85 +130,132 @@ class UserConfig:
 
     async def set_blacklisted(self, blacklisted: bool, *, reason: Optional[str] = None) -> None:
 
-        data = await self.bot.db.fetchrow(
-            "UPDATE users SET blacklisted = $1, blacklisted_reason = $2 WHERE id = $3 RETURNING blacklisted, blacklisted_reason",
-            blacklisted, reason, self.id
-        )
+        data = await self.bot.repository.set_user_blacklisted(self.id, blacklisted, reason)
 
         self._blacklisted = data["blacklisted"]
         self._blacklisted_reason = data["blacklisted_reason"]
 
+        if self._blacklisted:
+            self.bot.user_manager.blacklist.add(self.id)
+        else:
+            self.bot.user_manager.blacklist.discard(self.id)
+
+        await self.bot.coherence.patch("user", self.id, blacklisted=self._blacklisted, blacklisted_reason=self._blacklisted_reason)
+
     async def set_timezone(self, timezone: Optional[Timezone] = None, *, private: Optional[bool] = None) -> None:
 
         private = self.timezone_private if private is None else private
 
-        data = await self.bot.db.fetchrow("UPDATE users SET timezone = $1, timezone_private = $2 WHERE id = $3 RETURNING timezone, timezone_private", timezone.name, private, self.id)
+        data = await self.bot.repository.set_user_timezone(self.id, timezone.name if timezone else None, private)
         self._timezone = pendulum.timezone(tz) if (tz := data.get("timezone")) else None
         self._timezone_private = private
 
+        self.bot.user_manager.profiles.set_timezone(self.id, None if private else tz)
+
+        await self.bot.coherence.patch("user", self.id, timezone=tz, timezone_private=private)
+
     async def set_birthday(self, birthday: Optional[pendulum.Date] = None, *, private: Optional[bool] = None) -> None:
 
-        private = self.timezone_private if private is None else private
+        private = self.birthday_private if private is None else private
 
-        data = await self.bot.db.fetchrow("UPDATE users SET birthday = $1, birthday_private = $2 WHERE id = $3 RETURNING birthday, birthday_private", birthday, private, self.id)
+        data = await self.bot.repository.set_user_birthday(self.id, birthday, private)
         self._birthday = pendulum.Date(year=birthday.year, month=birthday.month, day=birthday.day) if (birthday := data.get("birthday")) else None
         self._birthday_private = private
 
-    # Caching
+        self.bot.user_manager.profiles.set_birthday(self.id, None if private else self._birthday)
 
-    async def fetch_notifications(self) -> None:
+        await self.bot.coherence.patch("user", self.id, birthday=self._birthday.isoformat() if self._birthday else None, birthday_private=private)
 
-        notification = await self.bot.db.fetchrow("INSERT INTO notifications (user_id) VALUES ($1) ON CONFLICT (user_id) DO UPDATE SET user_id = excluded.user_id RETURNING *", self.id)
-        self._notifications = objects.Notifications(bot=self.bot, user_config=self, data=notification)
+    def to_record(self) -> dict[str, Any]:
 
-        __log__.debug(f"[USERS] Fetched and cached notification settings for '{self.id}'.")
+        return {
+            "id":                 self.id,
+            "created_at":         self.created_at,
+            "blacklisted":        self.blacklisted,
+            "blacklisted_reason": self.blacklisted_reason,
+            "timezone":           self.timezone.name if self.timezone else None,
+            "timezone_private":   self.timezone_private,
+            "birthday":           self.birthday,
+            "birthday_private":   self.birthday_private,
+        }
 
-    async def fetch_todos(self) -> None:
+    def apply_patch(self, patch: dict[str, Any]) -> None:
 
-        if not (todos := await self.bot.db.fetch("SELECT * FROM todos WHERE user_id = $1", self.id)):
-            return
+        if "blacklisted" in patch:
+            self._blacklisted = patch["blacklisted"]
+            self._blacklisted_reason = patch["blacklisted_reason"]
+
+        if "timezone" in patch:
+            self._timezone = pendulum.timezone(timezone) if (timezone := patch["timezone"]) else None
+            self._timezone_private = patch["timezone_private"]
+
+        if "birthday" in patch:
+            self._birthday = pendulum.Date.fromisoformat(birthday) if (birthday := patch["birthday"]) else None
+            self._birthday_private = patch["birthday_private"]
+
+    # Caching
+
+    def load_notifications(self, data: dict[str, Any]) -> None:
+        self._notifications = objects.Notifications(user_config=self, data=data)
+
+    def load_todos(self, todos: list[dict[str, Any]]) -> None:
 
         for todo_data in todos:
-            todo = objects.Todo(bot=self.bot, user_config=self, data=todo_data)
+            todo = objects.Todo(user_config=self, data=todo_data)
             self._todos[todo.id] = todo
 
-        __log__.debug(f"[USERS] Fetched and cached todos ({len(todos)}) for '{self.id}'.")
+    def load_reminders(self, reminders: list[dict[str, Any]]) -> None:
 
-    async def fetch_reminders(self) -> None:
+        for reminder_data in reminders:
+            reminder = objects.Reminder(user_config=self, data=reminder_data)
+            self._reminders[reminder.id] = reminder
 
-        if not (reminders := await self.bot.db.fetch("SELECT * FROM reminders WHERE user_id = $1", self.id)):
+    def load_member_configs(self, member_configs: list[dict[str, Any]]) -> None:
+
+        for member_config_data in member_configs:
+            member_config = objects.MemberConfig(user_config=self, data=member_config_data)
+            self._member_configs[member_config.guild_id] = member_config
+
+    async def fetch_notifications(self) -> None:
+
+        self.load_notifications(await self.bot.repository.upsert_notifications(self.id))
+        __log__.debug(f"[USERS] Fetched and cached notification settings for '{self.id}'.")
+
+    async def fetch_todos(self) -> None:
+
+        if not (todos := await self.bot.repository.user_todos(self.id)):
             return
 
-        for reminder_data in reminders:
+        self.load_todos(todos)
+        __log__.debug(f"[USERS] Fetched and cached todos ({len(todos)}) for '{self.id}'.")
 
-            reminder = objects.Reminder(bot=self.bot, user_config=self, data=reminder_data)
-            if not reminder.done:
-                reminder.schedule()
+    async def fetch_reminders(self) -> None:
 
-            self._reminders[reminder.id] = reminder
+        if not (reminders := await self.bot.repository.user_reminders(self.id)):
+            return
 
+        self.load_reminders(reminders)
         __log__.debug(f"[USERS] Fetched and cached reminders ({len(reminders)}) for '{self.id}'.")
 
     async def fetch_member_configs(self) -> None:
 
-        if not (member_configs := await self.bot.db.fetch("SELECT * FROM members WHERE user_id = $1", self.id)):
+        if not (member_configs := await self.bot.repository.user_members(self.id)):
             return
 
-        for member_config_data in member_configs:
-            member_config = objects.MemberConfig(bot=self.bot, user_config=self, data=member_config_data)
-            self._member_configs[member_config.guild_id] = member_config
-
+        self.load_member_configs(member_configs)
         __log__.debug(f"[USERS] Fetched and cached member configs ({len(member_configs)}) for '{self.id}'.")
 
     # Todos
 
     async def create_todo(self, *, content: str, jump_url: Optional[str] = None) -> objects.Todo:
 
-        data = await self.bot.db.fetchrow("INSERT INTO todos (user_id, content, jump_url) VALUES ($1, $2, $3) RETURNING *", self.id, content, jump_url)
+        data = await self.bot.repository.insert_todo(self.id, content, jump_url)
 
-        todo = objects.Todo(bot=self.bot, user_config=self, data=data)
+        todo = objects.Todo(user_config=self, data=data)
         self._todos[todo.id] = todo
 
+        await self.bot.coherence.evict("user", self.id)
+
         return todo
 
     def get_todo(self, todo_id: int) -> Optional[objects.Todo]:
@@ -243,16 +280,15 @@ class UserConfig:
         repeat_type: enums.ReminderRepeatType = enums.ReminderRepeatType.NEVER
     ) -> objects.Reminder:
 
-        data = await self.bot.db.fetchrow(
-            "INSERT INTO reminders (user_id, channel_id, datetime, content, jump_url, repeat_type) VALUES ($1, $2, $3, $4, $5, $6) RETURNING *",
-            self.id, channel_id, datetime, content, jump_url, repeat_type.value
-        )
+        data = await self.bot.repository.insert_reminder(self.id, channel_id, datetime, content, jump_url, repeat_type.value)
 
-        reminder = objects.Reminder(bot=self.bot, user_config=self, data=data)
+        reminder = objects.Reminder(user_config=self, data=data)
         self._reminders[reminder.id] = reminder
 
-        if not reminder.done:
-            reminder.schedule()
+        self.bot.reminders.schedule(data)
+
+        # Naming the reminder lets the cluster that owns reminders schedule it if it's due before its next load.
+        await self.bot.coherence.evict("reminder", self.id, reminder.id)
 
         return reminder
 
@@ -270,11 +306,8 @@ class UserConfig:
 
     async def fetch_member_config(self, guild_id: int) -> objects.MemberConfig:
 
-        data = await self.bot.db.fetchrow(
-            "INSERT INTO members (user_id, guild_id) VALUES ($1, $2) ON CONFLICT (user_id, guild_id) DO UPDATE SET user_id = excluded.user_id RETURNING *",
-            self.id, guild_id
-        )
-        member_config = objects.MemberConfig(bot=self.bot, user_config=self, data=data)
+        data = await self.bot.repository.upsert_member(self.id, guild_id)
+        member_config = objects.MemberConfig(user_config=self, data=data)
 
         self._member_configs[member_config.guild_id] = member_config
 
@@ -290,10 +323,12 @@ class UserConfig:
 
     async def delete_config(self, guild_id: int) -> None:
 
-        await self.bot.db.execute("DELETE FROM members WHERE user_id = $1 AND guild_id = $2", self.id, guild_id)
+        await self.bot.repository.delete_member(self.id, guild_id)
         try:
             del self._member_configs[guild_id]
         except KeyError:
             pass
 
+        await self.bot.coherence.delete("member", self.id, guild_id)
+
         __log__.info(f"[USERS] Deleted member config for '{self.id}' in guild '{guild_id}'.")
@@ -0,0 +1,188 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import collections
+import hashlib
+import logging
+from collections.abc import Callable
+from typing import Any, Optional
+
+# Packages
+import discord
+import mystbin
+
+# My stuff
+from utilities.monitoring import METRICS
+
+
+__log__: logging.Logger = logging.getLogger("utilities.paste")
+
+PLACEHOLDER = "\n\n*Uploading full content...*"
+TRUNCATED = "\n\n*Content truncated.*"
+
+
+class Paste:
+
+    def __init__(self, content: str, *, text: str, task: Optional[asyncio.Task[Optional[str]]] = None) -> None:
+
+        self._content: str = content
+        self._text: str = text
+        self._task: Optional[asyncio.Task[Optional[str]]] = task
+
+    def __repr__(self) -> str:
+        return f"<Paste pending={self.pending} text={self.text!r}>"
+
+    # Properties
+
+    @property
+    def content(self) -> str:
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def task(self) -> Optional[asyncio.Task[Optional[str]]]:
+        return self._task
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    #
+
+    async def wait(self, *, fallback: str) -> str:
+
+        if self._task is None:
+            return self._text
+
+        try:
+            url = await self._task
+        except Exception:
+            url = None
+
+        self._text = url or fallback
+        self._task = None
+
+        return self._text
+
+
+class PasteClient:
+
+    def __init__(self, mystbin_client: mystbin.Client, *, cache_size: int = 1024, timeout: float = 10.0) -> None:
+
+        self._mystbin: mystbin.Client = mystbin_client
+
+        self._cache_size: int = cache_size
+        self._timeout: float = timeout
+
+        self._cache: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self._pending: dict[str, asyncio.Task[Optional[str]]] = {}
+        self._edits: set[asyncio.Task[None]] = set()
+
+    def __repr__(self) -> str:
+        return f"<PasteClient cached={self.cached} queued={self.queued}>"
+
+    # Properties
+
+    @property
+    def cached(self) -> int:
+        return len(self._cache)
+
+    @property
+    def queued(self) -> int:
+        return len(self._edits)
+
+    # Utilities
+
+    @staticmethod
+    def _key(content: str, syntax: str) -> str:
+        return hashlib.blake2b(f"{syntax}\0{content}".encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def truncate(content: str, *, max_characters: int, suffix: str = TRUNCATED) -> str:
+        return content if len(content) <= max_characters else f"{content[:max(max_characters - len(suffix), 0)]}{suffix}"
+
+    def _remember(self, key: str, url: str) -> None:
+
+        self._cache[key] = url
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    # Uploading
+
+    async def _upload(self, key: str, content: str, syntax: str) -> Optional[str]:
+
+        try:
+            paste = await asyncio.wait_for(self._mystbin.post(content, syntax=syntax), timeout=self._timeout)  # type: ignore
+        except (mystbin.APIError, asyncio.TimeoutError, OSError) as error:
+            __log__.warning(f"[PASTE] Upload failed, falling back to local content. {type(error).__name__}: {error}")
+            return None
+        else:
+            self._remember(key, paste.url)
+            return paste.url
+        finally:
+            del self._pending[key]
+
+    def upload(self, content: str, *, syntax: str = "txt") -> asyncio.Task[Optional[str]]:
+
+        key = self._key(content, syntax)
+
+        if (task := self._pending.get(key)) is None:
+            task = asyncio.create_task(self._upload(key, content, syntax))
+            self._pending[key] = task
+
+        return task
+
+    def resolve(self, content: str, *, syntax: str = "txt", max_characters: int = 1024) -> Paste:
+        """
+        Returns a paste whose text is usable immediately, either the content itself, a memoized paste url, or a
+        truncated placeholder while the upload runs in the background.
+        """
+
+        if len(content) <= max_characters:
+            return Paste(content, text=content)
+
+        if (url := self._cache.get(key := self._key(content, syntax))) is not None:
+            METRICS.cache_requests.inc("pastes", "hit")
+            self._cache.move_to_end(key)
+            return Paste(content, text=url)
+
+        METRICS.cache_requests.inc("pastes", "miss")
+        return Paste(content, text=self.truncate(content, max_characters=max_characters, suffix=PLACEHOLDER), task=self.upload(content, syntax=syntax))
+
+    async def safe_content(self, content: str, *, syntax: str = "txt", max_characters: int = 1024) -> str:
+
+        paste = self.resolve(content, syntax=syntax, max_characters=max_characters)
+        return await paste.wait(fallback=self.truncate(content, max_characters=max_characters))
+
+    # Webhooks
+
+    async def send(self, webhook: discord.Webhook, build: Callable[..., dict[str, Any]], *pastes: Paste, max_characters: int = 1024, **kwargs: Any) -> None:
+        """
+        Sends a webhook message built from the immediate text of each paste, then edits the message in the
+        background once any pending uploads have finished, so callers never wait on the paste service.
+        """
+
+        message = await webhook.send(**build(*[paste.text for paste in pastes]), **kwargs, wait=True)
+
+        if not any(paste.pending for paste in pastes):
+            return
+
+        task = asyncio.create_task(self._edit(message, build, pastes, max_characters))
+        self._edits.add(task)
+        task.add_done_callback(self._edits.discard)
+
+    async def _edit(self, message: discord.WebhookMessage, build: Callable[..., dict[str, Any]], pastes: tuple[Paste, ...], max_characters: int) -> None:
+
+        texts = await asyncio.gather(*[paste.wait(fallback=self.truncate(paste.content, max_characters=max_characters)) for paste in pastes])
+
+        try:
+            await message.edit(**build(*texts))
+        except discord.HTTPException as error:
+            __log__.warning(f"[PASTE] Could not edit log message '{message.id}' with uploaded content. {error}")
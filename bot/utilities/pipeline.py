@@ -0,0 +1,141 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import asyncio
+import bisect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+# Packages
+import discord
+
+# My stuff
+from utilities.monitoring import METRICS
+
+
+__log__: logging.Logger = logging.getLogger("utilities.pipeline")
+
+StageCallback = Callable[[discord.Message], Awaitable[None]]
+StageCheck = Callable[[discord.Message], bool]
+
+
+class Stage:
+
+    __slots__ = ("name", "callback", "order", "guild", "bots", "system", "check", "background")
+
+    def __init__(
+        self,
+        name: str,
+        callback: StageCallback,
+        *,
+        order: int,
+        guild: Optional[bool],
+        bots: bool,
+        system: bool,
+        check: Optional[StageCheck],
+        background: bool
+    ) -> None:
+
+        self.name: str = name
+        self.callback: StageCallback = callback
+        self.order: int = order
+        self.guild: Optional[bool] = guild
+        self.bots: bool = bots
+        self.system: bool = system
+        self.check: Optional[StageCheck] = check
+        self.background: bool = background
+
+    def __repr__(self) -> str:
+        return f"<Stage name='{self.name}' order={self.order} guild={self.guild} bots={self.bots} background={self.background}>"
+
+    def __lt__(self, other: Stage) -> bool:
+        return self.order < other.order
+
+
+class MessagePipeline:
+    """
+    Runs every received message through an ordered list of stages. The author, guild and system message filters
+    each stage declares are evaluated once per message against precomputed flags, so most stages are skipped
+    without being awaited, and the time spent in each stage that does run is recorded.
+
+    Stages that can run for a long time, such as command invocation, are started in their own task instead of being
+    awaited, so that they don't hold up the stages after them.
+    """
+
+    def __init__(self) -> None:
+        self._stages: list[Stage] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __repr__(self) -> str:
+        return f"<MessagePipeline stages={[stage.name for stage in self._stages]}>"
+
+    @property
+    def stages(self) -> list[Stage]:
+        return list(self._stages)
+
+    def add_stage(
+        self,
+        name: str,
+        callback: StageCallback,
+        *,
+        order: int = 0,
+        guild: Optional[bool] = None,
+        bots: bool = False,
+        system: bool = False,
+        check: Optional[StageCheck] = None,
+        background: bool = False
+    ) -> None:
+        """
+        Adds a stage. Stages run in ascending order.
+
+        **guild**: True to only run for guild messages, False to only run for direct messages, None for both.
+        **bots**: Whether to run for messages sent by bots, including this one.
+        **system**: Whether to run for system messages such as joins and pins.
+        **check**: An extra synchronous predicate, for anything the other filters don't cover.
+        **background**: Whether to start the stage in its own task rather than waiting for it to finish.
+        """
+
+        if any(stage.name == name for stage in self._stages):
+            raise ValueError(f"a stage named '{name}' already exists.")
+
+        bisect.insort(self._stages, Stage(name, callback, order=order, guild=guild, bots=bots, system=system, check=check, background=background))
+        __log__.debug(f"[PIPELINE] Added stage '{name}' at order {order}.")
+
+    def remove_stage(self, name: str) -> None:
+        self._stages = [stage for stage in self._stages if stage.name != name]
+
+    async def run(self, message: discord.Message) -> None:
+
+        bot = message.author.bot
+        guild = message.guild is not None
+        system = message.is_system()
+
+        for stage in self._stages:
+
+            if (bot and not stage.bots) or (system and not stage.system) or (stage.guild is not None and stage.guild is not guild):
+                continue
+
+            if stage.check is not None and not stage.check(message):
+                continue
+
+            if stage.background:
+                task = asyncio.create_task(self._run_stage(stage, message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                await self._run_stage(stage, message)
+
+    @staticmethod
+    async def _run_stage(stage: Stage, message: discord.Message) -> None:
+
+        start = time.perf_counter()
+
+        try:
+            await stage.callback(message)
+        except Exception:
+            __log__.exception(f"[PIPELINE] Stage '{stage.name}' raised an exception for message '{message.id}'.")
+        finally:
+            METRICS.message_stages.observe(time.perf_counter() - start, stage.name)
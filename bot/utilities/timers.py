@@ -0,0 +1,158 @@
+# Future
+from __future__ import annotations
+
+# Standard Library
+import math
+from collections.abc import Hashable
+
+
+class HierarchicalTimingWheel:
+    """
+    Holds timers that expire at arbitrary wall clock times, in `levels` wheels of `slots` slots each. The first wheel
+    has a slot per tick, and each wheel after it has a slot per full turn of the one before, so with the defaults of
+    64 slots, one second ticks and 5 levels, timers up to about 34 years away are held.
+
+    A timer is put in the slot of the lowest wheel that can reach it. When a wheel completes a turn, the next slot of
+    the wheel above is emptied into the wheels below, so each timer is moved at most `levels - 1` times before it
+    expires. Adding and cancelling are O(1), and advancing costs O(1) per tick plus O(1) per timer expired or moved.
+
+    Timers are never expired early. Expiry times are rounded up to the next tick, so they can be up to one tick late.
+    """
+
+    __slots__ = ("resolution", "slots", "levels", "_wheels", "_timers", "_due", "_tick")
+
+    def __init__(self, now: float, *, resolution: float = 1.0, slots: int = 64, levels: int = 5) -> None:
+
+        self.resolution: float = resolution
+        self.slots: int = slots
+        self.levels: int = levels
+
+        self._wheels: list[list[dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._timers: dict[Hashable, dict[Hashable, int]] = {}
+        self._due: dict[Hashable, int] = {}
+        self._tick: int = int(now / resolution)
+
+    def __repr__(self) -> str:
+        return f"<HierarchicalTimingWheel resolution={self.resolution} slots={self.slots} levels={self.levels} timers={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    @property
+    def next_tick(self) -> float:
+        """
+        The wall clock time at which advancing the wheel will next be able to expire something.
+        """
+        return (self._tick + 1) * self.resolution
+
+    def _place(self, key: Hashable, expires: int) -> None:
+
+        if (delta := expires - self._tick) <= 0:
+            slot = self._due
+        else:
+
+            # The lowest wheel whose span covers the delay.
+            level = 0
+            while level < self.levels - 1 and delta >= self.slots ** (level + 1):
+                level += 1
+
+            # Anything further away than the top wheel can reach waits in its furthest slot, and is placed again
+            # from there once that slot comes around.
+            index = min(expires, self._tick + self.slots ** self.levels - 1) // self.slots ** level
+            slot = self._wheels[level][index % self.slots]
+
+        slot[key] = expires
+        self._timers[key] = slot
+
+    def add(self, key: Hashable, when: float) -> None:
+        """
+        Adds a timer that expires at `when`, replacing any existing timer with the same key.
+        """
+
+        self.cancel(key)
+
+        # A timer due on a tick that has already been expired goes straight to the due list.
+        self._place(key, math.ceil(when / self.resolution))
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Removes a timer if there is one. Returns whether there was.
+        """
+
+        if (slot := self._timers.pop(key, None)) is None:
+            return False
+
+        del slot[key]
+        return True
+
+    def clear(self) -> None:
+
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+
+        self._due.clear()
+        self._timers.clear()
+
+    def advance(self, now: float) -> list[Hashable]:
+        """
+        Turns the wheel up to `now` and returns the keys of the timers that expired, in the order they expired.
+        """
+
+        expired = list(self._due)
+        for key in expired:
+            del self._timers[key]
+        self._due.clear()
+
+        tick = int(now / self.resolution)
+
+        # An empty wheel has nothing to move or expire, so it can skip straight to the current tick.
+        if not self._timers:
+            self._tick = max(self._tick, tick)
+            return expired
+
+        while self._tick < tick:
+
+            self._tick += 1
+
+            # Higher wheels are emptied first, so that timers they move into a slot of a lower wheel that is also
+            # being emptied on this tick are moved again along with the rest of it.
+            for level in range(self.levels - 1, 0, -1):
+
+                if self._tick % self.slots ** level:
+                    continue
+
+                slot = self._wheels[level][(self._tick // self.slots ** level) % self.slots]
+                timers = list(slot.items())
+                slot.clear()
+
+                # Timers parked in the top wheel kept their real expiry time, so this puts them where they belong.
+                for key, expires in timers:
+                    self._place(key, expires)
+
+            if slot := self._wheels[0][self._tick % self.slots]:
+
+                timers = list(slot.items())
+                slot.clear()
+
+                # With a single wheel, timers parked in its furthest slot come around before they expire.
+                for key, expires in timers:
+                    self._place(key, expires)
+
+            # Timers moved down on this tick, and those in the slot for it, are all in the due list now.
+            if self._due:
+
+                for key in self._due:
+                    del self._timers[key]
+                    expired.append(key)
+
+                self._due.clear()
+
+            if not self._timers:
+                self._tick = tick
+                break
+
+        return expired
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 # Standard Library
+import calendar
 import colorsys
 import datetime as dt
 import io
@@ -13,7 +14,6 @@ from typing import Any, Literal, Optional
 import aiohttp
 import discord
 import humanize
-import mystbin
 import pendulum
 
 # My stuff
@@ -231,6 +231,28 @@ def needed_xp(_level: int, xp: int) -> int:
     return round((((((_level + 1) * 3) ** 1.5) * 100) - xp))
 
 
+def age(birthday: dt.date) -> int:
+    return (pendulum.now(tz="UTC").date() - pendulum.Date(birthday.year, birthday.month, birthday.day)).in_years()
+
+
+def next_birthday(birthday: dt.date) -> pendulum.DateTime:
+    """
+    The start of the next day, today included, that is this birthday. Birthdays on the 29th of February fall on the
+    28th in years that aren't leap years.
+    """
+
+    today = pendulum.now(tz="UTC").date()
+
+    for year in (today.year, today.year + 1):
+
+        day = 28 if (birthday.month, birthday.day) == (2, 29) and not calendar.isleap(year) else birthday.day
+
+        if (date := pendulum.date(year, birthday.month, day)) >= today:
+            return pendulum.datetime(date.year, date.month, date.day, tz="UTC")
+
+    raise RuntimeError("unreachable")
+
+
 def random_hex() -> str:
     return "#%02X%02X%02X" % (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
 
@@ -257,18 +279,6 @@ async def upload_file(session: aiohttp.ClientSession, *, file_bytes: bytes | io.
     return f"https://cdn.axelancerr.xyz/{post.get('filename')}"
 
 
-async def safe_content(mystbin_client: mystbin.Client, content: str, *, syntax: str = "txt", max_characters: int = 1024) -> str:
-
-    if len(content) <= max_characters:
-        return content
-
-    try:
-        paste = await mystbin_client.post(content, syntax=syntax)  # type: ignore
-        return paste.url
-    except mystbin.APIError:
-        return content[:max_characters]
-
-
 #
 
 